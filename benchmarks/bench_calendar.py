@@ -0,0 +1,57 @@
+"""Benchmark: calendario por día (iter_days / write_calendar / consulta por offset con mmap).
+
+Uso: python benchmarks/bench_calendar.py --years 100 [--engine mean]
+"""
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from engines.day_calendar import DayCalendar, iter_days, write_calendar
+from orchestration.cli import LUNAR_DAY_ENGINES, lunar_day_engine
+
+
+def _timed(fn) -> float:
+    t0 = time.perf_counter()
+    fn()
+    return time.perf_counter() - t0
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--years", type=int, default=100, help="Años del rango (desde 1950-01-01)")
+    ap.add_argument("--lon", type=float, default=91.1)
+    ap.add_argument("--engine", choices=LUNAR_DAY_ENGINES, default="analytic", help="Motor del día lunar")
+    ap.add_argument("--queries", type=int, default=100000, help="Consultas aleatorias por fecha")
+    args = ap.parse_args()
+
+    start = dt.date(1950, 1, 1)
+    end = dt.date(1950 + args.years, 1, 1) - dt.timedelta(days=1)
+    n = (end - start).days + 1
+    rng = random.Random(7)
+    lunar_day = lunar_day_engine(args.engine)
+    dates = [start + dt.timedelta(days=rng.randrange(n)) for _ in range(args.queries)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "calendar.bin"
+        results = {
+            "iter_days": _timed(lambda: sum(1 for _ in iter_days(start, end, longitude=args.lon, lunar_day=lunar_day))),
+            "write_calendar": _timed(lambda: write_calendar(path, start, end, longitude=args.lon, lunar_day=lunar_day)),
+        }
+        with DayCalendar(path) as cal:
+            results["query"] = _timed(lambda: [cal.day_context(d) for d in dates])
+        size = path.stat().st_size
+
+    print(f"{n:,} días ({args.engine}), archivo {size / 1024:,.0f} KiB")
+    for name, secs in results.items():
+        count = args.queries if name == "query" else n
+        print(f"{name:>15}: {secs:8.3f} s  {count / secs:14,.0f} días/s")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
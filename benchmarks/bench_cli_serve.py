@@ -0,0 +1,111 @@
+"""Benchmark: `tsurphu tibetan-year` (un proceso por consulta) vs `tsurphu serve`.
+
+Mide latencia (una consulta a la vez, esperando respuesta) y throughput
+(consultas en pipeline) por stdin/stdout y, si hay sockets Unix, por socket.
+
+Uso: python benchmarks/bench_cli_serve.py --n 20000 --spawn 50
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+CLI = [sys.executable, "-m", "orchestration.cli"]
+
+
+def _request(year: int) -> bytes:
+    return json.dumps({"cmd": "tibetan-year", "year": year}).encode() + b"\n"
+
+
+def bench_spawn(n: int) -> float:
+    t0 = time.perf_counter()
+    for i in range(n):
+        subprocess.run(CLI + ["tibetan-year", str(1900 + i % 200), "--json"], check=True, capture_output=True)
+    return time.perf_counter() - t0
+
+
+def bench_stdio_latency(n: int) -> float:
+    p = subprocess.Popen(CLI + ["serve"], stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+    t0 = time.perf_counter()
+    for i in range(n):
+        p.stdin.write(_request(1900 + i % 200))
+        p.stdin.flush()
+        p.stdout.readline()
+    dt = time.perf_counter() - t0
+    p.stdin.close()
+    p.wait()
+    return dt
+
+
+def bench_stdio_pipelined(n: int) -> float:
+    payload = b"".join(_request(1900 + i % 200) for i in range(n))
+    p = subprocess.Popen(CLI + ["serve"], stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+    reader = threading.Thread(target=lambda: p.stdout.read())
+    t0 = time.perf_counter()
+    reader.start()
+    p.stdin.write(payload)
+    p.stdin.close()
+    reader.join()
+    dt = time.perf_counter() - t0
+    p.wait()
+    return dt
+
+
+def bench_socket(n: int, path: str) -> tuple[float, float]:
+    p = subprocess.Popen(CLI + ["serve", "--socket", path])
+    try:
+        for _ in range(500):
+            if os.path.exists(path):
+                break
+            time.sleep(0.01)
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+            s.connect(path)
+            f = s.makefile("rb")
+            t0 = time.perf_counter()
+            for i in range(n):
+                s.sendall(_request(1900 + i % 200))
+                f.readline()
+            latency = time.perf_counter() - t0
+
+            payload = b"".join(_request(1900 + i % 200) for i in range(n))
+            t0 = time.perf_counter()
+            threading.Thread(target=s.sendall, args=(payload,)).start()
+            for _ in range(n):
+                f.readline()
+            pipelined = time.perf_counter() - t0
+        return latency, pipelined
+    finally:
+        p.terminate()
+        p.wait()
+
+
+def _report(name: str, n: int, secs: float) -> None:
+    print(f"{name:>23}: {n:7d} consultas  {secs * 1e6 / n:10.1f} µs/consulta  {n / secs:12,.0f} consultas/s")
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--n", type=int, default=20000, help="Consultas por modo serve")
+    ap.add_argument("--spawn", type=int, default=50, help="Consultas con un proceso por consulta")
+    args = ap.parse_args()
+
+    _report("proceso por consulta", args.spawn, bench_spawn(args.spawn))
+    _report("serve stdio (latencia)", args.n, bench_stdio_latency(args.n))
+    _report("serve stdio (pipeline)", args.n, bench_stdio_pipelined(args.n))
+    if hasattr(socket, "AF_UNIX"):
+        with tempfile.TemporaryDirectory() as d:
+            latency, pipelined = bench_socket(args.n, os.path.join(d, "tsurphu.sock"))
+        _report("serve socket (latencia)", args.n, latency)
+        _report("serve socket (pipeline)", args.n, pipelined)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
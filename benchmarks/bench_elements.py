@@ -0,0 +1,63 @@
+"""Benchmark: relación elemental clientes × días, comparación por strings vs ElementMatrix.
+
+Uso: python benchmarks/bench_elements.py --clients 5000 --days 365
+"""
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import random
+import time
+
+from engines.rules import day_context, day_element_codes, element_codes, element_relation, load_element_matrix
+from engines.tibetan_year import ELEMENTS, np, tibetan_year
+
+
+def _timed(fn) -> float:
+    t0 = time.perf_counter()
+    fn()
+    return time.perf_counter() - t0
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--clients", type=int, default=5000, help="Cantidad de clientes")
+    ap.add_argument("--days", type=int, default=365, help="Cantidad de días")
+    args = ap.parse_args()
+
+    rng = random.Random(7)
+    clients = [tibetan_year(rng.randint(1930, 2010)) for _ in range(args.clients)]
+    days = [dt.date(2026, 1, 1) + dt.timedelta(days=i) for i in range(args.days)]
+    m = load_element_matrix()
+    weights = m.relation_weights
+
+    def per_pair():
+        # lo de antes: nombre -> índice y relación por comparación, par por par; luego ordenar
+        day_el = [ELEMENTS[day_context(d).element] for d in days]
+        out = []
+        for c in clients:
+            w = [weights.get(element_relation(ELEMENTS.index(c.element), ELEMENTS.index(e)), 0) for e in day_el]
+            out.append(sorted(range(len(days)), key=w.__getitem__, reverse=True))
+        return out
+
+    def batch(backend):
+        return lambda: m.rank_days(
+            element_codes(clients, backend=backend), day_element_codes(days, backend=backend), backend=backend
+        )
+
+    results = {
+        "per-pair": _timed(per_pair),
+        "rank[array]": _timed(batch("array")),
+    }
+    if np is not None:
+        results["rank[numpy]"] = _timed(batch("numpy"))
+
+    cells = args.clients * args.days
+    base = results["per-pair"]
+    for name, secs in results.items():
+        print(f"{name:>12}: {secs:8.3f} s  {cells / secs:14,.0f} cliente·día/s  x{base / secs:6.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,41 @@
+"""Benchmark: motor analítico Sol/Luna, escalar vs vectorizado.
+
+Uso: python benchmarks/bench_ephemeris.py --n 100000
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from tsurphu.astro.ephemeris import body_ecliptic, ecliptic_many, np  # noqa: E402
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--n", type=int, default=100_000, help="Cantidad de JDs por cuerpo")
+    args = ap.parse_args()
+
+    jds = [2451545.0 + i * 0.01 for i in range(args.n)]
+    backend = "numpy" if np is not None else "array"
+    for body in ("Sun", "Moon"):
+        t0 = time.perf_counter()
+        for jd in jds:
+            body_ecliptic(body, jd)
+        scalar = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        ecliptic_many(body, jds)
+        many = time.perf_counter() - t0
+
+        print(f"{body:>4}: escalar {args.n / scalar:12,.0f} JD/s | ecliptic_many[{backend}] "
+              f"{args.n / many:12,.0f} JD/s  x{scalar / many:6.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
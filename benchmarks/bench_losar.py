@@ -0,0 +1,49 @@
+"""Benchmark: año tibetano de muchas fechas de nacimiento (índice de Losar) vs tibetan_year por fecha.
+
+Uso: python benchmarks/bench_losar.py --n 1000000
+"""
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import random
+import time
+
+from engines.losar import load_losar_index
+from engines.tibetan_year import np, tibetan_year, tibetan_years_for_dates
+
+
+def _timed(fn) -> float:
+    t0 = time.perf_counter()
+    fn()
+    return time.perf_counter() - t0
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--n", type=int, default=1000000, help="Cantidad de fechas")
+    args = ap.parse_args()
+
+    rng = random.Random(7)
+    start = dt.date(1920, 1, 1)
+    dates = [(start + dt.timedelta(days=rng.randrange(36500))).isoformat() for _ in range(args.n)]
+
+    results = {"index build": _timed(load_losar_index)}
+    index = load_losar_index()
+    sample = dates[: max(1, args.n // 100)]
+    scalar = _timed(lambda: [tibetan_year(dt.date.fromisoformat(d)) for d in sample])
+    results["tibetan_year(date)"] = scalar * (args.n / len(sample))  # extrapolado desde el 1 %
+    results["years_of[array]"] = _timed(lambda: index.years_of(dates, backend="array"))
+    results["columns[array]"] = _timed(lambda: tibetan_years_for_dates(dates, backend="array"))
+    if np is not None:
+        results["years_of[numpy]"] = _timed(lambda: index.years_of(dates, backend="numpy"))
+        results["columns[numpy]"] = _timed(lambda: tibetan_years_for_dates(dates, backend="numpy"))
+
+    for name, secs in results.items():
+        rate = "" if name == "index build" else f"  {args.n / secs:14,.0f} fechas/s"
+        print(f"{name:>18}: {secs:8.3f} s{rate}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
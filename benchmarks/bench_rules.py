@@ -0,0 +1,45 @@
+"""Benchmark: motor de reglas 7x-3, evaluate() por acción/día vs score_days() batch.
+
+Uso: python benchmarks/bench_rules.py --days 36500
+"""
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import time
+
+from engines.rules import load_rule_engine
+from engines.tibetan_year import np
+
+
+def _timed(fn) -> float:
+    t0 = time.perf_counter()
+    fn()
+    return time.perf_counter() - t0
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--days", type=int, default=36500, help="Cantidad de días")
+    ap.add_argument("--importance", default="high")
+    args = ap.parse_args()
+
+    engine = load_rule_engine()
+    days = [dt.date(1950, 1, 1) + dt.timedelta(days=i) for i in range(args.days)]
+    cells = len(days) * len(engine.actions)
+
+    results = {
+        "evaluate": _timed(lambda: [engine.evaluate(a, d, "Wood", args.importance) for d in days for a in engine.actions]),
+        "batch[array]": _timed(lambda: engine.score_days(days, "Wood", args.importance, backend="array").matrix()),
+    }
+    if np is not None:
+        results["batch[numpy]"] = _timed(lambda: engine.score_days(days, "Wood", args.importance, backend="numpy").matrix())
+
+    base = results["evaluate"]
+    for name, secs in results.items():
+        print(f"{name:>14}: {secs:8.3f} s  {cells / secs:14,.0f} acción·día/s  x{base / secs:6.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,69 @@
+"""Benchmark: cliente Stellarium síncrono vs asyncio contra un servidor mock local.
+
+Carga de trabajo: N instantes; en cada uno se fija el tiempo y se piden Sun/Moon/Mars.
+El mock agrega `--latency-ms` por petición (como el render de Stellarium).
+
+Uso: python benchmarks/bench_stellarium_async.py --n 200 --latency-ms 2
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from tests.stellarium_mock import MockStellarium  # noqa: E402
+from tsurphu.integraciones.stellarium_rc import StellariumRCConfig, StellariumRemoteControlClient  # noqa: E402
+from tsurphu.integraciones.stellarium_rc_async import AsyncStellariumRemoteControlClient  # noqa: E402
+
+BODIES = ["Sun", "Moon", "Mars"]
+
+
+def bench_sync(config: StellariumRCConfig, jds: list[float]) -> float:
+    t0 = time.perf_counter()
+    with StellariumRemoteControlClient(config) as c:
+        for jd in jds:
+            c.set_time_jd(jd, 0)
+            for b in BODIES:
+                c.object_info(b)
+    return time.perf_counter() - t0
+
+
+async def _async_run(config: StellariumRCConfig, jds: list[float], concurrency: int) -> None:
+    async with AsyncStellariumRemoteControlClient(config, max_concurrency=concurrency) as c:
+        await asyncio.gather(*(c.query_at(jd, BODIES) for jd in jds))
+
+
+def bench_async(config: StellariumRCConfig, jds: list[float], concurrency: int) -> float:
+    t0 = time.perf_counter()
+    asyncio.run(_async_run(config, jds, concurrency))
+    return time.perf_counter() - t0
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--n", type=int, default=200, help="Cantidad de instantes")
+    ap.add_argument("--latency-ms", type=float, default=2.0)
+    ap.add_argument("--concurrency", type=int, default=4)
+    args = ap.parse_args()
+
+    jds = [2460000.5 + i * 0.25 for i in range(args.n)]
+    with MockStellarium(latency_s=args.latency_ms / 1000.0) as mock:
+        config = StellariumRCConfig(port=mock.port)
+        results = {
+            "sync": bench_sync(config, jds),
+            f"async (x{args.concurrency})": bench_async(config, jds, args.concurrency),
+        }
+
+    base = results["sync"]
+    for name, secs in results.items():
+        print(f"{name:>12}: {secs:7.3f} s  {args.n / secs:9.1f} instantes/s  x{base / secs:5.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
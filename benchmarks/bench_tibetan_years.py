@@ -0,0 +1,38 @@
+"""Benchmark: tibetan_year escalar (bucle) vs tibetan_years (batch columnar).
+
+Uso: python benchmarks/bench_tibetan_years.py --n 1000000
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+from engines.tibetan_year import np, tibetan_year, tibetan_years
+
+
+def _timed(fn) -> float:
+    t0 = time.perf_counter()
+    fn()
+    return time.perf_counter() - t0
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--n", type=int, default=1_000_000, help="Cantidad de años")
+    ap.add_argument("--start", type=int, default=1000)
+    args = ap.parse_args()
+
+    years = range(args.start, args.start + args.n)
+    results = {"scalar": _timed(lambda: [tibetan_year(y) for y in years])}
+    results["batch[array]"] = _timed(lambda: tibetan_years(years, backend="array"))
+    if np is not None:
+        results["batch[numpy]"] = _timed(lambda: tibetan_years(years, backend="numpy"))
+
+    base = results["scalar"]
+    for name, secs in results.items():
+        print(f"{name:>14}: {secs:8.3f} s  {args.n / secs:14,.0f} años/s  x{base / secs:6.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,75 @@
+"""Benchmark: verificación de changesets completa (serial, como antes) vs pool en frío vs incremental.
+
+Uso: python benchmarks/bench_validate_changesets.py --n 5000
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from governance.changesets import canon, packet_hash, validate_changesets
+
+
+def _synthetic_packet(i: int) -> dict:
+    pkt = {
+        "packet_version": "1.0",
+        "change_id": f"TSU-BENCH-{i:06d}",
+        "timestamp_utc": "2026-01-13T16:12:47Z",
+        "actor": {"role": "Engineer", "id": ""},
+        "change_type": "update",
+        "scope": {"layers_7x": ["7x-L7"], "modules": ["misc"]},
+        "objects_affected": [
+            {"object_id": f"TSU-OBJ-{j:04d}", "operation": "update", "path": f"/src/m{j}.py", "sensitivity": "low"}
+            for j in range(i % 7 + 1)
+        ],
+        "rationale": "Paquete sintético de benchmark. " * 8,
+        "evidence": [],
+        "impact": {"expected_behavior_change": "", "risk_level": "low", "compatibility": "backward"},
+        "rollback": {"needed": False, "plan": ""},
+        "approval": {"required": True, "approver_role": "Zakik", "status": "pending", "notes": ""},
+        "integrity": {"canonicalization": "json-keys-sorted-utf8", "hash_alg": "sha256", "packet_hash": ""},
+    }
+    pkt["integrity"]["packet_hash"] = packet_hash(pkt)
+    return pkt
+
+
+def _timed(fn):
+    t0 = time.perf_counter()
+    out = fn()
+    return time.perf_counter() - t0, out
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--n", type=int, default=5000, help="Cantidad de paquetes sintéticos")
+    ap.add_argument("--touch", type=float, default=0.01, help="Fracción de paquetes modificados antes de la corrida incremental")
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as td:
+        d = Path(td) / "changesets"
+        d.mkdir()
+        for i in range(args.n):
+            (d / f"TSU-BENCH-{i:06d}.json").write_bytes(canon(_synthetic_packet(i)))
+        paths = sorted(d.glob("*.json"))
+        manifest = Path(td) / "manifest.json"
+
+        results = {}
+        results["full serial"] = _timed(lambda: validate_changesets(paths, jobs=1))
+        results["cold pool"] = _timed(lambda: validate_changesets(paths, manifest_path=manifest))
+        results["warm"] = _timed(lambda: validate_changesets(paths, manifest_path=manifest))
+        for p in paths[: max(1, int(len(paths) * args.touch))]:
+            st = p.stat()
+            os.utime(p, ns=(st.st_atime_ns, st.st_mtime_ns + 1000))
+        results["incremental"] = _timed(lambda: validate_changesets(paths, manifest_path=manifest))
+
+    base = results["full serial"][0]
+    for name, (secs, rep) in results.items():
+        print(f"{name:>12}: {secs:8.3f} s  verificados={rep.verified:6d}  caché={rep.cached:6d}  x{base / secs:6.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
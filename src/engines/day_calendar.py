@@ -0,0 +1,287 @@
+from __future__ import annotations
+
+import datetime as dt
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+from .losar import load_losar_index
+from .rules.engine import DayContext, day_context
+from .tibetan_year import ANIMALS, ELEMENTS, PARKHAS, np, tibetan_year
+
+# Calendario por día en una sola pasada:
+# - weekday / animal / elemento del día salen de un ciclo precalculado de 420 días
+#   (mcm de la semana y del ciclo sexagenario diario);
+# - los atributos del año (elemento, animal, mewa, parkha) se calculan una vez por año
+#   tibetano, que cambia en Losar (índice de engines.losar);
+# - el día lunar es el tithi vigente al amanecer local (06:00 de tiempo solar medio en
+#   `longitude`) con el `lunar_day(jd)` que pase quien llama: el tithi verdadero sale de
+#   una fuente de posiciones (position_lunar_day, p. ej. la efeméride analítica de
+#   tsurphu.astro, que arma la CLI); la elongación media (mean_lunar_day) es mucho más
+#   rápida pero se aparta en un tithi en ~40% de los días.
+# `write_calendar` guarda el resultado columnar (una columna contigua por campo) y
+# `DayCalendar` lo abre con mmap: cada consulta es un offset = fecha - inicio.
+
+CALENDAR_MAGIC = b"TSURPHU-CAL\n"
+CALENDAR_VERSION = 1
+_ALIGN = 64
+
+# (nombre, typecode de array) en el orden en que se escriben las columnas
+COLUMNS: Tuple[Tuple[str, str], ...] = (
+    ("year", "h"),          # año tibetano vigente (etiqueta gregoriana, como tibetan_year)
+    ("weekday", "b"),       # 0 = lunes
+    ("lunar_day", "b"),     # tithi 1..30 al amanecer (motor en header["lunar_day"])
+    ("animal", "b"),        # índice en ANIMALS (animal del día)
+    ("element", "b"),       # índice en ELEMENTS (elemento del día)
+    ("year_element", "b"),
+    ("year_animal", "b"),
+    ("mewa", "b"),
+    ("parkha", "b"),        # índice en PARKHAS
+)
+
+_JD_AT_ORDINAL_0H = 1721424.5  # JD a las 0h UT de date.fromordinal(0)
+_J2000 = 2451545.0
+# Elongación media Luna-Sol (Meeus 47.2, términos lineales)
+_ELONG_J2000 = 297.8501921
+_ELONG_RATE = 445267.1114034 / 36525.0  # grados/día
+
+LunarDay = Callable[[float], int]
+
+
+class DayRecord(NamedTuple):
+    date: dt.date
+    year: int
+    weekday: int
+    lunar_day: int
+    animal: int
+    element: int
+    year_element: int
+    year_animal: int
+    mewa: int
+    parkha: int
+
+
+def mean_lunar_day(jd: float) -> int:
+    """Tithi (1..30) con la elongación media: rápido y sin efemérides."""
+    return int(((_ELONG_J2000 + _ELONG_RATE * (jd - _J2000)) % 360.0) // 12.0) + 1
+
+
+def position_lunar_day(source: Any) -> LunarDay:
+    """`lunar_day` a partir de una fuente de posiciones (`sun_moon_lon(jd)`, p. ej. tsurphu.astro.tithi)."""
+
+    def lunar_day(jd: float) -> int:
+        sun, moon = source.sun_moon_lon(jd)
+        return int(((moon - sun) % 360.0) // 12.0) + 1
+
+    lunar_day.__name__ = f"position:{type(source).__name__}"
+    return lunar_day
+
+
+def daybreak_jd(d: dt.date, longitude: float = 0.0) -> float:
+    """JD (UT) de las 06:00 de tiempo solar medio local en `d`; longitude en grados (+ este)."""
+    return d.toordinal() + _JD_AT_ORDINAL_0H + 0.25 - longitude / 360.0
+
+
+# Contexto del día por ordinal % 420 (420 ≡ 0, así que el índice es el residuo directo)
+_DAY_CYCLE: Tuple[DayContext, ...] = tuple(day_context(dt.date.fromordinal(420 + r)) for r in range(420))
+
+
+def _year_codes(year: int, lookups_dir: Optional[Path]) -> Tuple[int, int, int, int]:
+    ty = tibetan_year(year, lookups_dir=lookups_dir)
+    return ty.stem_index >> 1, ty.branch_index, ty.mewa or 0, PARKHAS.index(ty.parkha) if ty.parkha else -1
+
+
+def iter_days(
+    start: dt.date,
+    end: dt.date,
+    *,
+    longitude: float = 0.0,
+    lunar_day: LunarDay,
+    lookups_dir: Optional[Path] = None,
+) -> Iterator[DayRecord]:
+    """Un DayRecord por día de `start` a `end` (incluido), en orden y sin materializar el rango."""
+    if end < start:
+        raise ValueError("end debe ser >= start")
+    cycle = _DAY_CYCLE
+    losar = load_losar_index(lookups_dir)
+    year = losar.year_of(start)
+    codes = _year_codes(year, lookups_dir)
+    next_losar = losar.losar(year + 1).toordinal()
+    jd = daybreak_jd(start, longitude)
+    for o in range(start.toordinal(), end.toordinal() + 1):
+        if o >= next_losar:
+            year += 1
+            codes = _year_codes(year, lookups_dir)
+            next_losar = losar.losar(year + 1).toordinal()
+        wd, animal, element = cycle[o % 420]
+        yield DayRecord(dt.date.fromordinal(o), year, wd, lunar_day(jd), animal, element, *codes)
+        jd += 1.0
+
+
+def _encode_header(header: Dict[str, Any]) -> bytes:
+    body = json.dumps(header, sort_keys=True).encode("utf-8")
+    total = len(CALENDAR_MAGIC) + 4 + len(body) + 1
+    body += b" " * (-total % _ALIGN) + b"\n"
+    return CALENDAR_MAGIC + struct.pack("<I", len(body)) + body
+
+
+def write_calendar(
+    path: Union[str, Path],
+    start: dt.date,
+    end: dt.date,
+    *,
+    longitude: float = 0.0,
+    lunar_day: LunarDay,
+    lookups_dir: Optional[Path] = None,
+) -> Path:
+    """Genera el calendario de `start` a `end` y lo escribe en formato columnar (rename atómico)."""
+    path = Path(path)
+    cols = [array(code) for _, code in COLUMNS]
+    appends = [c.append for c in cols]
+    for rec in iter_days(start, end, longitude=longitude, lunar_day=lunar_day, lookups_dir=lookups_dir):
+        for append, value in zip(appends, rec[1:]):
+            append(value)
+
+    header = {
+        "version": CALENDAR_VERSION,
+        "start": start.isoformat(),
+        "days": len(cols[0]),
+        "longitude": longitude,
+        "lunar_day": getattr(lunar_day, "__name__", "custom"),  # motor: analytic | mean_lunar_day | ...
+        "columns": [[name, code] for name, code in COLUMNS],
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with tmp.open("wb") as f:
+        f.write(_encode_header(header))
+        for col in cols:
+            if col.itemsize > 1 and sys.byteorder == "big":
+                col.byteswap()  # el archivo es little-endian
+            f.write(col.tobytes())
+            f.write(b"\0" * (-f.tell() % _ALIGN))
+    os.replace(tmp, path)
+    return path
+
+
+class DayCalendar:
+    """Calendario columnar abierto con mmap; las columnas son vistas, no copias.
+
+    column() devuelve un numpy.ndarray si NumPy está instalado, si no un memoryview.
+    """
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.path = Path(path)
+        with self.path.open("rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mm[: len(CALENDAR_MAGIC)] != CALENDAR_MAGIC:
+            self._mm.close()
+            raise ValueError(f"{self.path}: no es un calendario tsurphu")
+        pos = len(CALENDAR_MAGIC)
+        (hlen,) = struct.unpack_from("<I", self._mm, pos)
+        header = json.loads(self._mm[pos + 4 : pos + 4 + hlen])
+        if header.get("version") != CALENDAR_VERSION:
+            self._mm.close()
+            raise ValueError(f"{self.path}: versión de calendario {header.get('version')} no soportada")
+        self.header = header
+        self.start = dt.date.fromisoformat(header["start"])
+        self.days = int(header["days"])
+        self.longitude = float(header["longitude"])
+        self._start_ordinal = self.start.toordinal()
+
+        self._spans: Dict[str, Tuple[int, str]] = {}
+        offset = pos + 4 + hlen
+        for name, code in header["columns"]:
+            self._spans[name] = (offset, code)
+            size = self.days * array(code).itemsize
+            offset += size + (-(offset + size) % _ALIGN)
+        if offset > len(self._mm):
+            self._mm.close()
+            raise ValueError(f"{self.path}: archivo truncado")
+        self._cache: Dict[str, Any] = {}
+
+    @property
+    def end(self) -> dt.date:
+        return self.start + dt.timedelta(days=self.days - 1)
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self._spans)
+
+    def __len__(self) -> int:
+        return self.days
+
+    def offset(self, d: dt.date) -> int:
+        i = d.toordinal() - self._start_ordinal
+        if not 0 <= i < self.days:
+            raise KeyError(f"{d} fuera del calendario ({self.start}..{self.end})")
+        return i
+
+    def column(self, name: str):
+        col = self._cache.get(name)
+        if col is None:
+            try:
+                start, code = self._spans[name]
+            except KeyError:
+                raise KeyError(f"columna desconocida: {name!r} (hay: {self.columns})") from None
+            size = self.days * array(code).itemsize
+            if np is not None:
+                col = np.frombuffer(self._mm, dtype=np.dtype(code).newbyteorder("<"), count=self.days, offset=start)
+            else:
+                col = memoryview(self._mm)[start : start + size].cast(code)
+            self._cache[name] = col
+        return col
+
+    def record(self, key: Union[dt.date, int]) -> DayRecord:
+        i = self.offset(key) if isinstance(key, dt.date) else key
+        if not 0 <= i < self.days:
+            raise IndexError(i)
+        return DayRecord(
+            dt.date.fromordinal(self._start_ordinal + i), *(int(self.column(name)[i]) for name, _ in COLUMNS)
+        )
+
+    def day_context(self, key: Union[dt.date, int]) -> DayContext:
+        """DayContext listo para RuleEngine.evaluate, leído de las columnas."""
+        i = self.offset(key) if isinstance(key, dt.date) else key
+        return DayContext(int(self.column("weekday")[i]), int(self.column("animal")[i]), int(self.column("element")[i]))
+
+    def __iter__(self) -> Iterator[DayRecord]:
+        for i in range(self.days):
+            yield self.record(i)
+
+    def close(self) -> None:
+        self._cache.clear()
+        try:
+            self._mm.close()
+        except BufferError:
+            pass  # quedan vistas vivas (column()); el mapeo se libera con ellas
+
+    def __enter__(self) -> "DayCalendar":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def open_calendar(path: Union[str, Path]) -> DayCalendar:
+    return DayCalendar(path)
+
+
+def record_to_dict(rec: DayRecord) -> Dict[str, Any]:
+    """Fila legible (nombres en vez de códigos), p. ej. para JSONL."""
+    return {
+        "date": rec.date.isoformat(),
+        "weekday": rec.weekday,
+        "lunar_day": rec.lunar_day,
+        "animal": ANIMALS[rec.animal],
+        "element": ELEMENTS[rec.element],
+        "year": rec.year,
+        "year_element": ELEMENTS[rec.year_element],
+        "year_animal": ANIMALS[rec.year_animal],
+        "mewa": rec.mewa,
+        "parkha": PARKHAS[rec.parkha] if rec.parkha >= 0 else None,
+    }
@@ -0,0 +1,260 @@
+from __future__ import annotations
+
+import bisect
+import csv
+import datetime as dt
+import math
+import os
+from array import array
+from dataclasses import dataclass, field
+from fractions import Fraction
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+try:  # NumPy es opcional: el modo batch cae a `bisect` si no está instalado
+    import numpy as np
+except ImportError:  # pragma: no cover - depende del entorno
+    np = None
+
+# Losar (año nuevo tibetano) y año tibetano de una fecha gregoriana.
+# - El índice de Losar se calcula con el calendario Phugpa (aritmética de Janson, época
+#   E806): cuenta de meses verdaderos con intercalación 67/65 y fecha verdadera =
+#   fecha media + ecuación lunar − ecuación solar (tablas de 28 y 12 pasos, interpoladas).
+#   Losar = día siguiente al día 30 del último mes del año anterior.
+# - Si hay un lookups/losar_dates.csv (year,losar) sus filas reemplazan a las calculadas.
+# - El año tibetano lleva la etiqueta del año gregoriano en que empieza (como tibetan_year):
+#   una fecha anterior al Losar de su año gregoriano pertenece al año anterior.
+# Las claves son enteros AAAAMMDD (monótonos con la fecha), así que una fecha en texto
+# ISO no necesita parsearse a `date` para ubicarla con bisect; solo se valida que mes y
+# día existan (2025-02-30 es un error, no una clave entre dos Losar).
+
+# Constantes Phugpa (fracciones de día / de vuelta), época E806
+_M0 = 2015501 + Fraction(4783, 5656)   # fecha media: día juliano
+_M1 = Fraction(167025, 5656)           # mes sinódico medio
+_M2 = Fraction(11135, 11312)           # día lunar medio
+_A0, _A1, _A2 = Fraction(475, 3528), Fraction(253, 3528), Fraction(1, 28)  # anomalía lunar
+_S0, _S1, _S2 = Fraction(743, 804), Fraction(65, 804), Fraction(13, 4824)  # sol medio
+_MOON_TAB = (0, 5, 10, 15, 19, 22, 24, 25)  # cuarto de la tabla de 28 pasos
+_SUN_TAB = (0, 6, 10, 11)                   # cuarto de la tabla de 12 pasos
+# Desfase de intercalación para la cuenta 67/65; calibrado contra los Losar publicados
+# 1998-2026 (76..78 reproducen todos; se toma el centro)
+_BETA = 77
+_JDN_OFFSET = 1721425  # date.toordinal() + _JDN_OFFSET = número de día juliano
+
+LOSAR_FIRST_YEAR = 1600
+LOSAR_LAST_YEAR = 2400
+LOSAR_CSV = "losar_dates.csv"
+
+DateLike = Union[dt.date, str]
+
+
+def _tab(table: Sequence[int], x: Fraction) -> Fraction:
+    """Tabla simétrica (cuarto `table`, período 4 * (len - 1)) interpolada linealmente en x."""
+    quarter = len(table) - 1
+    x = x % (4 * quarter)
+    sign = 1
+    if x >= 2 * quarter:
+        x, sign = x - 2 * quarter, -1
+    if x > quarter:
+        x = 2 * quarter - x
+    i = math.floor(x)
+    if i == quarter:
+        return sign * Fraction(table[i])
+    return sign * (table[i] + (table[i + 1] - table[i]) * (x - i))
+
+
+def _frac(x: Fraction) -> Fraction:
+    return x - math.floor(x)
+
+
+def true_date(day: int, month_count: int) -> Fraction:
+    """Fecha verdadera (día juliano fraccionario) del día lunar `day` del mes verdadero `month_count`."""
+    mean_date = month_count * _M1 + day * _M2 + _M0
+    moon_anomaly = month_count * _A1 + day * _A2 + _A0
+    mean_sun = month_count * _S1 + day * _S2 + _S0
+    moon_equ = _tab(_MOON_TAB, 28 * _frac(moon_anomaly))
+    sun_equ = _tab(_SUN_TAB, 12 * _frac(mean_sun - Fraction(1, 4)))
+    return mean_date + (moon_equ - sun_equ) / 60
+
+
+def first_month_count(year: int) -> int:
+    """Cuenta de meses verdaderos del primer mes del año `year` (el intercalar, si el mes 1 lo tiene)."""
+    x = 67 * (12 * (year - 806) - 2) + _BETA
+    n = x // 65
+    return n - 1 if x % 65 in (0, 1) else n
+
+
+def losar_date(year: int) -> dt.date:
+    """Losar (Phugpa) del año tibetano que empieza en el año gregoriano `year`."""
+    jd = math.floor(true_date(30, first_month_count(year) - 1)) + 1
+    return dt.date.fromordinal(jd - _JDN_OFFSET)
+
+
+def date_key(value: DateLike) -> int:
+    """Clave AAAAMMDD de una fecha (date/datetime o texto ISO 'AAAA-MM-DD...')."""
+    if isinstance(value, str):
+        if value[4:8:3] == "--" and len(value) >= 10:
+            try:
+                key = int(value[:4] + value[5:7] + value[8:10])
+                dt.date(key // 10000, key // 100 % 100, key % 100)
+                return key
+            except ValueError:
+                pass
+    elif isinstance(value, dt.date):
+        return value.year * 10000 + value.month * 100 + value.day
+    raise ValueError(f"fecha inválida (se espera AAAA-MM-DD): {value!r}")
+
+
+_KEY_DIGITS = (0, 1, 2, 3, 5, 6, 8, 9)  # posiciones de los dígitos en 'AAAA-MM-DD'
+_MONTH_DAYS = (0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+
+def _date_keys_np(values):
+    """Claves AAAAMMDD vectorizadas: texto/fechas -> 'U10' -> códigos de carácter -> dígitos."""
+    chars = np.asarray(values if isinstance(values, np.ndarray) else list(values), dtype="U10").ravel()
+    codes = chars.view(np.uint32).reshape(-1, 10).astype(np.int64) - 48
+    digits = codes[:, _KEY_DIGITS]
+    ok = (codes[:, 4] == -3) & (codes[:, 7] == -3) & ((digits >= 0) & (digits <= 9)).all(axis=1)
+    keys = digits @ np.array([10**7, 10**6, 10**5, 10**4, 1000, 100, 10, 1], dtype=np.int64)
+    # Mes y día existentes (febrero 29 solo en bisiestos), como date_key
+    year, month, day = keys // 10000, keys // 100 % 100, keys % 100
+    month_ok = (month >= 1) & (month <= 12)
+    leap = (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+    last = np.asarray(_MONTH_DAYS)[np.where(month_ok, month, 0)] + (leap & (month == 2))
+    ok &= month_ok & (day >= 1) & (day <= last) & (year >= 1)
+    if not ok.all():
+        raise ValueError(f"fecha inválida (se espera AAAA-MM-DD): {chars[int(np.argmin(ok))]!r}")
+    return keys
+
+
+@dataclass
+class LosarIndex:
+    """Losar ordenados (claves AAAAMMDD) de first_year a last_year + 1 (centinela), con bisect."""
+
+    first_year: int
+    keys: List[int] = field(default_factory=list)
+    source: str = "phugpa"  # "phugpa" | "phugpa+lookup"
+    _np_keys: object = None
+
+    @property
+    def last_year(self) -> int:
+        return self.first_year + len(self.keys) - 2
+
+    def _out_of_range(self, value: object) -> ValueError:
+        return ValueError(f"{value} fuera del índice de Losar ({self.first_year}..{self.last_year})")
+
+    def losar(self, year: int) -> dt.date:
+        i = year - self.first_year
+        if not 0 <= i < len(self.keys):
+            raise ValueError(f"año {year} fuera del índice de Losar ({self.first_year}..{self.last_year + 1})")
+        k = self.keys[i]
+        return dt.date(k // 10000, k // 100 % 100, k % 100)
+
+    def year_of(self, value: DateLike) -> int:
+        """Año tibetano (etiqueta gregoriana) de una fecha."""
+        i = bisect.bisect_right(self.keys, date_key(value)) - 1
+        if not 0 <= i < len(self.keys) - 1:
+            raise self._out_of_range(value)
+        return self.first_year + i
+
+    def years_of(self, values: Iterable[DateLike], *, backend: Optional[str] = None):
+        """Versión batch de year_of (numpy.searchsorted si está NumPy, si no bisect por fecha).
+
+        Con NumPy las fechas (texto ISO, date o datetime64) se convierten a clave sin pasar
+        por objetos Python.
+        """
+        if backend is None:
+            backend = "numpy" if np is not None else "array"
+        n = len(self.keys) - 1
+        if backend == "numpy":
+            if np is None:
+                raise RuntimeError("backend='numpy' requiere NumPy")
+            if self._np_keys is None:
+                self._np_keys = np.asarray(self.keys, dtype=np.int64)
+            keys = _date_keys_np(values)
+            idx = np.searchsorted(self._np_keys, keys, side="right") - 1
+            bad = (idx < 0) | (idx >= n)
+            if bad.any():
+                raise self._out_of_range(int(keys[int(np.argmax(bad))]))
+            return (idx + self.first_year).astype(np.int32)
+        if backend != "array":
+            raise ValueError(f"backend inválido: {backend}")
+        search, ks, first = bisect.bisect_right, self.keys, self.first_year
+        out = array("l")
+        for key in map(date_key, values):
+            i = search(ks, key) - 1
+            if not 0 <= i < n:
+                raise self._out_of_range(key)
+            out.append(first + i)
+        return out
+
+
+def build_losar_index(
+    first_year: int = LOSAR_FIRST_YEAR,
+    last_year: int = LOSAR_LAST_YEAR,
+    *,
+    overrides: Optional[Dict[int, dt.date]] = None,
+) -> LosarIndex:
+    if last_year < first_year:
+        raise ValueError("last_year debe ser >= first_year")
+    years = range(first_year, last_year + 2)  # + Losar del año siguiente: cierra el último año
+    dates = [losar_date(y) for y in years]
+    source = "phugpa"
+    if overrides:
+        for y, d in overrides.items():
+            if y in years:
+                dates[y - first_year] = d
+        source = "phugpa+lookup"
+    for y, a in zip(years, dates):
+        if a.year != y:
+            raise ValueError(f"índice de Losar inconsistente: Losar {y} cae en {a}")
+    return LosarIndex(first_year, [date_key(d) for d in dates], source)
+
+
+def read_losar_csv(path: Path) -> Dict[int, dt.date]:
+    """Filas year,losar (AAAA-MM-DD) de un lookup; errores como ValueError con la línea."""
+    out: Dict[int, dt.date] = {}
+    with Path(path).open("r", encoding="utf-8-sig", newline="") as f:
+        r = csv.DictReader(f)
+        if not {"year", "losar"} <= set(r.fieldnames or []):
+            raise ValueError(f"{path}: se esperan las columnas year,losar")
+        for row in r:
+            try:
+                out[int(row["year"])] = dt.date.fromisoformat((row["losar"] or "").strip())
+            except ValueError:
+                raise ValueError(f"{path} L{r.line_num}: fila inválida {row}") from None
+    return out
+
+
+_INDEXES: Dict[Tuple[Optional[Path], Optional[Tuple[int, int]]], LosarIndex] = {}
+
+
+def load_losar_index(lookups_dir: Optional[Path] = None) -> LosarIndex:
+    """Índice por defecto (1600..2400), con lookups_dir/losar_dates.csv encima si existe; cacheado."""
+    path = Path(lookups_dir) / LOSAR_CSV if lookups_dir is not None else None
+    stamp = None
+    if path is not None:
+        try:
+            st = os.stat(path)
+            stamp = (st.st_mtime_ns, st.st_size)
+        except FileNotFoundError:
+            path = None
+    key = (path, stamp)
+    index = _INDEXES.get(key)
+    if index is None:
+        index = _INDEXES[key] = build_losar_index(overrides=read_losar_csv(path) if path else None)
+    return index
+
+
+def tibetan_year_number(value: DateLike, *, lookups_dir: Optional[Path] = None) -> int:
+    """Año tibetano (etiqueta: año gregoriano en que empieza) de una fecha."""
+    return load_losar_index(lookups_dir).year_of(value)
+
+
+def tibetan_year_numbers(
+    values: Iterable[DateLike],
+    *,
+    lookups_dir: Optional[Path] = None,
+    backend: Optional[str] = None,
+):
+    return load_losar_index(lookups_dir).years_of(values, backend=backend)
@@ -0,0 +1,59 @@
+"""Motor de reglas 7x-3 (perfiles de día + precedencia) compilado a bitsets."""
+
+from .elements import (
+    ELEMENT_CODES,
+    RELATION_MATRIX,
+    RELATIONS,
+    ElementMatrix,
+    day_element_codes,
+    element_codes,
+    element_index,
+    element_relation,
+    load_element_matrix,
+)
+from .engine import (
+    AVOID,
+    FAVORABLE,
+    NEUTRAL,
+    UNFAVORABLE,
+    VERDICT_CODES,
+    DayContext,
+    DayMasks,
+    RuleEngine,
+    RuleResult,
+    day_context,
+    load_rule_engine,
+)
+from .seed import SEED_DIR, RuleSeed, SeedError, load_seed
+from .snapshot import SeedQualityError, SeedSnapshot, compile_seed, load_seed_snapshot
+
+__all__ = [
+    "AVOID",
+    "ELEMENT_CODES",
+    "FAVORABLE",
+    "NEUTRAL",
+    "RELATIONS",
+    "RELATION_MATRIX",
+    "UNFAVORABLE",
+    "VERDICT_CODES",
+    "DayContext",
+    "DayMasks",
+    "ElementMatrix",
+    "RuleEngine",
+    "RuleResult",
+    "RuleSeed",
+    "SEED_DIR",
+    "SeedError",
+    "SeedQualityError",
+    "SeedSnapshot",
+    "compile_seed",
+    "day_context",
+    "day_element_codes",
+    "element_codes",
+    "element_index",
+    "element_relation",
+    "load_element_matrix",
+    "load_rule_engine",
+    "load_seed",
+    "load_seed_snapshot",
+]
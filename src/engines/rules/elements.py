@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import datetime as dt
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+
+from ..tibetan_year import ELEMENTS, TibetanYear, TibetanYearColumns, np
+from .seed import SEED_DIR, RuleSeed, SeedError
+from .snapshot import load_seed_snapshot
+
+# Relación elemental como modificador personal (7x-2_ontology/elements.yaml):
+# elemento del día vs elemento del año de nacimiento -> mother/child/friend/enemy (+ same).
+# Todo se precalcula en una matriz 5×5 [nacimiento][día] de códigos de relación y de pesos;
+# puntuar muchos pares (o una grilla clientes × días) es indexar esa matriz con códigos de
+# elemento, sin comparar strings.
+
+_GENERATES = (1, 2, 3, 4, 0)  # Wood→Fire→Earth→Metal→Water→Wood
+_CONTROLS = (2, 3, 4, 0, 1)   # Wood→Earth, Fire→Metal, Earth→Water, Metal→Wood, Water→Fire
+_N_ELEM = len(ELEMENTS)
+_JDN_OFFSET = 1721425  # date.toordinal() + _JDN_OFFSET = número de día juliano
+
+RELATIONS: Tuple[str, ...] = ("same", "mother", "child", "friend", "enemy")
+
+# Wood / wood / WOOD -> 0 ...
+ELEMENT_CODES: Dict[str, int] = {k: i for i, e in enumerate(ELEMENTS) for k in (e, e.lower(), e.upper())}
+
+ElementLike = Union[int, str, TibetanYear]
+
+
+def element_relation(person: int, day: int) -> str:
+    """Relación del elemento del día con el de la persona: mother/child/friend/enemy (o same)."""
+    if person == day:
+        return "same"
+    if _GENERATES[day] == person:
+        return "mother"
+    if _GENERATES[person] == day:
+        return "child"
+    if _CONTROLS[person] == day:
+        return "friend"
+    return "enemy"
+
+
+# [nacimiento][día] -> índice en RELATIONS
+RELATION_MATRIX: Tuple[Tuple[int, ...], ...] = tuple(
+    tuple(RELATIONS.index(element_relation(p, d)) for d in range(_N_ELEM)) for p in range(_N_ELEM)
+)
+
+
+def element_index(element: ElementLike) -> int:
+    """Código de elemento (índice en ELEMENTS) de un int, un nombre o un TibetanYear."""
+    if isinstance(element, TibetanYear):
+        element = element.element
+    if isinstance(element, int):
+        if not 0 <= element < _N_ELEM:
+            raise ValueError(f"código de elemento fuera de rango: {element}")
+        return element
+    try:
+        return ELEMENT_CODES[element]
+    except (KeyError, TypeError):
+        try:
+            return ELEMENT_CODES[element.capitalize()]
+        except (KeyError, AttributeError):
+            raise ValueError(f"elemento desconocido: {element!r}") from None
+
+
+def element_codes(values: Union[TibetanYearColumns, Iterable[ElementLike]], *, backend: Optional[str] = None):
+    """Códigos de elemento para muchos valores (TibetanYear, nombres o ints) de una vez.
+
+    Un TibetanYearColumns (tibetan_years) ya trae `element_code`: se devuelve tal cual.
+    """
+    if isinstance(values, TibetanYearColumns):
+        codes = values.element_code
+    else:
+        codes = array("b", map(element_index, values))
+    return _as_backend(codes, _backend(backend))
+
+
+def day_element_codes(days: Iterable[Union[dt.date, int]], *, backend: Optional[str] = None):
+    """Elemento de cada día (tronco del ciclo sexagenario diario // 2); acepta fechas u ordinales."""
+    ordinals = [d.toordinal() if isinstance(d, dt.date) else int(d) for d in days]
+    if _backend(backend) == "numpy":
+        return ((np.asarray(ordinals, dtype=np.int64) + (_JDN_OFFSET + 49)) % 10 // 2).astype(np.int8)
+    return array("b", [((o + _JDN_OFFSET + 49) % 10) // 2 for o in ordinals])
+
+
+def _backend(backend: Optional[str]) -> str:
+    if backend is None:
+        return "numpy" if np is not None else "array"
+    if backend == "numpy" and np is None:
+        raise RuntimeError("backend='numpy' requiere NumPy")
+    if backend not in ("numpy", "array"):
+        raise ValueError(f"backend desconocido: {backend!r}")
+    return backend
+
+
+def _as_backend(codes: Sequence[int], backend: str):
+    if backend == "numpy":
+        return np.asarray(codes, dtype=np.int8)
+    return codes if isinstance(codes, array) else array("b", (int(c) for c in codes))
+
+
+class ElementMatrix:
+    """Matriz 5×5 de relación y peso (nacimiento × día) con puntuación en batch."""
+
+    def __init__(self, relation_weights: Mapping[str, int]) -> None:
+        self.relation_weights = dict(relation_weights)
+        self.relation = RELATION_MATRIX
+        self.weight: Tuple[Tuple[int, ...], ...] = tuple(
+            tuple(self.relation_weights.get(RELATIONS[c], 0) for c in row) for row in RELATION_MATRIX
+        )
+        self.flat = array("b", [w for row in self.weight for w in row])  # índice nacimiento * 5 + día
+        self._np_weight = None
+
+    @classmethod
+    def from_seed(cls, seed: RuleSeed) -> "ElementMatrix":
+        if tuple(e.capitalize() for e in seed.elements) != ELEMENTS:
+            raise SeedError(f"elements.yaml: se esperaba el orden {list(ELEMENTS)}, no {seed.elements}")
+        return cls(seed.relation_weights)
+
+    def relation_of(self, birth: ElementLike, day: ElementLike) -> str:
+        return RELATIONS[self.relation[element_index(birth)][element_index(day)]]
+
+    def weight_of(self, birth: ElementLike, day: ElementLike) -> int:
+        return self.weight[element_index(birth)][element_index(day)]
+
+    def _weights_np(self):
+        if self._np_weight is None:
+            self._np_weight = np.asarray(self.weight, dtype=np.int8)
+        return self._np_weight
+
+    def score(self, births: Sequence[int], days: Sequence[int], *, backend: Optional[str] = None):
+        """Peso de cada par (births[i], days[i]); ambos son códigos de elemento del mismo largo."""
+        if len(births) != len(days):
+            raise ValueError(f"largo distinto: {len(births)} nacimientos vs {len(days)} días")
+        if _backend(backend) == "numpy":
+            return self._weights_np()[np.asarray(births, dtype=np.intp), np.asarray(days, dtype=np.intp)]
+        flat = self.flat
+        return array("b", [flat[b * _N_ELEM + d] for b, d in zip(births, days)])
+
+    def score_grid(self, births: Sequence[int], days: Sequence[int], *, backend: Optional[str] = None):
+        """Grilla de pesos len(births) × len(days) (clientes × días) en una sola llamada.
+
+        Con `array` se devuelve una fila por cliente; los clientes del mismo elemento
+        comparten el mismo objeto fila (hay a lo sumo 5 filas distintas).
+        """
+        if _backend(backend) == "numpy":
+            rows = self._weights_np()[:, np.asarray(days, dtype=np.intp)]
+            return rows[np.asarray(births, dtype=np.intp)]
+        rows = self._rows(days)
+        return [rows[b] for b in births]
+
+    def rank_days(
+        self,
+        births: Sequence[int],
+        days: Sequence[int],
+        *,
+        top: Optional[int] = None,
+        backend: Optional[str] = None,
+    ):
+        """Índices de `days` de mejor a peor peso para cada cliente (empates: el día más temprano).
+
+        El orden depende solo del elemento de nacimiento: se ordena una vez por elemento
+        y se reparte a todos los clientes.
+        """
+        if _backend(backend) == "numpy":
+            rows = self._weights_np()[:, np.asarray(days, dtype=np.intp)]
+            order = np.argsort(-rows.astype(np.int16), axis=1, kind="stable")
+            return order[:, :top][np.asarray(births, dtype=np.intp)]
+        rows = self._rows(days)
+        # sorted(reverse=True) conserva el orden original entre iguales
+        order = [array("l", sorted(range(len(days)), key=r.__getitem__, reverse=True)[:top]) for r in rows]
+        return [order[b] for b in births]
+
+    def _rows(self, days: Sequence[int]) -> List[array]:
+        return [array("b", [row[d] for d in days]) for row in self.weight]
+
+
+_MATRICES: Dict[Path, ElementMatrix] = {}
+
+
+def load_element_matrix(seed_dir: Optional[Path] = None) -> ElementMatrix:
+    """ElementMatrix con los pesos de elements.yaml (vía el snapshot del seed), una vez por proceso."""
+    key = Path(seed_dir).resolve() if seed_dir is not None else SEED_DIR
+    matrix = _MATRICES.get(key)
+    if matrix is None:
+        matrix = _MATRICES[key] = ElementMatrix.from_seed(load_seed_snapshot(key).rule_seed)
+    return matrix
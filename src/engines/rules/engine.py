@@ -0,0 +1,273 @@
+from __future__ import annotations
+
+import datetime as dt
+from array import array
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from ..tibetan_year import ANIMALS, ELEMENTS, np
+from .elements import _JDN_OFFSET, ElementMatrix, element_index
+from .seed import SEED_DIR, RuleSeed, SeedError
+from .snapshot import load_seed_snapshot
+
+# Motor de reglas 7x-3 compilado a bitsets:
+# - cada action_id de 7x-2_ontology/actions.yaml es un bit;
+# - cada capa (weekday_profile, animal_day_profile, personal_element_relation) es una
+#   tabla de máscaras precalculada;
+# - por importancia (precedence.yaml) se combinan las capas en UNA tabla indexada por
+#   (elemento de la persona, elemento del día, animal del día, día de la semana).
+# Consultar una acción es un lookup + tres AND.
+
+WEEKDAYS: Tuple[str, ...] = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+
+# Nombres del Key (seed) -> nombres del motor de años
+ANIMAL_ALIASES: Dict[str, str] = {"mouse": "Rat", "hare": "Rabbit", "boar": "Pig", "rooster": "Bird", "goat": "Sheep"}
+
+LAYER_WEEKDAY = "weekday_profile"
+LAYER_ANIMAL = "animal_day_profile"
+LAYER_ELEMENT = "personal_element_relation"
+COMPILED_LAYERS = (LAYER_WEEKDAY, LAYER_ANIMAL, LAYER_ELEMENT)
+
+AVOID, UNFAVORABLE, NEUTRAL, FAVORABLE = "avoid", "unfavorable", "neutral", "favorable"
+VERDICT_CODES: Dict[str, int] = {AVOID: -2, UNFAVORABLE: -1, NEUTRAL: 0, FAVORABLE: 1}
+
+_N_ELEM, _N_ANIMAL, _N_WEEKDAY = len(ELEMENTS), len(ANIMALS), len(WEEKDAYS)
+
+
+class DayContext(NamedTuple):
+    weekday: int  # 0 = lunes (date.weekday())
+    animal: int   # índice en ANIMALS (rama del ciclo sexagenario del día)
+    element: int  # índice en ELEMENTS (tronco del día // 2)
+
+
+def day_context(d: dt.date) -> DayContext:
+    """Día de la semana + animal/elemento del día (ciclo sexagenario diario: 2000-01-01 = Earth Horse)."""
+    idx = (d.toordinal() + _JDN_OFFSET + 49) % 60
+    return DayContext(d.weekday(), idx % 12, (idx % 10) // 2)
+
+
+class RuleResult(NamedTuple):
+    verdict: str           # avoid | unfavorable | neutral | favorable
+    conflict: bool         # la acción está a la vez en avoid y en favorable
+    divination: bool       # conflicto fuerte en evento "high" con rule_divination_on_strong_conflict
+    relation_weight: int   # peso de la relación elemental (0 si la capa no aplica)
+
+
+@dataclass(frozen=True)
+class _Table:
+    favorable: Sequence[int]
+    avoid: Sequence[int]
+    unfavorable: Sequence[int]
+    weight: Sequence[int]
+
+
+def _key(person_element: int, day: DayContext) -> int:
+    return ((person_element * _N_ELEM + day.element) * _N_ANIMAL + day.animal) * _N_WEEKDAY + day.weekday
+
+
+def _verdict(favorable: bool, avoid: bool, unfavorable: bool, avoid_dominates: bool) -> str:
+    if avoid and (avoid_dominates or not favorable):
+        return AVOID
+    if avoid or (favorable and unfavorable):
+        return NEUTRAL  # señales mixtas sin dominancia
+    if favorable:
+        return FAVORABLE
+    return UNFAVORABLE if unfavorable else NEUTRAL
+
+
+class RuleEngine:
+    def __init__(self, seed: RuleSeed) -> None:
+        self.seed = seed
+        self.actions: Tuple[str, ...] = tuple(seed.actions)
+        self.bit: Dict[str, int] = {a: i for i, a in enumerate(self.actions)}
+        if len(self.bit) != len(self.actions):
+            raise SeedError("actions.yaml: action_id duplicado")
+        self.all_mask = (1 << len(self.actions)) - 1
+        self.element_matrix = ElementMatrix.from_seed(seed)  # valida el orden de elements.yaml
+        self.relation_weight = self.element_matrix.flat  # índice persona * 5 + día
+
+        # --- capas ---
+        self.weekday_favorable = [0] * _N_WEEKDAY
+        self.weekday_avoid = [0] * _N_WEEKDAY
+        for day, prof in seed.weekday_profiles.items():
+            if day not in WEEKDAYS:
+                raise SeedError(f"day_profiles_key.yaml: día desconocido {day!r}")
+            wd = WEEKDAYS.index(day)
+            self.weekday_favorable[wd] = self.mask(prof["favorable"])
+            self.weekday_avoid[wd] = self.mask(prof["avoid"])
+
+        self.animal_avoid = [0] * _N_ANIMAL
+        for animal, avoid in seed.animal_day_avoid.items():
+            name = ANIMAL_ALIASES.get(animal, animal.capitalize())
+            if name not in ANIMALS:
+                raise SeedError(f"day_profiles_key.yaml: animal desconocido {animal!r}")
+            self.animal_avoid[ANIMALS.index(name)] |= self.mask(avoid)
+
+        # --- precedencia: una tabla combinada por importancia ---
+        self.avoid_dominates = seed.rule_avoid_dominates
+        self.depth: Dict[str, Tuple[str, ...]] = {k: tuple(v) for k, v in seed.depth_by_importance.items()}
+        # Capas declaradas sin datos en el seed (divinación, prácticas especiales): no se compilan
+        self.skipped_layers = sorted({l for v in self.depth.values() for l in v} - set(COMPILED_LAYERS))
+        self._tables = {imp: self._compile(set(layers)) for imp, layers in self.depth.items()}
+
+    def action_bit(self, action_id: str) -> int:
+        """Bit de `action_id` en las máscaras (ValueError si no está en actions.yaml)."""
+        try:
+            return self.bit[action_id]
+        except (KeyError, TypeError):
+            raise ValueError(f"action_id desconocido: {action_id!r} (no está en actions.yaml)") from None
+
+    def mask(self, action_ids: Iterable[str]) -> int:
+        m = 0
+        for a in action_ids:
+            try:
+                m |= 1 << self.bit[a]
+            except KeyError:
+                raise SeedError(f"action_id desconocido: {a!r} (no está en actions.yaml)") from None
+        return m
+
+    def actions_in(self, mask: int) -> List[str]:
+        return [a for i, a in enumerate(self.actions) if mask >> i & 1]
+
+    def _compile(self, layers: set) -> _Table:
+        fav, avoid, unfav, weight = [], [], [], []
+        use_w, use_a, use_e = LAYER_WEEKDAY in layers, LAYER_ANIMAL in layers, LAYER_ELEMENT in layers
+        for pe in range(_N_ELEM):
+            for de in range(_N_ELEM):
+                w = self.relation_weight[pe * _N_ELEM + de] if use_e else 0
+                rel_fav = self.all_mask if w > 0 else 0
+                rel_unfav = self.all_mask if w < 0 else 0
+                for br in range(_N_ANIMAL):
+                    a_avoid = self.animal_avoid[br] if use_a else 0
+                    for wd in range(_N_WEEKDAY):
+                        fav.append((self.weekday_favorable[wd] if use_w else 0) | rel_fav)
+                        avoid.append((self.weekday_avoid[wd] if use_w else 0) | a_avoid)
+                        unfav.append(rel_unfav)
+                        weight.append(w)
+        return _Table(fav, avoid, unfav, weight)
+
+    def _table(self, importance: str) -> _Table:
+        try:
+            return self._tables[importance]
+        except KeyError:
+            raise ValueError(f"importancia desconocida: {importance!r} (válidas: {list(self._tables)})") from None
+
+    # --- consultas ---
+
+    def evaluate(
+        self,
+        action_id: str,
+        day: Union[DayContext, dt.date],
+        person_element: Union[int, str],
+        importance: str = "medium",
+    ) -> RuleResult:
+        """¿`action_id` es favorable / a evitar el día `day` para una persona de elemento `person_element`?"""
+        t = self._table(importance)
+        if isinstance(day, dt.date):
+            day = day_context(day)
+        k = _key(element_index(person_element), day)
+        b = 1 << self.action_bit(action_id)
+        f, a, u = bool(t.favorable[k] & b), bool(t.avoid[k] & b), bool(t.unfavorable[k] & b)
+        conflict = f and a
+        return RuleResult(
+            _verdict(f, a, u, self.avoid_dominates),
+            conflict,
+            conflict and importance == "high" and self.seed.rule_divination_on_strong_conflict,
+            t.weight[k],
+        )
+
+    def score_days(
+        self,
+        days: Iterable[dt.date],
+        person_element: Union[int, str],
+        importance: str = "medium",
+        *,
+        backend: Optional[str] = None,
+    ) -> "DayMasks":
+        """Máscaras de todas las acciones para muchos días de una vez (numpy si está, si no `array`)."""
+        t = self._table(importance)
+        pe = element_index(person_element)
+        ordinals = [d.toordinal() for d in days]
+        if backend is None:
+            backend = "numpy" if np is not None and len(self.actions) <= 64 else "array"
+        if backend == "numpy":
+            if np is None:
+                raise RuntimeError("backend='numpy' requiere NumPy")
+            o = np.asarray(ordinals, dtype=np.int64)
+            idx = (o + (_JDN_OFFSET + 49)) % 60
+            keys = ((pe * _N_ELEM + (idx % 10) // 2) * _N_ANIMAL + idx % 12) * _N_WEEKDAY + (o + 6) % 7
+            cols = [np.asarray(c, dtype=np.uint64)[keys] for c in (t.favorable, t.avoid, t.unfavorable)]
+            weight = np.asarray(t.weight, dtype=np.int8)[keys]
+            return DayMasks(self, ordinals, *cols, weight, backend="numpy")
+        if backend != "array":
+            raise ValueError(f"backend desconocido: {backend!r}")
+        typecode = "Q" if len(self.actions) <= 64 else None
+        fav: Sequence[int] = array(typecode) if typecode else []
+        avoid: Sequence[int] = array(typecode) if typecode else []
+        unfav: Sequence[int] = array(typecode) if typecode else []
+        weight = array("b")
+        for o in ordinals:
+            idx = (o + _JDN_OFFSET + 49) % 60
+            k = ((pe * _N_ELEM + (idx % 10) // 2) * _N_ANIMAL + idx % 12) * _N_WEEKDAY + (o + 6) % 7
+            fav.append(t.favorable[k])  # type: ignore[attr-defined]
+            avoid.append(t.avoid[k])  # type: ignore[attr-defined]
+            unfav.append(t.unfavorable[k])  # type: ignore[attr-defined]
+            weight.append(t.weight[k])
+        return DayMasks(self, ordinals, fav, avoid, unfav, weight, backend="array")
+
+
+@dataclass
+class DayMasks:
+    """Resultado columnar de RuleEngine.score_days: una máscara (bits = acciones) por día."""
+
+    engine: RuleEngine
+    ordinals: Sequence[int]
+    favorable: Sequence[int]
+    avoid: Sequence[int]
+    unfavorable: Sequence[int]
+    relation_weight: Sequence[int]
+    backend: str = "array"
+
+    def __len__(self) -> int:
+        return len(self.ordinals)
+
+    def date(self, i: int) -> dt.date:
+        return dt.date.fromordinal(int(self.ordinals[i]))
+
+    def verdict_codes(self, action_id: str) -> Sequence[int]:
+        """Código de veredicto (VERDICT_CODES) de una acción para cada día."""
+        b = self.engine.action_bit(action_id)
+        dom = self.engine.avoid_dominates
+        if self.backend == "numpy":
+            shift, one = np.uint64(b), np.uint64(1)
+            f, a, u = (((c >> shift) & one).astype(bool) for c in (self.favorable, self.avoid, self.unfavorable))
+            hard = a if dom else a & ~f
+            return np.where(hard, -2, np.where(a | (f & u), 0, np.where(f, 1, np.where(u, -1, 0)))).astype(np.int8)
+        return array("b", (
+            VERDICT_CODES[_verdict(bool(f >> b & 1), bool(a >> b & 1), bool(u >> b & 1), dom)]
+            for f, a, u in zip(self.favorable, self.avoid, self.unfavorable)
+        ))
+
+    def verdicts(self, action_id: str) -> List[str]:
+        names = {v: k for k, v in VERDICT_CODES.items()}
+        return [names[int(c)] for c in self.verdict_codes(action_id)]
+
+    def matrix(self) -> Dict[str, Sequence[int]]:
+        """Todas las acciones x todos los días: action_id -> códigos por día."""
+        return {a: self.verdict_codes(a) for a in self.engine.actions}
+
+
+_ENGINES: Dict[Path, RuleEngine] = {}
+
+
+def load_rule_engine(seed_dir: Optional[Path] = None) -> RuleEngine:
+    """Engine compilado para `seed_dir` (por defecto el seed del repo); se compila una vez por proceso.
+
+    El seed se lee del snapshot (.cache/tsurphu/seed/), que se regenera solo si cambió el YAML.
+    """
+    key = Path(seed_dir).resolve() if seed_dir is not None else SEED_DIR
+    engine = _ENGINES.get(key)
+    if engine is None:
+        engine = _ENGINES[key] = RuleEngine(load_seed_snapshot(key).rule_seed)
+    return engine
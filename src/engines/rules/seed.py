@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+try:  # PyYAML es opcional (extra "rules"): solo hace falta para leer el seed
+    import yaml
+except ImportError:  # pragma: no cover - depende del entorno
+    yaml = None
+
+# Paquete semilla versionado en el repo (Seed/tsurphu_seed_v1)
+SEED_DIR = Path(__file__).resolve().parents[3] / "Seed" / "tsurphu_seed_v1"
+
+ACTIONS_YAML = Path("7x-2_ontology") / "actions.yaml"
+ELEMENTS_YAML = Path("7x-2_ontology") / "elements.yaml"
+DAY_PROFILES_YAML = Path("7x-3_rules") / "day_profiles_key.yaml"
+PRECEDENCE_YAML = Path("7x-3_rules") / "precedence.yaml"
+SOURCES_YAML = Path("7x-1_sources") / "sources.yaml"
+SEED_FILES: Tuple[Path, ...] = (ACTIONS_YAML, ELEMENTS_YAML, DAY_PROFILES_YAML, PRECEDENCE_YAML)
+
+
+class SeedError(ValueError):
+    """El seed no se puede compilar (archivo ausente, esquema inválido, action_id desconocido...)."""
+
+
+def read_yaml(path: Path) -> Dict[str, Any]:
+    if yaml is None:
+        raise ImportError("Leer el seed YAML requiere PyYAML: pip install 'tsurphu-lab[rules]'")
+    try:
+        with path.open("r", encoding="utf-8") as f:
+            data = yaml.safe_load(f)
+    except FileNotFoundError:
+        raise SeedError(f"falta {path}") from None
+    except yaml.YAMLError as e:
+        raise SeedError(f"{path}: YAML inválido ({e})") from None
+    if not isinstance(data, dict):
+        raise SeedError(f"{path}: se esperaba un mapeo en la raíz")
+    return data
+
+
+@dataclass
+class RuleSeed:
+    """Contenido crudo (ya parseado) de los YAML que usa el motor de reglas."""
+
+    actions: List[str]
+    elements: List[str]
+    relation_weights: Dict[str, int]
+    weekday_profiles: Dict[str, Dict[str, List[str]]]
+    animal_day_avoid: Dict[str, List[str]]
+    depth_by_importance: Dict[str, List[str]]
+    rule_avoid_dominates: bool = True
+    rule_divination_on_strong_conflict: bool = False
+    documents: Dict[str, Dict[str, Any]] = field(default_factory=dict)  # archivo relativo -> YAML crudo
+
+
+def load_seed(seed_dir: Optional[Path] = None) -> RuleSeed:
+    seed_dir = Path(seed_dir) if seed_dir is not None else SEED_DIR
+    return seed_from_documents({rel.as_posix(): read_yaml(seed_dir / rel) for rel in SEED_FILES})
+
+
+def seed_from_documents(docs: Dict[str, Dict[str, Any]]) -> RuleSeed:
+    """RuleSeed a partir de los YAML ya parseados (clave: ruta relativa al seed, con '/')."""
+    try:
+        actions_doc = docs[ACTIONS_YAML.as_posix()]
+        elements_doc = docs[ELEMENTS_YAML.as_posix()]
+        days_doc = docs[DAY_PROFILES_YAML.as_posix()]
+        policy = docs[PRECEDENCE_YAML.as_posix()].get("precedence_policy") or {}
+    except KeyError as e:
+        raise SeedError(f"falta {e.args[0]}") from None
+
+    try:
+        actions = [a["action_id"] for a in actions_doc["action_taxonomy"]]
+        relation_weights = {k: int(v["weight"]) for k, v in elements_doc["relation_types"].items()}
+        elements = [str(e) for e in elements_doc["elements"]]
+    except (KeyError, TypeError, ValueError) as e:
+        raise SeedError(f"ontología inválida: {e!r}") from None
+
+    weekday_profiles = {
+        str(day).lower(): {
+            "favorable": list(prof.get("favorable_actions") or []),
+            "avoid": list(prof.get("avoid_actions") or []),
+        }
+        for day, prof in (days_doc.get("weekday_profiles") or {}).items()
+    }
+    animal_day_avoid = {
+        str(animal).lower(): list((rule or {}).get("avoid") or [])
+        for animal, rule in (days_doc.get("animal_day_avoid_rules") or {}).items()
+    }
+    resolution = policy.get("conflict_resolution") or {}
+    return RuleSeed(
+        actions=actions,
+        elements=elements,
+        relation_weights=relation_weights,
+        weekday_profiles=weekday_profiles,
+        animal_day_avoid=animal_day_avoid,
+        depth_by_importance={k: list(v) for k, v in (policy.get("default_depth_by_importance") or {}).items()},
+        rule_avoid_dominates=bool(resolution.get("rule_avoid_dominates", True)),
+        rule_divination_on_strong_conflict=bool(resolution.get("rule_divination_on_strong_conflict", False)),
+        documents=docs,
+    )
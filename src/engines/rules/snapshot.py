@@ -0,0 +1,290 @@
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import marshal
+import os
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .seed import (
+    ACTIONS_YAML,
+    DAY_PROFILES_YAML,
+    SEED_DIR,
+    SEED_FILES,
+    SOURCES_YAML,
+    RuleSeed,
+    SeedError,
+    read_yaml,
+    seed_from_documents,
+)
+
+# Snapshot compilado del seed (los YAML que usa el motor, SEED_FILES):
+# - `compile_seed` los parsea y escribe un archivo marshal versionado con el hash del
+#   contenido fuente; con check=True (`tsurphu seed compile`, CI) antes aplica los chequeos
+#   de 7x-7_quality/quality_checks.md sobre TODOS los YAML de Seed/<versión>/;
+# - `load_seed_snapshot` lo lee en milisegundos (sin PyYAML) y recompila, sin chequeos,
+#   solo si esos archivos cambiaron (mtime/tamaño distintos y además hash distinto).
+#   Editar otro archivo del seed (fuentes, plantillas, otros YAML) no invalida el snapshot:
+#   esos solo los revisa `seed compile`.
+# Los action_id y elementos van internados: marshal los guarda una vez y el resto son refs.
+
+SNAPSHOT_MAGIC = b"TSURPHU-SEED\n"
+SNAPSHOT_VERSION = 1
+CACHE_DIR = SEED_DIR.parents[1] / ".cache" / "tsurphu" / "seed"
+
+Stamps = List[Tuple[str, int, int]]  # (ruta relativa, tamaño, mtime_ns)
+
+
+class SeedQualityError(SeedError):
+    """El seed no pasa los chequeos de calidad; `problems` lista cada hallazgo."""
+
+    def __init__(self, problems: List[str]) -> None:
+        super().__init__(f"{len(problems)} problema(s) de calidad en el seed:\n- " + "\n- ".join(problems))
+        self.problems = problems
+
+
+@dataclass
+class SeedSnapshot:
+    source_hash: str
+    actions: Tuple[str, ...]
+    elements: Tuple[str, ...]
+    rule_seed: RuleSeed
+    documents: Dict[str, Dict[str, Any]]
+    path: Path
+    compiled: bool = False  # True si esta carga tuvo que recompilar
+    warnings: Tuple[str, ...] = ()  # quality_warnings de la compilación (vacío al leer del snapshot)
+
+
+def seed_files(seed_dir: Path) -> List[Path]:
+    """Todos los YAML del seed (los que revisa check_quality)."""
+    return sorted(p for p in seed_dir.rglob("*.yaml") if p.is_file())
+
+
+def source_stamps(seed_dir: Path) -> Stamps:
+    """(ruta, tamaño, mtime_ns) de los archivos que usa el motor."""
+    out = []
+    for rel in SEED_FILES:
+        try:
+            st = (seed_dir / rel).stat()
+        except FileNotFoundError:
+            raise SeedError(f"falta {seed_dir / rel}") from None
+        out.append((rel.as_posix(), st.st_size, st.st_mtime_ns))
+    return out
+
+
+def source_hash(seed_dir: Path) -> str:
+    h = hashlib.sha256()
+    for rel in SEED_FILES:
+        h.update(rel.as_posix().encode("utf-8") + b"\0")
+        data = (seed_dir / rel).read_bytes()
+        h.update(len(data).to_bytes(8, "little") + data)
+    return "sha256:" + h.hexdigest()
+
+
+def default_snapshot_path(seed_dir: Path) -> Path:
+    seed_dir = Path(seed_dir).resolve()
+    if seed_dir == SEED_DIR:
+        return CACHE_DIR / f"{seed_dir.name}.snapshot"
+    tag = hashlib.sha1(str(seed_dir).encode("utf-8")).hexdigest()[:8]
+    return CACHE_DIR / f"{seed_dir.name}-{tag}.snapshot"
+
+
+# --- chequeos de calidad (7x-7_quality/quality_checks.md) ---
+
+def _walk_evidence(node: Any, where: str):
+    """(ubicación, dict) de cada entrada con source_id dentro de un documento."""
+    if isinstance(node, dict):
+        if "source_id" in node:
+            yield where, node
+        for k, v in node.items():
+            yield from _walk_evidence(v, f"{where}.{k}")
+    elif isinstance(node, list):
+        for i, v in enumerate(node):
+            yield from _walk_evidence(v, f"{where}[{i}]")
+
+
+def check_quality(docs: Dict[str, Dict[str, Any]]) -> List[str]:
+    """Hallazgos que impiden compilar el seed (ver también quality_warnings)."""
+    problems: List[str] = []
+    for rel, doc in docs.items():
+        if not isinstance(doc.get("schema_version"), int):
+            problems.append(f"{rel}: falta schema_version")
+
+    sources_doc = docs.get(SOURCES_YAML.as_posix()) or {}
+    known_sources = {s.get("source_id") for s in sources_doc.get("sources") or [] if isinstance(s, dict)}
+    if not known_sources:
+        problems.append(f"{SOURCES_YAML.as_posix()}: sin fuentes")
+
+    # 1) Toda evidencia apunta a una fuente conocida y trae locator
+    for rel, doc in docs.items():
+        if rel == SOURCES_YAML.as_posix():
+            continue
+        for where, ev in _walk_evidence(doc, rel):
+            if ev["source_id"] not in known_sources:
+                problems.append(f"{where}: source_id desconocido {ev['source_id']!r}")
+            if not (ev.get("locator") or ev.get("locator_hint")):
+                problems.append(f"{where}: evidencia sin locator (source_id {ev['source_id']!r})")
+
+    # 2) Todo action_id usado por las reglas existe en actions.yaml
+    actions_doc = docs.get(ACTIONS_YAML.as_posix()) or {}
+    known_actions = {a.get("action_id") for a in actions_doc.get("action_taxonomy") or [] if isinstance(a, dict)}
+    days = docs.get(DAY_PROFILES_YAML.as_posix()) or {}
+    refs = []
+    for day, prof in (days.get("weekday_profiles") or {}).items():
+        for kind in ("favorable_actions", "avoid_actions"):
+            refs += [(f"weekday_profiles.{day}.{kind}", a) for a in (prof or {}).get(kind) or []]
+    for animal, rule in (days.get("animal_day_avoid_rules") or {}).items():
+        refs += [(f"animal_day_avoid_rules.{animal}.avoid", a) for a in (rule or {}).get("avoid") or []]
+    for where, action in refs:
+        if action not in known_actions:
+            problems.append(f"{DAY_PROFILES_YAML.as_posix()}: {where}: action_id desconocido {action!r}")
+    return problems
+
+
+def quality_warnings(docs: Dict[str, Dict[str, Any]]) -> List[str]:
+    """Hallazgos que se informan pero no bloquean (p. ej. reglas heredadas sin evidence).
+
+    Agregar la cita corresponde a un ChangeSet del seed revisado (7x-7, punto 4), no al compilador.
+    """
+    return [
+        f"{rel}: regla sin evidence (source_id + locator)"
+        for rel, doc in docs.items()
+        if rel.startswith("7x-3_rules/") and not doc.get("evidence")
+    ]
+
+
+# --- compilar / cargar ---
+
+def _intern(obj: Any) -> Any:
+    if isinstance(obj, str):
+        return sys.intern(obj)
+    if isinstance(obj, dict):
+        return {_intern(k): _intern(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_intern(v) for v in obj]
+    return obj
+
+
+def _compile_payload(seed_dir: Path, *, check: bool) -> Tuple[Dict[str, Any], Tuple[str, ...]]:
+    """(payload del snapshot, quality_warnings) sin escribir nada."""
+    stamps = source_stamps(seed_dir)
+    digest = source_hash(seed_dir)
+    docs = {rel: _intern(read_yaml(seed_dir / rel)) for rel, _, _ in stamps}
+
+    warnings: Tuple[str, ...] = ()
+    if check:
+        all_docs = dict(docs)
+        for p in seed_files(seed_dir):
+            all_docs.setdefault(p.relative_to(seed_dir).as_posix(), read_yaml(p))
+        problems = check_quality(all_docs)
+        if problems:
+            raise SeedQualityError(problems)
+        warnings = tuple(quality_warnings(all_docs))
+    rule_seed = seed_from_documents(docs)
+    fields = {f.name: getattr(rule_seed, f.name) for f in dataclasses.fields(rule_seed) if f.name != "documents"}
+
+    payload = {
+        "version": SNAPSHOT_VERSION,
+        "source_hash": digest,
+        "stamps": stamps,
+        "actions": tuple(rule_seed.actions),
+        "elements": tuple(rule_seed.elements),
+        "rule_seed": fields,
+        "documents": docs,
+    }
+    return payload, warnings
+
+
+def _dumps(payload: Dict[str, Any]) -> bytes:
+    try:
+        return marshal.dumps(payload)
+    except ValueError as e:
+        raise SeedError(f"el seed tiene valores no serializables ({e})") from None
+
+
+def compile_seed(
+    seed_dir: Optional[Path] = None,
+    snapshot_path: Optional[Path] = None,
+    *,
+    check: bool = True,
+) -> SeedSnapshot:
+    """Parsea el seed y escribe el snapshot (rename atómico).
+
+    Con check=True lee además el resto de los YAML y aplica check_quality (SeedQualityError);
+    el snapshot guarda solo SEED_FILES.
+    """
+    seed_dir = Path(seed_dir).resolve() if seed_dir is not None else SEED_DIR
+    path = Path(snapshot_path) if snapshot_path is not None else default_snapshot_path(seed_dir)
+    payload, warnings = _compile_payload(seed_dir, check=check)
+    _write_snapshot(path, _dumps(payload))
+    return dataclasses.replace(_snapshot_from_payload(payload, path, compiled=True), warnings=warnings)
+
+
+def _write_snapshot(path: Path, blob: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(SNAPSHOT_MAGIC + blob)
+    os.replace(tmp, path)
+
+
+def _snapshot_from_payload(payload: Dict[str, Any], path: Path, *, compiled: bool) -> SeedSnapshot:
+    docs = payload["documents"]
+    return SeedSnapshot(
+        source_hash=payload["source_hash"],
+        actions=payload["actions"],
+        elements=payload["elements"],
+        rule_seed=RuleSeed(**payload["rule_seed"], documents=docs),
+        documents=docs,
+        path=path,
+        compiled=compiled,
+    )
+
+
+def read_snapshot(path: Path) -> Optional[Dict[str, Any]]:
+    try:
+        blob = Path(path).read_bytes()
+    except OSError:  # ausente o ilegible: se recompila
+        return None
+    if not blob.startswith(SNAPSHOT_MAGIC):
+        return None
+    try:
+        payload = marshal.loads(blob[len(SNAPSHOT_MAGIC):])
+    except (EOFError, ValueError, TypeError):
+        return None
+    if not isinstance(payload, dict) or payload.get("version") != SNAPSHOT_VERSION:
+        return None
+    return payload
+
+
+def load_seed_snapshot(seed_dir: Optional[Path] = None, snapshot_path: Optional[Path] = None) -> SeedSnapshot:
+    """Snapshot vigente del seed; recompila (requiere PyYAML) si falta o si SEED_FILES cambió.
+
+    Si el snapshot no se puede escribir (caché de solo lectura) devuelve el compilado en memoria.
+
+    Es la ruta de runtime: no aplica check_quality, eso queda para `seed compile`/CI.
+    """
+    seed_dir = Path(seed_dir).resolve() if seed_dir is not None else SEED_DIR
+    path = Path(snapshot_path) if snapshot_path is not None else default_snapshot_path(seed_dir)
+    payload = read_snapshot(path)
+    if payload is not None:
+        stamps = source_stamps(seed_dir)
+        if [tuple(s) for s in payload["stamps"]] == stamps:
+            return _snapshot_from_payload(payload, path, compiled=False)
+        if payload["source_hash"] == source_hash(seed_dir):
+            # Mismo contenido con otro mtime (checkout, touch): se guardan los stamps nuevos
+            # para no volver a hashear en cada carga
+            payload["stamps"] = stamps
+            try:
+                _write_snapshot(path, marshal.dumps(payload))
+            except OSError:
+                pass  # caché de solo lectura: el snapshot sigue siendo válido
+            return _snapshot_from_payload(payload, path, compiled=False)
+    payload, _ = _compile_payload(seed_dir, check=False)
+    try:
+        _write_snapshot(path, _dumps(payload))
+    except OSError:
+        pass  # checkout de solo lectura: se usa lo compilado en memoria y se recompila la próxima vez
+    return _snapshot_from_payload(payload, path, compiled=True)
@@ -1,15 +1,28 @@
 ﻿from __future__ import annotations
+import datetime as dt
 from dataclasses import dataclass
 from pathlib import Path
-import csv
-from typing import Optional, Tuple
+from array import array
+from typing import Iterable, Iterator, NamedTuple, Optional, Sequence, Tuple
+
+try:  # NumPy es opcional: el modo batch cae a `array` si no está instalado
+    import numpy as np
+except ImportError:  # pragma: no cover - depende del entorno
+    np = None
 
 from .year_mewa_parkha import mewa_for_gregorian_year, parkha_for_mewa, year_polarity_from_stem_index
+from .year_lookup import load_mewa_parkha_table
+from .losar import load_losar_index
 
 # Base estándar sexagenaria: 1984 = Wood Rat
 _STEMS = ["Wood","Wood","Fire","Fire","Earth","Earth","Metal","Metal","Water","Water"]
 _ANIMALS = ["Rat","Ox","Tiger","Rabbit","Dragon","Snake","Horse","Sheep","Monkey","Bird","Dog","Pig"]
 
+# Códigos internados para el modo columnar (índice -> nombre)
+ELEMENTS: Tuple[str, ...] = ("Wood", "Fire", "Earth", "Metal", "Water")
+ANIMALS: Tuple[str, ...] = tuple(_ANIMALS)
+PARKHAS: Tuple[str, ...] = ("Kham", "Khon", "Zin", "Zon", "Gin", "Dwa", "Khen", "Li")
+
 @dataclass(frozen=True)
 class TibetanYear:
     gregorian_year: int
@@ -27,43 +40,209 @@ def sexagenary_from_gregorian(year: int) -> Tuple[str, str, int, int]:
     return _STEMS[stem_i], _ANIMALS[branch_i], stem_i, branch_i
 
 def lookup_mewa_parkha(year: int, *, lookup_csv: Path) -> Tuple[Optional[int], Optional[str]]:
-    if not lookup_csv.exists():
-        return None, None
-    with lookup_csv.open("r", encoding="utf-8-sig", newline="") as f:
-        r = csv.DictReader(f)
-        for row in r:
-            try:
-                y = int((row.get("year") or "").strip())
-            except Exception:
-                continue
-            if y == year:
-                mewa = (row.get("mewa") or "").strip() or None
-                parkha = (row.get("parkha") or "").strip() or None
-                return (int(mewa) if mewa is not None else None), parkha
-    return None, None
-
-def tibetan_year(year: int, *, lookups_dir: Path | None = None) -> TibetanYear:
+    # Índice cacheado (O(1) por consulta); se recarga si el CSV cambia
+    return load_mewa_parkha_table(lookup_csv).get(year)
+
+class _CycleRecord(NamedTuple):
+    # Mismo orden que TibetanYear sin gregorian_year (se completa al materializar)
+    element: str
+    animal: str
+    stem_index: int
+    branch_index: int
+    mewa: int
+    parkha: str
+
+
+def _derive_cycle_record(year: int) -> _CycleRecord:
+    # Cadena de referencia: sexagenario + mewa + parkha por polaridad
     element, animal, stem_i, branch_i = sexagenary_from_gregorian(year)
+    mewa = mewa_for_gregorian_year(year)
+    parkha = parkha_for_mewa(mewa, polarity=year_polarity_from_stem_index(stem_i)).code
+    return _CycleRecord(element, animal, stem_i, branch_i, mewa, parkha)
+
+
+# stem/branch repiten cada 60 años y mewa cada 9 -> todo es función de (year - 1984) mod 180
+CYCLE_LENGTH = 180
+_CYCLE: Tuple[_CycleRecord, ...] = tuple(_derive_cycle_record(1984 + r) for r in range(CYCLE_LENGTH))
 
-    # Preferir lookup (si existe y está poblado)
-    mewa = parkha = None
+
+def tibetan_year(year: int | dt.date, *, lookups_dir: Path | None = None) -> TibetanYear:
+    # Con una fecha, el año es el tibetano vigente ese día (cambia en Losar, no el 1 de enero)
+    if isinstance(year, dt.date):
+        year = load_losar_index(lookups_dir).year_of(year)
+    rec = _CYCLE[(year - 1984) % CYCLE_LENGTH]
+
+    # Preferir lookup (si existe y está poblado); si no, el algoritmo base precalculado
     if lookups_dir is not None:
-        csv_path = lookups_dir / "year_mewa_parkha.csv"
-        mewa, parkha = lookup_mewa_parkha(year, lookup_csv=csv_path)
-
-    # Si no hay lookup, usamos algoritmo base (para tests/pipeline)
-    if mewa is None:
-        mewa = mewa_for_gregorian_year(year)
-    if parkha is None:
-        pol = year_polarity_from_stem_index(stem_i)
-        parkha = parkha_for_mewa(mewa, polarity=pol).code
-
-    return TibetanYear(
-        gregorian_year=year,
-        element=element,
-        animal=animal,
-        stem_index=stem_i,
-        branch_index=branch_i,
+        mewa, parkha = lookup_mewa_parkha(year, lookup_csv=lookups_dir / "year_mewa_parkha.csv")
+        if mewa is not None or parkha is not None:
+            if parkha is None:
+                pol = year_polarity_from_stem_index(rec.stem_index)
+                parkha = parkha_for_mewa(mewa, polarity=pol).code
+            rec = rec._replace(mewa=rec.mewa if mewa is None else mewa, parkha=parkha)
+
+    return TibetanYear(year, *rec)
+
+
+# -----------------
+# Modo batch (columnar)
+# -----------------
+
+# parkha por (mewa, polaridad del stem): fila = mewa (0 sin uso), col 0 yang / 1 yin
+_PARKHA_CODE_TABLE: Tuple[Tuple[int, int], ...] = ((0, 0),) + tuple(
+    (
+        PARKHAS.index(parkha_for_mewa(m, polarity="yang").code),
+        PARKHAS.index(parkha_for_mewa(m, polarity="yin").code),
+    )
+    for m in range(1, 10)
+)
+
+
+@dataclass(frozen=True)
+class TibetanYearColumns:
+    """
+    Resultado columnar de `tibetan_years`.
+
+    Cada columna es un `numpy.ndarray` (backend "numpy") o un `array.array`
+    (backend "array"). element/animal/parkha van como códigos que indexan
+    ELEMENTS / ANIMALS / PARKHAS.
+    """
+    gregorian_year: Sequence[int]
+    stem_index: Sequence[int]
+    branch_index: Sequence[int]
+    mewa: Sequence[int]
+    element_code: Sequence[int]
+    animal_code: Sequence[int]
+    parkha_code: Sequence[int]
+    backend: str
+
+    def __len__(self) -> int:
+        return len(self.gregorian_year)
+
+    def row(self, i: int) -> TibetanYear:
+        """Materializa la fila i como TibetanYear (mismo resultado que el modo escalar)."""
+        return TibetanYear(
+            gregorian_year=int(self.gregorian_year[i]),
+            element=ELEMENTS[int(self.element_code[i])],
+            animal=ANIMALS[int(self.animal_code[i])],
+            stem_index=int(self.stem_index[i]),
+            branch_index=int(self.branch_index[i]),
+            mewa=int(self.mewa[i]),
+            parkha=PARKHAS[int(self.parkha_code[i])],
+        )
+
+    def __iter__(self) -> Iterator[TibetanYear]:
+        for i in range(len(self)):
+            yield self.row(i)
+
+
+def _tibetan_years_numpy(years: Sequence[int] | range) -> TibetanYearColumns:
+    if isinstance(years, range):
+        ys = np.arange(years.start, years.stop, years.step, dtype=np.int64)
+    else:
+        ys = np.asarray(years, dtype=np.int64)
+    delta = ys - 1984
+    stem = (delta % 10).astype(np.int8)
+    branch = (delta % 12).astype(np.int8)
+    m = (1 - delta) % 9
+    mewa = np.where(m == 0, 9, m).astype(np.int8)
+    table = np.asarray(_PARKHA_CODE_TABLE, dtype=np.int8)
+    return TibetanYearColumns(
+        gregorian_year=ys,
+        stem_index=stem,
+        branch_index=branch,
+        mewa=mewa,
+        element_code=stem // 2,
+        animal_code=branch,
+        parkha_code=table[mewa, stem % 2],
+        backend="numpy",
+    )
+
+
+# (stem, branch, mewa, element_code, parkha_code) por residuo del ciclo de 180
+_CYCLE_CODES: Tuple[Tuple[int, int, int, int, int], ...] = tuple(
+    (r.stem_index, r.branch_index, r.mewa, r.stem_index >> 1, PARKHAS.index(r.parkha)) for r in _CYCLE
+)
+
+
+def _tibetan_years_array(years: Sequence[int] | range) -> TibetanYearColumns:
+    ys = array("q", years)
+    stem = array("b", bytes(len(ys)))
+    branch = array("b", bytes(len(ys)))
+    mewa = array("b", bytes(len(ys)))
+    element = array("b", bytes(len(ys)))
+    parkha = array("b", bytes(len(ys)))
+    codes = _CYCLE_CODES
+    for i, y in enumerate(ys):
+        stem[i], branch[i], mewa[i], element[i], parkha[i] = codes[(y - 1984) % CYCLE_LENGTH]
+    return TibetanYearColumns(
+        gregorian_year=ys,
+        stem_index=stem,
+        branch_index=branch,
         mewa=mewa,
-        parkha=parkha,
+        element_code=element,
+        animal_code=branch,
+        parkha_code=parkha,
+        backend="array",
     )
+
+
+def _apply_lookup_overrides(cols: TibetanYearColumns, lookups_dir: Path) -> None:
+    # Misma precedencia que el modo escalar: lookup primero, algoritmo base como respaldo
+    index = load_mewa_parkha_table(lookups_dir / "year_mewa_parkha.csv").index
+    if not index:
+        return
+    ys = cols.gregorian_year
+    if cols.backend == "numpy":
+        hits = np.nonzero(np.isin(ys, np.fromiter(index, dtype=np.int64, count=len(index))))[0]
+    else:
+        hits = [i for i, y in enumerate(ys) if y in index]
+    for i in hits:
+        mewa, parkha = index[int(ys[i])]
+        if mewa is not None:
+            cols.mewa[i] = mewa
+        if parkha is not None:
+            cols.parkha_code[i] = PARKHAS.index(parkha)
+        elif mewa is not None:
+            cols.parkha_code[i] = _PARKHA_CODE_TABLE[mewa][int(cols.stem_index[i]) & 1]
+
+
+def tibetan_years(
+    years: Sequence[int] | range,
+    *,
+    lookups_dir: Path | None = None,
+    backend: str | None = None,
+) -> TibetanYearColumns:
+    """
+    Versión batch de `tibetan_year`: calcula todos los años de una vez
+    y devuelve columnas en vez de un TibetanYear por año.
+
+    backend: "numpy" | "array" | None (NumPy si está instalado, si no `array`).
+    """
+    if backend is None:
+        backend = "numpy" if np is not None else "array"
+    if backend == "numpy":
+        if np is None:
+            raise RuntimeError("backend 'numpy' pedido pero NumPy no está instalado")
+        cols = _tibetan_years_numpy(years)
+    elif backend == "array":
+        cols = _tibetan_years_array(years)
+    else:
+        raise ValueError(f"backend inválido: {backend}")
+    if lookups_dir is not None:
+        _apply_lookup_overrides(cols, lookups_dir)
+    return cols
+
+
+def tibetan_years_for_dates(
+    dates: Iterable[dt.date | str],
+    *,
+    lookups_dir: Path | None = None,
+    backend: str | None = None,
+) -> TibetanYearColumns:
+    """
+    Versión batch de `tibetan_year(fecha)`: resuelve el año de cada fecha (date o texto
+    ISO) contra el índice de Losar y calcula las columnas de todos de una vez.
+    """
+    years = load_losar_index(lookups_dir).years_of(dates, backend=backend)
+    return tibetan_years(years, lookups_dir=lookups_dir, backend=backend)
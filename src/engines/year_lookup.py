@@ -0,0 +1,107 @@
+from __future__ import annotations
+import csv
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .year_mewa_parkha import _NUM_TO_PARKHA
+
+# Lookup indexado de lookups/year_mewa_parkha.csv.
+# Se parsea una sola vez por (ruta, mtime, tamaño); si el archivo cambia, se recarga solo.
+
+_VALID_PARKHAS = frozenset(_NUM_TO_PARKHA.values())
+
+MewaParkha = Tuple[Optional[int], Optional[str]]
+
+
+@dataclass(frozen=True)
+class LookupParseError:
+    line: int
+    message: str
+
+    def __str__(self) -> str:
+        return f"L{self.line}: {self.message}"
+
+
+@dataclass
+class MewaParkhaTable:
+    path: Path
+    stamp: Optional[Tuple[int, int]] = None  # (mtime_ns, size); None si el archivo no existe
+    index: Dict[int, MewaParkha] = field(default_factory=dict)
+    errors: List[LookupParseError] = field(default_factory=list)
+
+    def get(self, year: int) -> MewaParkha:
+        return self.index.get(year, (None, None))
+
+    def __contains__(self, year: int) -> bool:
+        return year in self.index
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    @classmethod
+    def parse(cls, path: Path, stamp: Optional[Tuple[int, int]] = None) -> "MewaParkhaTable":
+        table = cls(path=path, stamp=stamp)
+        if stamp is None:
+            return table
+        with path.open("r", encoding="utf-8-sig", newline="") as f:
+            r = csv.DictReader(f)
+            if "year" not in (r.fieldnames or []):
+                table.errors.append(LookupParseError(1, "falta la columna 'year'"))
+                return table
+            for row in r:
+                table._add_row(r.line_num, row)
+        return table
+
+    def _add_row(self, line: int, row: Dict[str, Optional[str]]) -> None:
+        raw_year = (row.get("year") or "").strip()
+        try:
+            year = int(raw_year)
+        except ValueError:
+            self.errors.append(LookupParseError(line, f"year inválido: {raw_year!r}"))
+            return
+        if year in self.index:
+            # Igual que el scan lineal original: gana la primera fila
+            self.errors.append(LookupParseError(line, f"year duplicado: {year}"))
+            return
+
+        mewa: Optional[int] = None
+        raw_mewa = (row.get("mewa") or "").strip()
+        if raw_mewa:
+            try:
+                mewa = int(raw_mewa)
+            except ValueError:
+                mewa = None
+            if mewa is None or not 1 <= mewa <= 9:
+                self.errors.append(LookupParseError(line, f"mewa inválido para {year}: {raw_mewa!r}"))
+                mewa = None
+
+        parkha = (row.get("parkha") or "").strip() or None
+        if parkha is not None and parkha not in _VALID_PARKHAS:
+            self.errors.append(LookupParseError(line, f"parkha desconocido para {year}: {parkha!r}"))
+            parkha = None
+
+        self.index[year] = (mewa, parkha)
+
+
+_TABLES: Dict[Path, MewaParkhaTable] = {}
+
+
+def _stamp(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def load_mewa_parkha_table(path: Path) -> MewaParkhaTable:
+    """Devuelve la tabla cacheada para `path`, reparseando solo si cambió (mtime/tamaño)."""
+    path = Path(path)
+    stamp = _stamp(path)
+    table = _TABLES.get(path)
+    if table is None or table.stamp != stamp:
+        table = MewaParkhaTable.parse(path, stamp)
+        _TABLES[path] = table
+    return table
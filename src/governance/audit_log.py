@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import datetime as dt
+import json
+import os
+import re
+from pathlib import Path
+from typing import Callable, Iterable, List, Optional
+
+# Escritor del audit log (JSONL, una entrada por línea).
+# - Mantiene el archivo abierto y agrupa escrituras: flush cada `flush_every` entradas.
+# - fsync: "never" | "close" (al cerrar) | "flush" (en cada flush).
+# - Rotación por tamaño (`max_bytes`) y/o por fecha UTC (`rotate_daily`): el archivo
+#   activo se renombra a un segmento numerado (audit-log.000001.jsonl) y se anota en
+#   audit-log.index.jsonl. El archivo activo conserva siempre su nombre.
+# Cada línea es byte a byte la de siempre: json.dumps(entry, ensure_ascii=False) + fin de
+# línea de la plataforma (os.linesep), el mismo que escribía el modo texto ("\r\n" en Windows).
+
+FSYNC_POLICIES = ("never", "close", "flush")
+
+
+def encode_entry(entry: dict) -> bytes:
+    return (json.dumps(entry, ensure_ascii=False) + os.linesep).encode("utf-8")
+
+
+def _utcnow() -> dt.datetime:
+    return dt.datetime.now(dt.timezone.utc)
+
+
+def _timestamp(line: bytes) -> Optional[str]:
+    try:
+        return json.loads(line).get("timestamp_utc")
+    except (ValueError, AttributeError):
+        return None
+
+
+class AuditWriter:
+    def __init__(
+        self,
+        path: Path | str,
+        *,
+        flush_every: int = 1,
+        fsync: str = "close",
+        max_bytes: Optional[int] = None,
+        rotate_daily: bool = False,
+        clock: Callable[[], dt.datetime] = _utcnow,
+    ) -> None:
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"fsync debe ser uno de {FSYNC_POLICIES}, no {fsync!r}")
+        if flush_every < 1:
+            raise ValueError("flush_every debe ser >= 1")
+        self.path = Path(path)
+        self.flush_every = flush_every
+        self.fsync = fsync
+        self.max_bytes = max_bytes
+        self.rotate_daily = rotate_daily
+        self.clock = clock
+        self.index_path = self.path.with_name(self.path.stem + ".index.jsonl")
+        self._segment_re = re.compile(re.escape(self.path.stem) + r"\.(\d{6})" + re.escape(self.path.suffix) + "$")
+        self._f = None
+        self._size = 0
+        self._pending = 0
+        self._day: Optional[dt.date] = None
+        self.entries_written = 0
+        self.segments_rotated = 0
+
+    # --- ciclo de vida ---
+
+    def open(self) -> "AuditWriter":
+        if self._f is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._f = open(self.path, "ab", buffering=1 << 16)
+            self._size = self._f.tell()
+            if self._size:
+                self._day = dt.datetime.fromtimestamp(self.path.stat().st_mtime, dt.timezone.utc).date()
+        return self
+
+    def close(self) -> None:
+        if self._f is None:
+            return
+        self._f.flush()
+        if self.fsync != "never":
+            os.fsync(self._f.fileno())
+        self._f.close()
+        self._f = None
+        self._pending = 0
+
+    def __enter__(self) -> "AuditWriter":
+        return self.open()
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    # --- escritura ---
+
+    def write(self, entry: dict) -> None:
+        self.write_bytes(encode_entry(entry))
+
+    def write_many(self, entries: Iterable[dict]) -> int:
+        n = 0
+        for e in entries:
+            self.write(e)
+            n += 1
+        return n
+
+    def write_bytes(self, line: bytes) -> None:
+        self.open()
+        self._maybe_rotate(len(line))
+        self._f.write(line)  # type: ignore[union-attr]
+        self._size += len(line)
+        self._pending += 1
+        self.entries_written += 1
+        if self._pending >= self.flush_every:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._f is None:
+            return
+        self._f.flush()
+        if self.fsync == "flush":
+            os.fsync(self._f.fileno())
+        self._pending = 0
+
+    # --- rotación ---
+
+    def _maybe_rotate(self, incoming: int) -> None:
+        today = self.clock().date()
+        if self._size == 0:
+            self._day = today
+            return
+        if (self.max_bytes is not None and self._size + incoming > self.max_bytes) or (
+            self.rotate_daily and self._day is not None and today != self._day
+        ):
+            self.rotate()
+            self._day = today
+
+    def segments(self) -> List[Path]:
+        """Segmentos rotados, en orden."""
+        return sorted(p for p in self.path.parent.iterdir() if self._segment_re.match(p.name))
+
+    def rotate(self) -> Optional[Path]:
+        """Cierra el archivo activo, lo pasa a un segmento nuevo y lo registra en el índice."""
+        self.close()
+        if not self.path.exists() or self.path.stat().st_size == 0:
+            return None
+        existing = [int(self._segment_re.match(p.name).group(1)) for p in self.segments()]  # type: ignore[union-attr]
+        seg = self.path.with_name(f"{self.path.stem}.{max(existing, default=0) + 1:06d}{self.path.suffix}")
+        os.replace(self.path, seg)
+
+        lines = seg.read_bytes().splitlines()
+        record = {
+            "segment": seg.name,
+            "entries": len(lines),
+            "bytes": seg.stat().st_size,
+            "first_timestamp_utc": _timestamp(lines[0]),
+            "last_timestamp_utc": _timestamp(lines[-1]),
+            "rotated_utc": self.clock().replace(microsecond=0).isoformat().replace("+00:00", "Z"),
+        }
+        with self.index_path.open("ab") as f:
+            f.write(encode_entry(record))
+        self.segments_rotated += 1
+        self.open()
+        return seg
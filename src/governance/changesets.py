@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Verificación de integridad de changesets/*.json (packet_hash) con manifiesto incremental.
+# El manifiesto guarda (tamaño, mtime_ns, hash verificado) de cada paquete que pasó la
+# verificación; en la corrida siguiente solo se re-verifica lo que cambió.
+# Corridas en frío con muchos paquetes reparten el hash en un pool de procesos.
+
+MANIFEST_VERSION = 1
+POOL_MIN_FILES = 256  # por debajo, el arranque del pool cuesta más que lo que ahorra
+
+
+def canon(obj) -> bytes:
+    return json.dumps(obj, sort_keys=True, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def packet_hash(pkt: dict) -> str:
+    """Hash del paquete con integrity.packet_hash vacío (como lo firma make_changeset)."""
+    tmp = dict(pkt)
+    tmp["integrity"] = dict(tmp.get("integrity", {}))
+    tmp["integrity"]["packet_hash"] = ""
+    return "sha256:" + hashlib.sha256(canon(tmp)).hexdigest()
+
+
+def check_packet(path: str) -> Tuple[Optional[str], Optional[str]]:
+    """(hash verificado, None) si el paquete es íntegro; (None, mensaje) si no."""
+    p = Path(path)
+    try:
+        obj = json.loads(p.read_text(encoding="utf-8"))
+        recorded = obj.get("integrity", {}).get("packet_hash") or ""
+        computed = packet_hash(obj)
+        if recorded != computed:
+            return None, f"{p.name}: hash no coincide"
+        return computed, None
+    except Exception as e:
+        return None, f"{p.name}: inválido ({e})"
+
+
+@dataclass
+class ValidationReport:
+    errors: List[str] = field(default_factory=list)
+    verified: int = 0  # re-hasheados en esta corrida
+    cached: int = 0    # aceptados por el manifiesto sin leerlos
+
+
+def load_manifest(path: Path) -> Dict[str, dict]:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if data.get("version") != MANIFEST_VERSION:
+        return {}
+    return data.get("files", {})
+
+
+def save_manifest(path: Path, files: Dict[str, dict]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps({"version": MANIFEST_VERSION, "files": files}, sort_keys=True), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def validate_changesets(
+    paths: Sequence[Path],
+    *,
+    manifest_path: Optional[Path] = None,
+    full: bool = False,
+    jobs: Optional[int] = None,
+) -> ValidationReport:
+    """Verifica packet_hash de `paths`; errores en el mismo orden que `paths`.
+
+    full=True ignora el manifiesto (pero lo reescribe). jobs=1 fuerza modo serial.
+    """
+    report = ValidationReport()
+    previous = {} if (full or manifest_path is None) else load_manifest(manifest_path)
+    current: Dict[str, dict] = {}
+    todo: List[Tuple[Path, os.stat_result]] = []
+
+    for p in paths:
+        st = p.stat()
+        rec = previous.get(p.name)
+        if rec is not None and rec.get("size") == st.st_size and rec.get("mtime_ns") == st.st_mtime_ns:
+            current[p.name] = rec
+            report.cached += 1
+        else:
+            todo.append((p, st))
+
+    if jobs != 1 and len(todo) >= POOL_MIN_FILES:
+        with ProcessPoolExecutor(max_workers=jobs) as ex:
+            results = list(ex.map(check_packet, [str(p) for p, _ in todo], chunksize=64))
+    else:
+        results = [check_packet(str(p)) for p, _ in todo]
+
+    failed = {}
+    for (p, st), (digest, err) in zip(todo, results):
+        report.verified += 1
+        if err is not None:
+            failed[p.name] = err
+        else:
+            current[p.name] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "hash": digest}
+    report.errors = [failed[p.name] for p in paths if p.name in failed]
+
+    if manifest_path is not None and (current != previous or full):
+        save_manifest(manifest_path, current)
+    return report
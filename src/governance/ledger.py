@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import csv
+import hashlib
+import io
+import marshal
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Object ledger (docs/object-ledger.csv) indexado en memoria:
+# - ObjectID -> fila, e índices secundarios por Estrato_7x, Dueño y Sensibilidad.
+# - El índice se persiste (marshal) en .cache/tsurphu/ledger/, no junto al CSV: validar
+#   no crea archivos en docs/.
+# - Si el CSV solo creció (se agregaron filas al final), se parsea únicamente la cola;
+#   cualquier otro cambio reconstruye el índice completo.
+# Los errores conservan el texto que siempre imprimió `validate`.
+
+LEDGER_FIELDS = ("ObjectID", "Nombre", "Estrato_7x", "Dueño", "MetaAgent", "Sensibilidad", "Evidencia", "Ruta")
+SECONDARY = {"stratum": "Estrato_7x", "owner": "Dueño", "sensitivity": "Sensibilidad"}
+INDEX_VERSION = 1
+CACHE_DIR = Path(__file__).resolve().parents[2] / ".cache" / "tsurphu" / "ledger"
+
+Row = Tuple[str, ...]
+
+
+@dataclass
+class Ledger:
+    path: Path
+    size: int = 0
+    mtime_ns: int = 0
+    prefix_sha256: str = ""
+    next_line: int = 2  # número (estilo validate) de la próxima fila de datos
+    header_ok: bool = True
+    order: List[int] = field(default_factory=lambda: list(range(len(LEDGER_FIELDS))))  # columna CSV de cada campo (-1: falta)
+    rows: List[Row] = field(default_factory=list)
+    by_id: Dict[str, int] = field(default_factory=dict)
+    by: Dict[str, Dict[str, List[int]]] = field(default_factory=lambda: {k: {} for k in SECONDARY})
+    errors: List[str] = field(default_factory=list)
+    incremental: bool = False  # cómo se armó en esta carga (diagnóstico)
+
+    # --- consultas ---
+
+    def get(self, object_id: str) -> Optional[Dict[str, str]]:
+        i = self.by_id.get(object_id)
+        return None if i is None else dict(zip(LEDGER_FIELDS, self.rows[i]))
+
+    def __contains__(self, object_id: str) -> bool:
+        return object_id in self.by_id
+
+    def __len__(self) -> int:
+        return len(self.by_id)
+
+    def find(self, *, stratum: Optional[str] = None, owner: Optional[str] = None,
+             sensitivity: Optional[str] = None) -> List[Dict[str, str]]:
+        """Filas que cumplen todos los filtros dados (intersección de índices secundarios)."""
+        hits: Optional[set] = None
+        for key, value in (("stratum", stratum), ("owner", owner), ("sensitivity", sensitivity)):
+            if value is None:
+                continue
+            ids = set(self.by[key].get(value, ()))
+            hits = ids if hits is None else hits & ids
+        idx = range(len(self.rows)) if hits is None else sorted(hits)
+        return [dict(zip(LEDGER_FIELDS, self.rows[i])) for i in idx]
+
+    def missing(self, object_ids: Iterable[str]) -> List[str]:
+        return [oid for oid in object_ids if oid not in self.by_id]
+
+    # --- construcción ---
+
+    def _add_rows(self, records) -> None:
+        for values in records:
+            if not values:
+                continue  # línea en blanco (DictReader tampoco la cuenta)
+            line = self.next_line
+            self.next_line += 1
+            row = tuple(values[i] if 0 <= i < len(values) else "" for i in self.order)
+            oid = row[0].strip()
+            if not oid:
+                self.errors.append(f"Ledger L{line}: ObjectID vacío")
+                continue
+            if oid in self.by_id:
+                self.errors.append(f"Ledger L{line}: duplicado {oid}")
+                continue
+            i = len(self.rows)
+            self.rows.append(row)
+            self.by_id[oid] = i
+            for key, col in SECONDARY.items():
+                self.by[key].setdefault(row[LEDGER_FIELDS.index(col)], []).append(i)
+
+    @classmethod
+    def build(cls, path: Path, data: bytes) -> "Ledger":
+        led = cls(path=path)
+        reader = csv.reader(io.StringIO(data.decode("utf-8-sig"), newline=""))
+        fields = next(reader, [])
+        if set(fields) != set(LEDGER_FIELDS):
+            # Se informa y se siguen revisando las filas, como siempre hizo validate
+            led.header_ok = False
+            led.errors.append("Ledger: columnas incorrectas")
+        led.order = [fields.index(f) if f in fields else -1 for f in LEDGER_FIELDS]
+        led._add_rows(reader)
+        return led
+
+    def _to_marshal(self) -> bytes:
+        return marshal.dumps({
+            "version": INDEX_VERSION, "size": self.size, "mtime_ns": self.mtime_ns,
+            "prefix_sha256": self.prefix_sha256, "next_line": self.next_line, "header_ok": self.header_ok,
+            "order": self.order, "rows": self.rows, "by_id": self.by_id, "by": self.by, "errors": self.errors,
+        })
+
+    @classmethod
+    def _from_marshal(cls, path: Path, blob: bytes) -> Optional["Ledger"]:
+        try:
+            d = marshal.loads(blob)
+        except (EOFError, ValueError, TypeError):
+            return None
+        if not isinstance(d, dict) or d.get("version") != INDEX_VERSION:
+            return None
+        return cls(path=path, size=d["size"], mtime_ns=d["mtime_ns"], prefix_sha256=d["prefix_sha256"],
+                   next_line=d["next_line"], header_ok=d["header_ok"], order=d["order"], rows=d["rows"],
+                   by_id=d["by_id"], by=d["by"], errors=d["errors"])
+
+
+def index_path_for(path: Path, cache_dir: Optional[Path] = None) -> Path:
+    """Índice persistido de `path`: <cache_dir>/<nombre>-<hash de la ruta>.idx."""
+    path = Path(path).resolve()
+    tag = hashlib.sha1(str(path).encode("utf-8")).hexdigest()[:8]
+    return Path(cache_dir if cache_dir is not None else CACHE_DIR) / f"{path.name}-{tag}.idx"
+
+
+_LEDGERS: Dict[Path, Ledger] = {}
+
+
+def load_ledger(path: Path, *, persist: bool = True, cache_dir: Optional[Path] = None) -> Ledger:
+    """Ledger indexado para `path`: caché en memoria, luego índice en disco, luego CSV.
+
+    El índice en disco se reusa tal cual si el CSV no cambió (tamaño/mtime) y se
+    extiende con solo la cola nueva si el CSV creció sin tocar lo anterior.
+    """
+    path = Path(path)
+    st = os.stat(path)
+    cached = _LEDGERS.get(path)
+    if cached is not None and (cached.size, cached.mtime_ns) == (st.st_size, st.st_mtime_ns):
+        return cached
+
+    idx_path = index_path_for(path, cache_dir)
+    led: Optional[Ledger] = cached
+    if led is None and persist and idx_path.exists():
+        led = Ledger._from_marshal(path, idx_path.read_bytes())
+    if led is not None and (led.size, led.mtime_ns) == (st.st_size, st.st_mtime_ns):
+        _LEDGERS[path] = led
+        return led
+
+    data = path.read_bytes()
+    if (
+        led is not None
+        and led.header_ok
+        and 0 < led.size < len(data)
+        and data[led.size - 1 : led.size] == b"\n"
+        and hashlib.sha256(data[: led.size]).hexdigest() == led.prefix_sha256
+    ):
+        led._add_rows(csv.reader(io.StringIO(data[led.size :].decode("utf-8"), newline="")))
+        led.incremental = True
+    else:
+        led = Ledger.build(path, data)
+    led.size, led.mtime_ns = len(data), st.st_mtime_ns
+    led.prefix_sha256 = hashlib.sha256(data).hexdigest()
+
+    if persist:
+        try:
+            idx_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = idx_path.with_name(idx_path.name + ".tmp")
+            tmp.write_bytes(led._to_marshal())
+            os.replace(tmp, idx_path)
+        except OSError:
+            pass  # caché no escribible: el índice en memoria sirve igual
+    _LEDGERS[path] = led
+    return led
+
@@ -1,8 +1,15 @@
 ﻿import argparse
+import datetime as dt
 import json
-from typing import Any, Dict
+import os
+import socketserver
+import sys
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Sequence, TextIO, Tuple
 
-from engines.tibetan_year import tibetan_year
+from engines.tibetan_year import CYCLE_LENGTH, TibetanYear, tibetan_year
+
+# Columns for CSV output (TibetanYear field order)
+_CSV_FIELDS = ("gregorian_year", "element", "animal", "stem_index", "branch_index", "mewa", "parkha")
 
 
 def _tibetan_year_to_dict(obj: Any) -> Dict[str, Any]:
@@ -46,8 +53,232 @@ def _normalize_tibetan_year_json(data: Dict[str, Any]) -> Dict[str, Any]:
     return data
 
 
+def _tibetan_year_fast_dict(ty: TibetanYear) -> Dict[str, Any]:
+    """
+    Same result as _normalize_tibetan_year_json(_tibetan_year_to_dict(ty)),
+    built directly from the fields (no reflection, no deep copy).
+    """
+    return {
+        "gregorian_year": ty.gregorian_year,
+        "element": ty.element.lower(),
+        "animal": ty.animal,
+        "stem_index": ty.stem_index,
+        "branch_index": ty.branch_index,
+        "mewa": ty.mewa,
+        "parkha": ty.parkha.lower() if isinstance(ty.parkha, str) else ty.parkha,
+    }
+
+
+_SENTINEL_YEAR = -987654321
+
+
+def _build_row_templates(fmt: str) -> List[Tuple[str, str]]:
+    """
+    Per-residue (prefix, suffix) around the year for one output row.
+
+    Everything but the year repeats every CYCLE_LENGTH years, so each row is
+    prefix + str(year) + suffix. Templates are rendered from the real output
+    (json.dumps / CSV join) with a sentinel year, so they cannot drift from it.
+    """
+    templates = []
+    for r in range(CYCLE_LENGTH):
+        data = _tibetan_year_fast_dict(tibetan_year(1984 + r))
+        data["gregorian_year"] = _SENTINEL_YEAR
+        if fmt == "jsonl":
+            line = json.dumps(data, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+        else:
+            line = ",".join(str(data[k]) for k in _CSV_FIELDS)
+        prefix, suffix = line.split(str(_SENTINEL_YEAR))
+        templates.append((prefix, suffix + "\n"))
+    return templates
+
+
+def _iter_year_chunks(args: argparse.Namespace, chunk_size: int) -> Iterator[Sequence[int]]:
+    if args.stdin:
+        chunk: List[int] = []
+        for lineno, line in enumerate(sys.stdin, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                chunk.append(int(line))
+            except ValueError:
+                raise ValueError(f"stdin line {lineno}: not a year: {line!r}") from None
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+    elif args.year_from is not None:
+        for start in range(args.year_from, args.year_to + 1, chunk_size):
+            yield range(start, min(start + chunk_size, args.year_to + 1))
+    else:
+        yield [args.year]
+
+
+def write_tibetan_years(out: TextIO, chunks: Iterable[Sequence[int]], fmt: str) -> int:
+    """Write one row per year as compact JSONL or CSV, one write+flush per chunk."""
+    templates = _build_row_templates(fmt)
+    if fmt == "csv":
+        out.write(",".join(_CSV_FIELDS) + "\n")
+    n = 0
+    for chunk in chunks:
+        parts = []
+        for y in chunk:
+            prefix, suffix = templates[(y - 1984) % CYCLE_LENGTH]
+            parts.append(f"{prefix}{y}{suffix}")
+        out.write("".join(parts))
+        out.flush()
+        n += len(parts)
+    return n
+
+
+def _cmd_tibetan_year_bulk(args: argparse.Namespace) -> int:
+    modes = sum([args.year is not None, args.year_from is not None, args.stdin])
+    if modes != 1 or (args.year_from is None) != (args.year_to is None):
+        print("tibetan-year: give exactly one of YEAR, --from/--to or --stdin", file=sys.stderr)
+        return 2
+    if args.year_from is not None and args.year_from > args.year_to:
+        print("tibetan-year: --from must be <= --to", file=sys.stderr)
+        return 2
+    if args.chunk_size < 1:
+        print("tibetan-year: --chunk-size must be >= 1", file=sys.stderr)
+        return 2
+    if args.json and args.format == "csv":
+        # In bulk mode --json means JSON lines, the same as --format jsonl
+        print("tibetan-year: --json conflicts with --format csv", file=sys.stderr)
+        return 2
+
+    try:
+        write_tibetan_years(sys.stdout, _iter_year_chunks(args, args.chunk_size), args.format or "jsonl")
+    except ValueError as e:
+        print(f"tibetan-year: {e}", file=sys.stderr)
+        return 2
+    except BrokenPipeError:
+        # Downstream closed the pipe (e.g. `| head`): stop quietly
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+    return 0
+
+
+def _handle_request(raw: bytes) -> Dict[str, Any]:
+    """
+    Answer one JSON-lines request, e.g. {"cmd": "tibetan-year", "year": 2025}.
+    Errors are returned as {"error": "..."} so one bad line does not stop the stream.
+    """
+    try:
+        req = json.loads(raw)
+        if not isinstance(req, dict):
+            raise ValueError("request must be a JSON object")
+    except ValueError as e:
+        return {"error": f"invalid JSON request: {e}"}
+
+    cmd = req.get("cmd")
+    try:
+        if cmd == "tibetan-year":
+            year = req.get("year")
+            if isinstance(year, bool) or not isinstance(year, int):
+                raise ValueError(f"'year' must be an integer, got {year!r}")
+            data = _tibetan_year_fast_dict(tibetan_year(year))
+        elif cmd == "ping":
+            data = {"ok": True}
+        else:
+            raise ValueError(f"unknown cmd: {cmd!r}")
+    except ValueError as e:
+        data = {"error": str(e)}
+
+    if "id" in req:
+        data["id"] = req["id"]
+    return data
+
+
+def serve_stream(rfile: BinaryIO, wfile: BinaryIO, chunk_size: int = 65536) -> None:
+    """
+    Serve newline-delimited JSON requests from rfile until EOF.
+
+    Requests are pipelined: every complete line in a chunk is answered and the
+    responses for that chunk are written (and flushed) together, in order.
+    """
+    pending = b""
+    while True:
+        chunk = rfile.read1(chunk_size)  # type: ignore[attr-defined]
+        if not chunk:
+            break
+        *lines, pending = (pending + chunk).split(b"\n")
+        out = [_encode_response(_handle_request(line)) for line in lines if line.strip()]
+        if out:
+            wfile.write(b"".join(out))
+            wfile.flush()
+    if pending.strip():
+        wfile.write(_encode_response(_handle_request(pending)))
+        wfile.flush()
+
+
+def _encode_response(data: Dict[str, Any]) -> bytes:
+    return json.dumps(data, ensure_ascii=False, sort_keys=True, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+class _JSONLinesHandler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        serve_stream(self.rfile, self.wfile)
+
+
+def unix_socket_server(path: str) -> "socketserver.ThreadingUnixStreamServer":
+    """JSON-lines server bound to a local Unix socket; the caller runs serve_forever()."""
+    if os.path.exists(path):
+        os.unlink(path)  # stale socket from a previous run
+    return socketserver.ThreadingUnixStreamServer(path, _JSONLinesHandler)
+
+
+def serve_unix_socket(path: str) -> None:
+    """Serve JSON-lines requests on a local Unix socket (one thread per connection)."""
+    with unix_socket_server(path) as server:
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            os.unlink(path)
+
+
+def cmd_serve(args: argparse.Namespace) -> int:
+    if args.socket:
+        if not hasattr(socketserver, "ThreadingUnixStreamServer"):
+            print("tsurphu serve --socket requires Unix domain sockets", file=sys.stderr)
+            return 2
+        serve_unix_socket(args.socket)
+    else:
+        serve_stream(sys.stdin.buffer, sys.stdout.buffer)
+    return 0
+
+
+def _year_or_date(value: str):
+    """YEAR argument: a Gregorian year (2025) or a date (2025-02-10, resolved at Losar)."""
+    if "-" in value.lstrip("-"):
+        try:
+            return dt.date.fromisoformat(value)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"invalid date: {value!r}") from None
+    try:
+        return int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid year: {value!r}") from None
+
 
 def cmd_tibetan_year(args: argparse.Namespace) -> int:
+    if isinstance(args.year, dt.date):
+        # The Tibetan year in force on that date (it changes at Losar, not on January 1)
+        try:
+            args.year = tibetan_year(args.year).gregorian_year
+        except ValueError as e:  # outside the Losar index
+            print(f"tibetan-year: {e}", file=sys.stderr)
+            return 2
+    if args.format or args.stdin or args.year_from is not None or args.year_to is not None:
+        return _cmd_tibetan_year_bulk(args)
+    if args.year is None:
+        print("tibetan-year: missing YEAR (or use --from/--to, --stdin)", file=sys.stderr)
+        return 2
+
     ty = tibetan_year(args.year)
 
     if args.json:
@@ -59,6 +290,87 @@ def cmd_tibetan_year(args: argparse.Namespace) -> int:
     return 0
 
 
+LUNAR_DAY_ENGINES = ("analytic", "mean")
+
+
+def lunar_day_engine(name: str):
+    """
+    Lunar-day callable for the calendar: "analytic" is the true tithi from the
+    offline ephemeris in tsurphu.astro, "mean" the mean-elongation approximation.
+    """
+    from engines.day_calendar import mean_lunar_day, position_lunar_day
+
+    if name == "mean":
+        return mean_lunar_day
+    if name != "analytic":
+        raise ValueError(f"unknown lunar-day engine: {name!r} (choose from {', '.join(LUNAR_DAY_ENGINES)})")
+    from tsurphu.astro.tithi import AnalyticPositionSource
+
+    lunar_day = position_lunar_day(AnalyticPositionSource())
+    lunar_day.__name__ = "analytic"
+    return lunar_day
+
+
+def cmd_calendar(args: argparse.Namespace) -> int:
+    from engines.day_calendar import iter_days, record_to_dict, write_calendar
+
+    try:
+        start, end = dt.date.fromisoformat(args.start), dt.date.fromisoformat(args.end)
+    except ValueError as e:
+        print(f"calendar: {e}", file=sys.stderr)
+        return 2
+    if end < start:
+        print("calendar: --end must be >= --start", file=sys.stderr)
+        return 2
+    try:
+        lunar_day = lunar_day_engine(args.engine)
+    except ImportError as e:
+        print(f"calendar: {e}", file=sys.stderr)
+        return 2
+
+    if args.out:
+        path = write_calendar(args.out, start, end, longitude=args.lon, lunar_day=lunar_day)
+        print(f"{path} ({(end - start).days + 1} days)")
+        return 0
+
+    out = sys.stdout
+    buf: List[str] = []
+    for rec in iter_days(start, end, longitude=args.lon, lunar_day=lunar_day):
+        buf.append(json.dumps(record_to_dict(rec), ensure_ascii=False))
+        if len(buf) >= args.chunk_size:
+            out.write("\n".join(buf) + "\n")
+            buf.clear()
+    if buf:
+        out.write("\n".join(buf) + "\n")
+    out.flush()
+    return 0
+
+
+def cmd_seed_compile(args: argparse.Namespace) -> int:
+    # Imported here: the rules engine needs PyYAML (extra "rules") only to compile the seed
+    from engines.rules import SeedError
+    from engines.rules.snapshot import SeedQualityError, compile_seed
+
+    try:
+        snap = compile_seed(args.seed_dir, args.out)
+    except SeedQualityError as e:
+        print(f"seed compile: {len(e.problems)} quality problem(s):", file=sys.stderr)
+        for problem in e.problems:
+            print(f"  - {problem}", file=sys.stderr)
+        return 2
+    except (SeedError, ImportError) as e:
+        print(f"seed compile: {e}", file=sys.stderr)
+        return 2
+
+    for warning in snap.warnings:
+        print(f"seed compile: warning: {warning}", file=sys.stderr)
+    print(
+        f"{snap.path} ({len(snap.documents)} files, {len(snap.actions)} actions, "
+        f"source {snap.source_hash[:19]})"
+    )
+    return 0
+
+
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(prog="tsurphu")
     sub = parser.add_subparsers(dest="cmd", required=True)
@@ -67,14 +379,86 @@ def build_parser() -> argparse.ArgumentParser:
         "tibetan-year",
         help="Compute Tibetan year attributes for a Gregorian year",
     )
-    p_ty.add_argument("year", type=int, help="Gregorian year (e.g. 2025)")
+    p_ty.add_argument(
+        "year",
+        type=_year_or_date,
+        nargs="?",
+        help="Gregorian year (e.g. 2025) or a date (e.g. 2025-02-10; the year changes at Losar)",
+    )
     p_ty.add_argument(
         "--json",
         action="store_true",
-        help="Output JSON instead of the Python repr",
+        help="Output JSON instead of the Python repr (bulk: JSON lines, same as --format jsonl)",
+    )
+    p_ty.add_argument("--from", dest="year_from", type=int, help="Bulk: first year of the range")
+    p_ty.add_argument("--to", dest="year_to", type=int, help="Bulk: last year of the range (inclusive)")
+    p_ty.add_argument("--stdin", action="store_true", help="Bulk: read one year per line from stdin")
+    p_ty.add_argument(
+        "--format",
+        choices=["jsonl", "csv"],
+        help="Bulk output format (default: jsonl)",
+    )
+    p_ty.add_argument(
+        "--chunk-size",
+        type=int,
+        default=65536,
+        help="Bulk: rows per buffered write/flush (default: 65536)",
     )
     p_ty.set_defaults(func=cmd_tibetan_year)
 
+    p_serve = sub.add_parser(
+        "serve",
+        help="Answer newline-delimited JSON requests with the engines kept loaded",
+    )
+    p_serve.add_argument(
+        "--socket",
+        metavar="PATH",
+        help="Listen on a local Unix socket instead of stdin/stdout",
+    )
+    p_serve.set_defaults(func=cmd_serve)
+
+    p_cal = sub.add_parser(
+        "calendar",
+        help="Per-day calendar (weekday, lunar day, day animal/element, year attributes)",
+    )
+    p_cal.add_argument("--start", required=True, help="First date, YYYY-MM-DD")
+    p_cal.add_argument("--end", required=True, help="Last date, YYYY-MM-DD (inclusive)")
+    p_cal.add_argument(
+        "--lon",
+        type=float,
+        default=0.0,
+        help="Longitude in degrees east; the lunar day is taken at local daybreak (default: 0)",
+    )
+    p_cal.add_argument(
+        "--engine",
+        choices=LUNAR_DAY_ENGINES,
+        default="analytic",
+        help="Lunar day: true tithi from the offline analytic ephemeris (default), "
+        "or the much faster mean-elongation approximation (off by one on ~40%% of days)",
+    )
+    p_cal.add_argument(
+        "--out",
+        metavar="PATH",
+        help="Write the columnar, memory-mappable calendar file instead of JSONL on stdout",
+    )
+    p_cal.add_argument(
+        "--chunk-size",
+        type=int,
+        default=4096,
+        help="JSONL: rows per buffered write (default: 4096)",
+    )
+    p_cal.set_defaults(func=cmd_calendar)
+
+    p_seed = sub.add_parser("seed", help="Seed package maintenance")
+    seed_sub = p_seed.add_subparsers(dest="seed_cmd", required=True)
+    p_compile = seed_sub.add_parser(
+        "compile",
+        help="Validate the seed YAML and write the precompiled snapshot",
+    )
+    p_compile.add_argument("--seed-dir", metavar="DIR", help="Seed directory (default: Seed/tsurphu_seed_v1)")
+    p_compile.add_argument("--out", metavar="PATH", help="Snapshot path (default: .cache/tsurphu/seed/)")
+    p_compile.set_defaults(func=cmd_seed_compile)
+
     return parser
 
 
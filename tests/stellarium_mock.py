@@ -0,0 +1,174 @@
+"""Servidor HTTP local que imita los endpoints de Stellarium RemoteControl.
+
+Solo para tests/benchmarks: guarda tiempo/ubicación/selección como estado
+global (igual que Stellarium) y cuenta peticiones y conexiones.
+"""
+from __future__ import annotations
+
+import json
+import socket
+import threading
+import time
+import urllib.parse
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+
+# Posiciones sintéticas (RA/Dec en grados) lineales en JD: suficiente para tests de transporte
+_BODIES = {
+    "Sun": (280.0, 0.9856, -23.0),
+    "Moon": (10.0, 13.176, 5.0),
+    "Mars": (100.0, 0.524, 20.0),
+}
+
+
+class MockStellarium:
+    def __init__(self, *, latency_s: float = 0.0, requires_focus: bool = False) -> None:
+        self.latency_s = latency_s
+        self.requires_focus = requires_focus
+        self.jd = 2451545.0
+        self.location: Dict[str, str] = {}
+        self.selected: Optional[str] = None
+        self.requests: Counter = Counter()
+        self.connections = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        # Knobs para simular fallos
+        self.close_after_each_response = False  # cierra el socket sin avisar (keep-alive "stale")
+        self.fail_next_gets = 0                 # corta la conexión sin responder en los próximos N GET
+        self.alive = True                       # False -> status devuelve 503
+        self.down_after_requests: Optional[int] = None  # tras N peticiones, corta todas (instancia caída)
+        self.served = 0
+        self._lock = threading.Lock()
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, args=(0.02,), daemon=True)
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    def start(self) -> "MockStellarium":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "MockStellarium":
+        return self.start()
+
+    def __exit__(self, *exc: object) -> None:
+        self.stop()
+
+    def body_radec(self, name: str, jd: float) -> tuple[float, float]:
+        ra0, rate, dec = _BODIES[name]
+        return (ra0 + rate * (jd - 2451545.0)) % 360.0, dec
+
+    def _handler_class(self):
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self) -> None:
+                super().setup()
+                # Cabeceras y cuerpo salen en writes separados: sin NODELAY, Nagle + delayed ACK
+                self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                with mock._lock:
+                    mock.connections += 1
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+            def _tracked(self, fn) -> None:
+                with mock._lock:
+                    mock.served += 1
+                    down = mock.down_after_requests is not None and mock.served > mock.down_after_requests
+                if down:
+                    mock.alive = False
+                    self.close_connection = True
+                    return
+                with mock._lock:
+                    mock.in_flight += 1
+                    mock.max_in_flight = max(mock.max_in_flight, mock.in_flight)
+                try:
+                    fn()
+                finally:
+                    with mock._lock:
+                        mock.in_flight -= 1
+
+            def do_GET(self) -> None:
+                self._tracked(self._get)
+
+            def do_POST(self) -> None:
+                self._tracked(self._post)
+
+            def _send(self, status: int, payload: Any) -> None:
+                body = payload if isinstance(payload, bytes) else json.dumps(payload).encode("utf-8")
+                try:
+                    self.send_response(status)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    # El cliente ya se fue (p.ej. timeout): nada que responder
+                    self.close_connection = True
+                    return
+                if mock.close_after_each_response:
+                    self.close_connection = True
+
+            def _get(self) -> None:
+                url = urllib.parse.urlsplit(self.path)
+                q = dict(urllib.parse.parse_qsl(url.query))
+                with mock._lock:
+                    mock.requests[("GET", url.path)] += 1
+                    if mock.fail_next_gets > 0:
+                        mock.fail_next_gets -= 1
+                        self.close_connection = True
+                        return
+                if mock.latency_s:
+                    time.sleep(mock.latency_s)
+                if url.path == "/api/main/status":
+                    if not mock.alive:
+                        return self._send(503, {"error": "down"})
+                    return self._send(200, {
+                        "time": {"jday": mock.jd, "timerate": 0},
+                        "location": mock.location,
+                        "selectioninfo": mock.selected or "",
+                    })
+                if url.path == "/api/objects/info":
+                    name = q.get("name", "")
+                    if name not in _BODIES:
+                        return self._send(404, b"object name not found")
+                    if mock.requires_focus and mock.selected != name:
+                        return self._send(200, {"name": name})
+                    ra, dec = mock.body_radec(name, mock.jd)
+                    return self._send(200, {"name": name, "ra": ra, "dec": dec, "jd": mock.jd})
+                if url.path == "/api/objects/find":
+                    s = q.get("str", "").lower()
+                    return self._send(200, [n for n in _BODIES if s in n.lower()])
+                return self._send(404, b"not found")
+
+            def _post(self) -> None:
+                url = urllib.parse.urlsplit(self.path)
+                n = int(self.headers.get("Content-Length") or 0)
+                form = dict(urllib.parse.parse_qsl(self.rfile.read(n).decode("utf-8")))
+                with mock._lock:
+                    mock.requests[("POST", url.path)] += 1
+                if mock.latency_s:
+                    time.sleep(mock.latency_s)
+                if url.path == "/api/main/time":
+                    mock.jd = float(form["time"])
+                elif url.path == "/api/location/setlocationfields":
+                    mock.location = form
+                elif url.path == "/api/main/focus":
+                    mock.selected = form.get("target")
+                else:
+                    return self._send(404, b"not found")
+                return self._send(200, b"ok")
+
+        return Handler
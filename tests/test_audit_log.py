@@ -0,0 +1,81 @@
+import datetime as dt
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from governance import audit_log
+from governance.audit_log import AuditWriter
+
+ENTRY = {"timestamp_utc": "2026-01-13T16:12:47Z", "event": "sliceA_report_created", "report_file": "/reports/ñ.json"}
+
+
+class TestAuditWriter(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "audit" / "audit-log.jsonl"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_bytes_match_legacy_writer(self):
+        legacy = Path(self.tmp.name) / "legacy.jsonl"
+        with legacy.open("a", encoding="utf-8") as f:
+            f.write(json.dumps(ENTRY, ensure_ascii=False) + "\n")
+        with AuditWriter(self.path) as w:
+            w.write(ENTRY)
+        self.assertEqual(self.path.read_bytes(), legacy.read_bytes())
+
+    def test_line_ending_follows_the_platform(self):
+        with mock.patch.object(audit_log.os, "linesep", "\r\n"), AuditWriter(self.path) as w:
+            w.write(ENTRY)
+            w.write(ENTRY)
+        data = self.path.read_bytes()
+        self.assertEqual(data.count(b"\r\n"), 2)
+        self.assertEqual([json.loads(l) for l in data.splitlines()], [ENTRY, ENTRY])
+
+    def test_batched_flush(self):
+        with AuditWriter(self.path, flush_every=3, fsync="never") as w:
+            w.write(ENTRY)
+            w.write(ENTRY)
+            self.assertEqual(self.path.read_bytes(), b"")
+            w.write(ENTRY)
+            self.assertEqual(len(self.path.read_bytes().splitlines()), 3)
+            w.write(ENTRY)
+        self.assertEqual(len(self.path.read_bytes().splitlines()), 4)
+
+    def test_rotation_by_size_keeps_every_entry_and_indexes_segments(self):
+        line = len(json.dumps(dict(ENTRY, n=0), ensure_ascii=False).encode("utf-8")) + len(os.linesep)
+        with AuditWriter(self.path, max_bytes=line * 4) as w:
+            w.write_many(dict(ENTRY, n=i) for i in range(10))
+            segs = w.segments()
+        self.assertEqual([p.name for p in segs], ["audit-log.000001.jsonl", "audit-log.000002.jsonl"])
+        index = [json.loads(l) for l in w.index_path.read_text(encoding="utf-8").splitlines()]
+        self.assertEqual([r["segment"] for r in index], [p.name for p in segs])
+        self.assertEqual(sum(r["entries"] for r in index), 8)
+        self.assertEqual(index[0]["first_timestamp_utc"], ENTRY["timestamp_utc"])
+        ns = [json.loads(l)["n"] for p in segs + [self.path] for l in p.read_text(encoding="utf-8").splitlines()]
+        self.assertEqual(ns, list(range(10)))
+
+    def test_rotation_by_date(self):
+        now = [dt.datetime(2026, 1, 13, 23, 59, tzinfo=dt.timezone.utc)]
+        with AuditWriter(self.path, rotate_daily=True, clock=lambda: now[0]) as w:
+            w.write(ENTRY)
+            w.write(ENTRY)
+            now[0] += dt.timedelta(minutes=2)
+            w.write(ENTRY)
+            self.assertEqual(len(w.segments()), 1)
+        self.assertEqual(len(self.path.read_bytes().splitlines()), 1)
+
+    def test_reopen_appends(self):
+        with AuditWriter(self.path) as w:
+            w.write(ENTRY)
+        with AuditWriter(self.path) as w:
+            w.write(ENTRY)
+        self.assertEqual(len(self.path.read_bytes().splitlines()), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from governance import changesets as cs
+from governance.changesets import canon, packet_hash, validate_changesets
+
+REPO_CHANGESETS = Path(__file__).resolve().parents[1] / "changesets"
+
+
+def _packet(i):
+    pkt = {"change_id": f"TSU-T-{i:04d}", "objects_affected": [], "integrity": {"packet_hash": ""}}
+    pkt["integrity"]["packet_hash"] = packet_hash(pkt)
+    return pkt
+
+
+class TestChangesetValidation(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+        self.manifest = self.dir / "cache" / "manifest.json"
+        self.paths = []
+        for i in range(5):
+            p = self.dir / f"TSU-T-{i:04d}.json"
+            p.write_bytes(canon(_packet(i)))
+            self.paths.append(p)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_repo_changesets_verify(self):
+        rep = validate_changesets(sorted(REPO_CHANGESETS.glob("*.json")))
+        self.assertEqual(rep.errors, [])
+
+    def test_incremental_reverifies_only_changed(self):
+        rep = validate_changesets(self.paths, manifest_path=self.manifest)
+        self.assertEqual((rep.verified, rep.cached, rep.errors), (5, 0, []))
+        rep = validate_changesets(self.paths, manifest_path=self.manifest)
+        self.assertEqual((rep.verified, rep.cached), (0, 5))
+
+        bad = json.loads(self.paths[2].read_text(encoding="utf-8"))
+        bad["change_id"] = "tampered!"
+        self.paths[2].write_text(json.dumps(bad), encoding="utf-8")
+        rep = validate_changesets(self.paths, manifest_path=self.manifest)
+        self.assertEqual((rep.verified, rep.cached), (1, 4))
+        self.assertEqual(rep.errors, ["TSU-T-0002.json: hash no coincide"])
+        # los paquetes con error no entran al manifiesto: se re-verifican siempre
+        rep = validate_changesets(self.paths, manifest_path=self.manifest)
+        self.assertEqual((rep.verified, len(rep.errors)), (1, 1))
+
+    def test_full_ignores_manifest(self):
+        validate_changesets(self.paths, manifest_path=self.manifest)
+        rep = validate_changesets(self.paths, manifest_path=self.manifest, full=True)
+        self.assertEqual((rep.verified, rep.cached), (5, 0))
+
+    def test_pool_matches_serial(self):
+        self.paths[4].write_text("{not json", encoding="utf-8")
+        old = cs.POOL_MIN_FILES
+        cs.POOL_MIN_FILES = 1
+        try:
+            pooled = validate_changesets(self.paths, jobs=2)
+        finally:
+            cs.POOL_MIN_FILES = old
+        serial = validate_changesets(self.paths, jobs=1)
+        self.assertEqual(pooled.errors, serial.errors)
+        self.assertTrue(serial.errors[0].startswith("TSU-T-0004.json: inválido ("))
+
+    def test_touched_mtime_is_rechecked(self):
+        validate_changesets(self.paths, manifest_path=self.manifest)
+        st = self.paths[0].stat()
+        os.utime(self.paths[0], ns=(st.st_atime_ns, st.st_mtime_ns + 1000))
+        rep = validate_changesets(self.paths, manifest_path=self.manifest)
+        self.assertEqual(rep.verified, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
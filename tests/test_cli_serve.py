@@ -0,0 +1,69 @@
+import io
+import json
+import os
+import socket
+import tempfile
+import threading
+import unittest
+
+from orchestration import cli
+
+
+def _responses(payload: bytes):
+    out = io.BytesIO()
+    cli.serve_stream(io.BufferedReader(io.BytesIO(payload)), out)
+    return [json.loads(line) for line in out.getvalue().splitlines()]
+
+
+class TestServeStream(unittest.TestCase):
+    def test_matches_tibetan_year_json(self):
+        (resp,) = _responses(b'{"cmd":"tibetan-year","year":2025}\n')
+        expected = cli._normalize_tibetan_year_json(cli._tibetan_year_to_dict(cli.tibetan_year(2025)))
+        self.assertEqual(resp, expected)
+
+    def test_pipelined_requests_keep_order_and_ids(self):
+        lines = b"".join(
+            json.dumps({"cmd": "tibetan-year", "year": y, "id": i}).encode() + b"\n"
+            for i, y in enumerate(range(1980, 2080))
+        )
+        resps = _responses(lines)
+        self.assertEqual([r["id"] for r in resps], list(range(100)))
+        self.assertEqual([r["gregorian_year"] for r in resps], list(range(1980, 2080)))
+
+    def test_errors_do_not_stop_the_stream(self):
+        resps = _responses(b'not json\n{"cmd":"tibetan-year","year":"x"}\n{"cmd":"nope"}\n{"cmd":"ping"}')
+        self.assertIn("error", resps[0])
+        self.assertIn("error", resps[1])
+        self.assertIn("error", resps[2])
+        self.assertEqual(resps[3], {"ok": True})
+
+
+@unittest.skipUnless(hasattr(socket, "AF_UNIX"), "requires Unix domain sockets")
+class TestServeUnixSocket(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, "tsurphu.sock")
+        server = cli.unix_socket_server(self.path)
+        t = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+        t.start()
+        # Cleanups run in reverse order: stop the loop, join it, close the socket, remove the file
+        self.addCleanup(os.unlink, self.path)
+        self.addCleanup(server.server_close)
+        self.addCleanup(t.join, 5)
+        self.addCleanup(server.shutdown)
+
+    def test_socket_round_trip(self):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+            s.connect(self.path)
+            s.sendall(b'{"cmd":"tibetan-year","year":1984}\n{"cmd":"tibetan-year","year":1985}\n')
+            f = s.makefile("rb")
+            first = json.loads(f.readline())
+            second = json.loads(f.readline())
+
+        self.assertEqual((first["animal"], first["mewa"]), ("Rat", 1))
+        self.assertEqual((second["animal"], second["mewa"]), ("Ox", 9))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -26,3 +26,51 @@ def test_cli_tibetan_year_json_output(capsys):
     assert data["branch_index"] == 5
     assert data["mewa"] == 5
     assert data["parkha"] == "khon"
+
+
+def test_cli_tibetan_year_range_jsonl_matches_single(capsys):
+    rc = cli.main(["tibetan-year", "--from", "1800", "--to", "2200", "--chunk-size", "37"])
+    assert rc == 0
+
+    rows = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [r["gregorian_year"] for r in rows] == list(range(1800, 2201))
+    for r in rows:
+        ty = cli.tibetan_year(r["gregorian_year"])
+        assert r == cli._normalize_tibetan_year_json(cli._tibetan_year_to_dict(ty))
+
+
+def test_cli_tibetan_year_stdin_csv(capsys, monkeypatch):
+    import io
+
+    monkeypatch.setattr("sys.stdin", io.StringIO("2025\n\n1984\n"))
+    rc = cli.main(["tibetan-year", "--stdin", "--format", "csv"])
+    assert rc == 0
+
+    assert capsys.readouterr().out.splitlines() == [
+        "gregorian_year,element,animal,stem_index,branch_index,mewa,parkha",
+        "2025,wood,Snake,1,5,5,khon",
+        "1984,wood,Rat,0,0,1,kham",
+    ]
+
+
+def test_cli_tibetan_year_bulk_rejects_mixed_modes(capsys):
+    assert cli.main(["tibetan-year", "2025", "--from", "2000", "--to", "2001"]) == 2
+    assert cli.main(["tibetan-year", "--from", "2000"]) == 2
+    assert "tibetan-year:" in capsys.readouterr().err
+
+
+def test_cli_tibetan_year_bulk_rejects_bad_chunk_size(capsys):
+    for size in ("0", "-5"):
+        assert cli.main(["tibetan-year", "--from", "2000", "--to", "2001", "--chunk-size", size]) == 2
+        captured = capsys.readouterr()
+        assert captured.out == ""
+        assert "--chunk-size must be >= 1" in captured.err
+
+
+def test_cli_tibetan_year_bulk_json_flag(capsys):
+    assert cli.main(["tibetan-year", "--from", "2000", "--to", "2001", "--json"]) == 0
+    rows = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [r["gregorian_year"] for r in rows] == [2000, 2001]
+
+    assert cli.main(["tibetan-year", "--from", "2000", "--to", "2001", "--json", "--format", "csv"]) == 2
+    assert "--json conflicts with --format csv" in capsys.readouterr().err
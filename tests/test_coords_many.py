@@ -0,0 +1,56 @@
+import math
+import unittest
+from array import array
+
+from tsurphu.astro.coords import (
+    equatorial_to_ecliptic,
+    equatorial_to_ecliptic_many,
+    mean_obliquity_deg,
+    mean_obliquity_deg_many,
+)
+
+
+def _angle_diff(a, b):
+    return (a - b + 180.0) % 360.0 - 180.0
+
+
+class TestCoordsMany(unittest.TestCase):
+    def setUp(self):
+        self.ra = array("d", (i * 7.3 % 360.0 for i in range(500)))
+        self.dec = array("d", (-89.0 + (i * 3.7) % 178.0 for i in range(500)))
+        self.jd = array("d", (2451545.0 + (i // 10) for i in range(500)))
+
+    def test_matches_scalar_with_per_element_jd(self):
+        lons, lats = equatorial_to_ecliptic_many(self.ra, self.dec, self.jd)
+        for i in range(len(self.ra)):
+            lon, lat = equatorial_to_ecliptic(self.ra[i], self.dec[i], self.jd[i])
+            self.assertAlmostEqual(_angle_diff(float(lons[i]), lon), 0.0, places=9)
+            self.assertAlmostEqual(float(lats[i]), lat, places=9)
+
+    def test_scalar_jd_broadcasts(self):
+        lons, _ = equatorial_to_ecliptic_many(self.ra, self.dec, 2460000.5)
+        lon, _ = equatorial_to_ecliptic(self.ra[3], self.dec[3], 2460000.5)
+        self.assertAlmostEqual(float(lons[3]), lon, places=9)
+
+    def test_poles_are_finite(self):
+        eps = mean_obliquity_deg(2451545.0)
+        lons, lats = equatorial_to_ecliptic_many([0.0, 123.0], [90.0, -90.0], 2451545.0)
+        # Polo norte celeste: lon 90°, lat 90° - ε; polo sur: lon 270°, lat -(90° - ε)
+        self.assertAlmostEqual(float(lons[0]), 90.0, places=6)
+        self.assertAlmostEqual(float(lats[0]), 90.0 - eps, places=6)
+        self.assertAlmostEqual(float(lons[1]), 270.0, places=6)
+        self.assertAlmostEqual(float(lats[1]), -(90.0 - eps), places=6)
+        self.assertTrue(all(math.isfinite(float(v)) for v in lons))
+
+    def test_obliquity_many(self):
+        values = mean_obliquity_deg_many([2451545.0, 2488070.0])
+        self.assertAlmostEqual(float(values[0]), mean_obliquity_deg(2451545.0), places=12)
+        self.assertAlmostEqual(float(values[1]), mean_obliquity_deg(2488070.0), places=12)
+
+    def test_length_mismatch(self):
+        with self.assertRaises(ValueError):
+            equatorial_to_ecliptic_many([1.0, 2.0], [1.0, 2.0], [2451545.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,130 @@
+import contextlib
+import datetime as dt
+import io
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from engines.day_calendar import (
+    COLUMNS,
+    DayCalendar,
+    daybreak_jd,
+    iter_days,
+    mean_lunar_day,
+    position_lunar_day,
+    record_to_dict,
+    write_calendar,
+)
+from engines.rules.engine import day_context
+from engines.tibetan_year import ELEMENTS, tibetan_year
+from orchestration.cli import lunar_day_engine, main
+from tsurphu.astro.tithi import AnalyticPositionSource
+
+LHASA_LON = 91.1
+
+
+class TestDayCalendar(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = Path(tmp.name)
+
+    def test_records_match_scalar_engines(self):
+        start, end = dt.date(1999, 12, 1), dt.date(2001, 2, 1)
+        days = list(iter_days(start, end, longitude=LHASA_LON, lunar_day=mean_lunar_day))
+        self.assertEqual(len(days), (end - start).days + 1)
+        for rec in days:
+            ctx = day_context(rec.date)
+            self.assertEqual((rec.weekday, rec.animal, rec.element), (ctx.weekday, ctx.animal, ctx.element))
+            ty = tibetan_year(rec.date)  # el año cambia en Losar
+            self.assertEqual(rec.year, ty.gregorian_year)
+            self.assertEqual(ELEMENTS[rec.year_element], ty.element)
+            self.assertEqual((rec.year_animal, rec.mewa), (ty.branch_index, ty.mewa))
+            self.assertEqual(rec.lunar_day, mean_lunar_day(daybreak_jd(rec.date, LHASA_LON)))
+        d = record_to_dict(days[31])  # 2000-01-01: Earth Horse, todavía año Earth Rabbit (Losar 2000-02-06)
+        self.assertEqual(
+            (d["date"], d["element"], d["animal"], d["year"], d["year_element"], d["year_animal"]),
+            ("2000-01-01", "Earth", "Horse", 1999, "Earth", "Rabbit"),
+        )
+        losar = next(r for r in days if r.year == 2000)
+        self.assertEqual(losar.date, dt.date(2000, 2, 6))
+
+    def test_analytic_engine_is_the_true_tithi(self):
+        # Luna nueva 2024-01-11 11:57 UT: al amanecer en Lhasa del 11 todavía es tithi 30,
+        # al del 12 ya es tithi 1
+        analytic = lunar_day_engine("analytic")
+        days = list(iter_days(dt.date(2024, 1, 10), dt.date(2024, 1, 12), longitude=LHASA_LON, lunar_day=analytic))
+        self.assertEqual([r.lunar_day for r in days], [29, 30, 1])
+
+        true_day = position_lunar_day(AnalyticPositionSource())
+        start = dt.date(2024, 1, 1)
+        recs = list(iter_days(start, start + dt.timedelta(days=59), longitude=LHASA_LON, lunar_day=analytic))
+        self.assertEqual([r.lunar_day for r in recs],
+                         [true_day(daybreak_jd(r.date, LHASA_LON)) for r in recs])
+
+    def test_mean_lunar_day_is_an_approximation(self):
+        # New moon 2000-01-06 18:14 UT: tithi 1 starts there
+        self.assertEqual(mean_lunar_day(2451550.26 + 0.3), 1)
+        start = dt.date(2024, 1, 1)
+        mean = list(iter_days(start, start + dt.timedelta(days=89), lunar_day=lunar_day_engine("mean")))
+        true = list(iter_days(start, start + dt.timedelta(days=89), lunar_day=lunar_day_engine("analytic")))
+        diffs = [(a.lunar_day - b.lunar_day + 15) % 30 - 15 for a, b in zip(mean, true)]
+        self.assertLessEqual(max(abs(x) for x in diffs), 1)
+        self.assertTrue(any(diffs))  # por eso no es el motor por defecto
+        with self.assertRaises(ValueError):
+            lunar_day_engine("stellarium")
+
+    def test_file_round_trip_by_offset(self):
+        start, end = dt.date(1990, 1, 1), dt.date(2029, 12, 31)
+        path = write_calendar(self.dir / "cal.bin", start, end, longitude=LHASA_LON, lunar_day=mean_lunar_day)
+        expected = list(iter_days(start, end, longitude=LHASA_LON, lunar_day=mean_lunar_day))
+        with DayCalendar(path) as cal:
+            self.assertEqual(cal.header["lunar_day"], "mean_lunar_day")
+            self.assertEqual((cal.start, cal.end, len(cal)), (start, end, len(expected)))
+            self.assertEqual(cal.columns, [name for name, _ in COLUMNS])
+            for i in (0, 1, 3652, len(expected) - 1):
+                self.assertEqual(cal.record(i), expected[i])
+            d = dt.date(2026, 10, 17)
+            self.assertEqual(cal.record(d), expected[cal.offset(d)])
+            self.assertEqual(cal.day_context(d), day_context(d))
+            self.assertEqual([int(x) for x in cal.column("lunar_day")], [r.lunar_day for r in expected])
+            self.assertEqual(int(cal.column("year")[-1]), 2029)
+            with self.assertRaises(KeyError):
+                cal.offset(end + dt.timedelta(days=1))
+
+    def test_rejects_foreign_file(self):
+        p = self.dir / "x.bin"
+        p.write_bytes(b"not a calendar at all")
+        with self.assertRaises(ValueError):
+            DayCalendar(p)
+
+    def test_cli(self):
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            rc = main(["calendar", "--start", "2026-10-15", "--end", "2026-10-17", "--lon", str(LHASA_LON)])
+        self.assertEqual(rc, 0)
+        rows = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual([r["date"] for r in rows], ["2026-10-15", "2026-10-16", "2026-10-17"])
+        self.assertEqual(rows[2]["weekday"], 5)
+        true_day = position_lunar_day(AnalyticPositionSource())
+        self.assertEqual([r["lunar_day"] for r in rows],
+                         [true_day(daybreak_jd(dt.date(2026, 10, d), LHASA_LON)) for d in (15, 16, 17)])
+
+        path = self.dir / "cli.bin"
+        with contextlib.redirect_stdout(io.StringIO()):
+            rc = main(["calendar", "--start", "2026-01-01", "--end", "2026-12-31", "--out", str(path)])
+        self.assertEqual(rc, 0)
+        with DayCalendar(path) as cal:
+            self.assertEqual((len(cal), cal.header["lunar_day"]), (365, "analytic"))
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            rc = main(["calendar", "--start", "2026-01-01", "--end", "2026-01-31", "--engine", "mean",
+                       "--out", str(path)])
+        self.assertEqual(rc, 0)
+        with DayCalendar(path) as cal:
+            self.assertEqual(cal.header["lunar_day"], "mean_lunar_day")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+import datetime as dt
+import unittest
+
+from engines.rules import seed as seed_mod
+from engines.tibetan_year import ELEMENTS, np, tibetan_year, tibetan_years
+
+if seed_mod.yaml is not None:
+    from engines.rules import (
+        RELATIONS,
+        ElementMatrix,
+        day_context,
+        day_element_codes,
+        element_codes,
+        element_index,
+        element_relation,
+        load_element_matrix,
+        load_rule_engine,
+    )
+
+WEIGHTS = {"mother": 2, "child": 0, "friend": 1, "enemy": -2}
+
+
+@unittest.skipIf(seed_mod.yaml is None, "PyYAML no instalado")
+class TestElementMatrix(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.m = load_element_matrix()
+        cls.backends = ["array"] + (["numpy"] if np is not None else [])
+
+    def test_matrix_matches_pairwise_relation(self):
+        self.assertEqual(self.m.relation_weights, WEIGHTS)
+        for b in range(5):
+            for d in range(5):
+                rel = element_relation(b, d)
+                self.assertEqual(RELATIONS[self.m.relation[b][d]], rel)
+                self.assertEqual(self.m.weight[b][d], WEIGHTS.get(rel, 0))
+        # Wood: Water es madre (+2), Metal enemigo (−2)
+        self.assertEqual(self.m.weight_of("Wood", "water"), 2)
+        self.assertEqual(self.m.relation_of(tibetan_year(1984), "Metal"), "enemy")
+        self.assertIs(load_rule_engine().relation_weight, load_rule_engine().element_matrix.flat)
+
+    def test_element_codes(self):
+        years = [tibetan_year(y) for y in range(1980, 2000)]
+        expected = [ELEMENTS.index(ty.element) for ty in years]
+        for backend in self.backends:
+            self.assertEqual(list(element_codes(years, backend=backend)), expected)
+            cols = tibetan_years(range(1980, 2000), backend=backend)
+            self.assertEqual(list(element_codes(cols, backend=backend)), expected)
+        self.assertEqual(list(element_codes(["wood", "FIRE", 2])), [0, 1, 2])
+        with self.assertRaises(ValueError):
+            element_index("Aether")
+        with self.assertRaises(ValueError):
+            element_index(5)
+
+    def test_day_element_codes(self):
+        days = [dt.date(2026, 1, 1) + dt.timedelta(days=i) for i in range(60)]
+        expected = [day_context(d).element for d in days]
+        for backend in self.backends:
+            self.assertEqual(list(day_element_codes(days, backend=backend)), expected)
+            self.assertEqual(list(day_element_codes([d.toordinal() for d in days], backend=backend)), expected)
+
+    def test_score_and_grid_match_scalar(self):
+        births = [i % 5 for i in range(37)]
+        days = list(day_element_codes([dt.date(2026, 1, 1) + dt.timedelta(days=i) for i in range(37)]))
+        for backend in self.backends:
+            pairs = self.m.score(births, days, backend=backend)
+            self.assertEqual([int(w) for w in pairs], [self.m.weight[b][d] for b, d in zip(births, days)])
+            grid = self.m.score_grid(births, days, backend=backend)
+            self.assertEqual(len(grid), len(births))
+            for b, row in zip(births, grid):
+                self.assertEqual([int(w) for w in row], [self.m.weight[b][d] for d in days])
+        with self.assertRaises(ValueError):
+            self.m.score([0, 1], [0])
+
+    def test_rank_days(self):
+        births = list(element_codes([tibetan_year(y) for y in (1984, 1986, 1990)]))
+        days = list(day_element_codes([dt.date(2026, 1, 1) + dt.timedelta(days=i) for i in range(365)]))
+        for backend in self.backends:
+            ranked = self.m.rank_days(births, days, backend=backend)
+            top = self.m.rank_days(births, days, top=5, backend=backend)
+            for b, order, head in zip(births, ranked, top):
+                weights = [self.m.weight[b][days[i]] for i in order]
+                self.assertEqual(weights, sorted(weights, reverse=True))
+                self.assertEqual(sorted(int(i) for i in order), list(range(365)))
+                self.assertEqual(list(head), list(order[:5]))
+                # empates: el día más temprano primero
+                best = [int(i) for i in order if self.m.weight[b][days[i]] == weights[0]]
+                self.assertEqual(best, sorted(best))
+
+    def test_custom_weights(self):
+        m = ElementMatrix({"mother": 3, "enemy": -1})
+        self.assertEqual(m.weight_of("Wood", "Water"), 3)
+        self.assertEqual(m.weight_of("Wood", "Fire"), 0)
+        self.assertEqual(m.weight_of("Wood", "Wood"), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
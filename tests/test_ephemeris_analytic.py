@@ -0,0 +1,48 @@
+import json
+import unittest
+from pathlib import Path
+
+from tsurphu.astro import ephemeris
+from tsurphu.astro.ephemeris import body_ecliptic, ecliptic_many
+
+FIXTURES = json.loads((Path(__file__).parent / "fixtures" / "ephemeris_reference.json").read_text(encoding="utf-8"))
+
+
+def _angle_diff(a, b):
+    return (a - b + 180.0) % 360.0 - 180.0
+
+
+class TestAnalyticEphemeris(unittest.TestCase):
+    def test_reference_positions(self):
+        for case in FIXTURES["positions"]:
+            lon, lat = body_ecliptic(case["body"], case["jd"], timescale=case["timescale"])
+            self.assertLess(abs(_angle_diff(lon, case["ecl_lon_deg"])), case["tol_deg"], case["ref"])
+            self.assertLess(abs(lat - case["ecl_lat_deg"]), case["tol_deg"], case["ref"])
+
+    def test_new_moon_elongation(self):
+        for case in FIXTURES["new_moons"]:
+            moon, _ = body_ecliptic("Moon", case["jd"], timescale=case["timescale"])
+            sun, _ = body_ecliptic("Sun", case["jd"], timescale=case["timescale"])
+            self.assertLess(abs(_angle_diff(moon, sun)), case["tol_deg"], case["ref"])
+
+    def test_vectorized_matches_scalar(self):
+        jds = [2451545.0 + 37.3 * i for i in range(200)]
+        for body in ("Sun", "Moon"):
+            lons, lats = ecliptic_many(body, jds)
+            for jd, lon, lat in zip(jds, lons, lats):
+                slon, slat = body_ecliptic(body, jd)
+                self.assertAlmostEqual(_angle_diff(float(lon), slon), 0.0, places=7)
+                self.assertAlmostEqual(float(lat), slat, places=7)
+
+    def test_unknown_body(self):
+        with self.assertRaises(ValueError):
+            body_ecliptic("Mars", 2451545.0)
+
+    def test_delta_t_is_continuous_enough(self):
+        # Los tramos polinómicos no deben saltar más de ~2 s en los bordes
+        for y in (1700, 1800, 1860, 1900, 1920, 1941, 1961, 1986, 2005, 2050, 2150):
+            self.assertLess(abs(ephemeris.delta_t_seconds(y - 1e-6) - ephemeris.delta_t_seconds(y)), 2.0, y)
+
+
+if __name__ == "__main__":
+    unittest.main()
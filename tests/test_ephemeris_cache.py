@@ -0,0 +1,155 @@
+import contextlib
+import datetime as dt
+import io
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from tests.stellarium_mock import MockStellarium
+from tsurphu.integraciones.ephemeris_cache import CachingStellariumClient, EphemerisCache
+from tsurphu.integraciones.stellarium_rc import StellariumRCConfig, StellariumRCError, StellariumRemoteControlClient
+from tsurphu.scripts import ephemeris_snapshot
+from tsurphu.scripts.lunar_range_report import iter_range_inprocess
+
+LOC = (4.711, -74.0721, 0.0, "Earth")
+
+
+class TestEphemerisCacheStore(unittest.TestCase):
+    def test_jd_quantized_to_tolerance(self):
+        cache = EphemerisCache(jd_tolerance_s=1.0)
+        cache.put("Moon", 2460000.5, LOC, {"ra": 1.0, "dec": 2.0})
+        self.assertEqual(cache.get("Moon", 2460000.5 + 0.3 / 86400, LOC), {"ra": 1.0, "dec": 2.0})
+        self.assertIsNone(cache.get("Moon", 2460000.5 + 5.0 / 86400, LOC))
+        self.assertIsNone(cache.get("Moon", 2460000.5, (4.711, -74.0, 0.0, "Earth")))
+        self.assertIsNone(cache.get("Sun", 2460000.5, LOC))
+        self.assertEqual((cache.stats.hits, cache.stats.misses), (1, 3))
+
+    def test_lru_eviction_falls_back_to_disk(self):
+        with tempfile.TemporaryDirectory() as td:
+            db = Path(td) / "eph.sqlite"
+            with EphemerisCache(db, lru_size=2) as cache:
+                for i in range(3):
+                    cache.put("Sun", 2460000.5 + i, LOC, {"ra": float(i)})
+                self.assertEqual(len(cache._lru), 2)
+                self.assertEqual(cache.get("Sun", 2460000.5, LOC), {"ra": 0.0})
+                self.assertEqual(cache.stats.disk_hits, 1)
+            with EphemerisCache(db) as reopened:
+                self.assertEqual(reopened.get("Sun", 2460002.5, LOC), {"ra": 2.0})
+                self.assertEqual(reopened.stats.disk_hits, 1)
+            with EphemerisCache(db, jd_tolerance_s=60.0) as other_tol:
+                self.assertIsNone(other_tol.get("Sun", 2460002.5, LOC))
+
+
+class TestCachingClient(unittest.TestCase):
+    def setUp(self):
+        self.mock = MockStellarium().start()
+        self.client = StellariumRemoteControlClient(StellariumRCConfig(port=self.mock.port, retries=0))
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db = Path(self.tmp.name) / "eph.sqlite"
+
+    def tearDown(self):
+        self.client.close()
+        self.mock.stop()
+        self.tmp.cleanup()
+
+    def _run(self, cache):
+        c = CachingStellariumClient(self.client, cache)
+        return list(iter_range_inprocess(
+            dt.date(2025, 1, 1), dt.date(2025, 1, 10),
+            tz="-05:00", lat=4.711, lon=-74.0721, name="Bogota", country="CO", client=c,
+        ))
+
+    def test_rerun_makes_no_stellarium_requests(self):
+        with EphemerisCache(self.db) as cache:
+            first = self._run(cache)
+        self.assertEqual(self.mock.requests[("GET", "/api/objects/info")], 20)
+        self.mock.requests.clear()
+
+        with EphemerisCache(self.db) as cache:
+            second = self._run(cache)
+            self.assertEqual(cache.stats.misses, 0)
+            self.assertEqual(cache.stats.disk_hits, 20)
+        self.assertEqual(sum(self.mock.requests.values()), 0)
+        self.assertEqual(first, second)
+
+    def test_warm_then_report_is_all_hits(self):
+        from tsurphu.scripts.ephemeris_snapshot import jd_from_datetime
+
+        tz = dt.timezone(dt.timedelta(hours=-5))
+        jds = [jd_from_datetime(dt.datetime(2025, 1, d, 6, 0, tzinfo=tz)) for d in range(1, 11)]
+        with EphemerisCache(self.db) as cache:
+            fetched = cache.warm(self.client, jds, ("Sun", "Moon"), latitude=4.711, longitude=-74.0721)
+            self.assertEqual(fetched, 20)
+            self.assertEqual(cache.warm(self.client, jds, ("Sun", "Moon"), latitude=4.711, longitude=-74.0721), 0)
+            self.mock.requests.clear()
+            rows = self._run(cache)
+        self.assertTrue(all(r["meta"]["ok"] for r in rows))
+        self.assertEqual(sum(self.mock.requests.values()), 0)
+
+
+class TestCachingClientNeedsFocus(unittest.TestCase):
+    def test_replies_without_radec_are_not_cached(self):
+        with MockStellarium(requires_focus=True) as m, EphemerisCache() as cache:
+            client = StellariumRemoteControlClient(StellariumRCConfig(port=m.port, retries=0))
+            self.addCleanup(client.close)
+            c = CachingStellariumClient(client, cache, focus=False)
+            c.set_location(latitude=LOC[0], longitude=LOC[1])
+            c.set_time_jd(2460000.5, 0)
+            self.assertNotIn("ra", c.object_info("Moon"))
+            self.assertEqual(cache.stats.stores, 0)
+
+            m.requires_focus = False
+            self.assertIn("ra", c.object_info("Moon"))
+            self.assertEqual(cache.stats.stores, 1)
+
+    def test_batch_replies_without_radec_are_not_cached(self):
+        client = mock.Mock()
+        client.object_info_many.return_value = {"Sun": {"name": "Sun"}, "Moon": {"name": "Moon", "ra": 1.0, "dec": 2.0}}
+        with EphemerisCache() as cache:
+            c = CachingStellariumClient(client, cache)
+            c.set_location(latitude=LOC[0], longitude=LOC[1])
+            c.set_time_jd(2460000.5, 0)
+            c.object_info_many(["Sun", "Moon"])
+            self.assertEqual(cache.stats.stores, 1)
+            self.assertIsNone(cache.get("Sun", 2460000.5, LOC))
+
+
+class TestSnapshotScriptCache(unittest.TestCase):
+    def setUp(self):
+        self.mock = MockStellarium().start()
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.addCleanup(self.mock.stop)
+        self.db = Path(tmp.name) / "eph.sqlite"
+
+    def _main(self):
+        argv = ["ephemeris_snapshot", "--dt", "2025-01-01T06:00:00-05:00", "--cache", str(self.db)]
+        client = lambda: StellariumRemoteControlClient(StellariumRCConfig(port=self.mock.port, retries=0))
+        out = io.StringIO()
+        with mock.patch.object(ephemeris_snapshot, "C", client), mock.patch("sys.argv", argv), \
+                contextlib.redirect_stdout(out):
+            ephemeris_snapshot.main()
+        return json.loads(out.getvalue())
+
+    def test_cached_run_keeps_stellarium_time(self):
+        first = self._main()
+        self.assertEqual(self.mock.requests[("GET", "/api/objects/info")], 2)
+        self.mock.requests.clear()
+        second = self._main()
+        self.assertEqual(sum(self.mock.requests.values()), 0)  # rerun en caliente: sin tráfico
+        self.assertEqual(first["stellarium_time"], {"jday": self.mock.jd, "timerate": 0})
+        self.assertEqual(second["stellarium_time"], first["stellarium_time"])
+        self.assertEqual((first["sun"], first["moon"]), (second["sun"], second["moon"]))
+
+    def test_cache_is_closed_on_error(self):
+        self.mock.alive = False  # status -> 503
+        with mock.patch.object(EphemerisCache, "close", autospec=True, side_effect=EphemerisCache.close) as close:
+            with self.assertRaises(StellariumRCError):
+                self._main()
+        close.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from governance import ledger as ledger_mod
+from governance.ledger import index_path_for, load_ledger
+
+REPO_LEDGER = Path(__file__).resolve().parents[1] / "docs" / "object-ledger.csv"
+
+
+class TestLedger(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.csv = Path(self.tmp.name) / "docs" / "object-ledger.csv"
+        self.csv.parent.mkdir()
+        shutil.copyfile(REPO_LEDGER, self.csv)
+        self.cache = Path(self.tmp.name) / "cache"
+        ledger_mod._LEDGERS.clear()
+
+    def tearDown(self):
+        ledger_mod._LEDGERS.clear()
+        self.tmp.cleanup()
+
+    def _append(self, text):
+        st = self.csv.stat()
+        with self.csv.open("a", encoding="utf-8", newline="") as f:
+            f.write(text)
+        os.utime(self.csv, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+    def _load(self):
+        return load_ledger(self.csv, cache_dir=self.cache)
+
+    def test_lookups_and_secondary_indexes(self):
+        led = self._load()
+        self.assertEqual(led.errors, [])
+        self.assertEqual(led.get("TSU-OBJ-0021")["Ruta"], "/src/audit/audit-log.jsonl")
+        self.assertIn("TSU-OBJ-0001", led)
+        self.assertNotIn("TSU-OBJ-9999", led)
+        self.assertEqual([r["ObjectID"] for r in led.find(owner="Zakik", sensitivity="P2")],
+                         ["TSU-OBJ-0016", "TSU-OBJ-0017"])
+        self.assertEqual(len(led.find(stratum="7x-L7")), 4)
+        self.assertEqual(led.missing(["TSU-OBJ-0001", "TSU-OBJ-0101"]), ["TSU-OBJ-0101"])
+
+    def test_index_persisted_and_reused(self):
+        self._load()
+        self.assertTrue(index_path_for(self.csv, self.cache).exists())
+        self.assertEqual(sorted(p.name for p in self.csv.parent.iterdir()), ["object-ledger.csv"])
+        ledger_mod._LEDGERS.clear()
+        real_build = ledger_mod.Ledger.build
+        ledger_mod.Ledger.build = classmethod(lambda cls, *a: self.fail("no debía reparsear"))
+        try:
+            led = self._load()
+        finally:
+            ledger_mod.Ledger.build = real_build
+        self.assertEqual(len(led), 6)
+
+    def test_append_is_incremental_and_keeps_error_lines(self):
+        self._load()
+        ledger_mod._LEDGERS.clear()
+        self._append("TSU-OBJ-0030,Nuevo,7x-L2,Engineer,leer,P3,doc,/docs/x.md\n"
+                     "TSU-OBJ-0001,Dup,7x-L7,Zakik,editar,P1,doc,/docs/master.md\n")
+        led = self._load()
+        self.assertTrue(led.incremental)
+        self.assertEqual(led.get("TSU-OBJ-0030")["Estrato_7x"], "7x-L2")
+        self.assertEqual(led.errors, ["Ledger L9: duplicado TSU-OBJ-0001"])
+        ledger_mod._LEDGERS.clear()
+        self.assertEqual(self._load().errors, led.errors)
+
+    def test_edit_in_place_rebuilds(self):
+        self._load()
+        text = self.csv.read_text(encoding="utf-8-sig").replace("Modo Ritual,7x-L1", "Modo Ritual,7x-L3")
+        self.csv.write_text(text + ",sin id,7x-L1,Zakik,leer,P2,doc,/x\n", encoding="utf-8")
+        led = self._load()
+        self.assertFalse(led.incremental)
+        self.assertEqual(led.get("TSU-OBJ-0017")["Estrato_7x"], "7x-L3")
+        self.assertEqual(led.errors, ["Ledger L8: ObjectID vacío"])
+
+    def test_wrong_columns_still_checks_rows(self):
+        self.csv.write_text("ObjectID,Nombre\nA,B\n,C\n\nA,D\n", encoding="utf-8")
+        self.assertEqual(self._load().errors,
+                         ["Ledger: columnas incorrectas", "Ledger L3: ObjectID vacío", "Ledger L4: duplicado A"])
+
+    def test_unwritable_cache_is_not_an_error(self):
+        self.cache.write_text("", encoding="utf-8")  # un archivo donde iría el directorio
+        led = self._load()
+        self.assertEqual((led.errors, len(led)), ([], 6))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+import contextlib
+import datetime as dt
+import io
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from engines.losar import build_losar_index, date_key, load_losar_index, losar_date, tibetan_year_numbers
+from engines.tibetan_year import np, tibetan_year, tibetan_years_for_dates
+from orchestration import cli
+
+# Losar Phugpa publicados
+KNOWN_LOSAR = """
+1998-02-27 1999-02-17 2000-02-06 2001-02-24 2002-02-13 2003-03-03 2004-02-21 2005-02-09
+2006-02-28 2007-02-18 2008-02-07 2009-02-25 2010-02-14 2011-03-05 2012-02-22 2013-02-11
+2014-03-02 2015-02-19 2016-02-09 2017-02-27 2018-02-16 2019-02-05 2020-02-24 2021-02-12
+2022-03-03 2023-02-21 2024-02-10 2025-02-28 2026-02-18
+""".split()
+
+
+class TestLosar(unittest.TestCase):
+    def setUp(self):
+        self.index = load_losar_index()
+        self.backends = ["array"] + (["numpy"] if np is not None else [])
+
+    def test_known_dates(self):
+        for iso in KNOWN_LOSAR:
+            d = dt.date.fromisoformat(iso)
+            self.assertEqual(losar_date(d.year), d)
+            self.assertEqual(self.index.losar(d.year), d)
+
+    def test_index_is_sorted_over_centuries(self):
+        i = self.index
+        self.assertLessEqual(i.first_year, 1700)
+        self.assertGreaterEqual(i.last_year, 2300)
+        self.assertEqual(i.keys, sorted(i.keys))
+        for y in range(i.first_year, i.last_year + 1):
+            self.assertTrue(dt.date(y, 1, 15) <= i.losar(y) <= dt.date(y, 3, 20), y)
+
+    def test_year_changes_at_losar(self):
+        self.assertEqual(self.index.year_of("2026-02-17"), 2025)
+        self.assertEqual(self.index.year_of("2026-02-18"), 2026)
+        self.assertEqual(self.index.year_of(dt.date(2026, 1, 1)), 2025)
+        self.assertEqual(self.index.year_of(dt.datetime(2026, 12, 31, 23, 59)), 2026)
+        self.assertEqual(self.index.year_of("2026-02-18T00:30:00-05:00"), 2026)
+
+        before, after = tibetan_year(dt.date(2026, 2, 17)), tibetan_year(dt.date(2026, 2, 18))
+        self.assertEqual((before.gregorian_year, before.element, before.animal), (2025, "Wood", "Snake"))
+        self.assertEqual(after, tibetan_year(2026))
+
+    def test_last_indexed_year_is_closed(self):
+        last = self.index.last_year
+        self.assertEqual(self.index.year_of(dt.date(last + 1, 1, 10)), last)
+        for bad in (dt.date(self.index.first_year, 1, 1), dt.date(last + 1, 12, 31)):
+            with self.assertRaises(ValueError):
+                self.index.year_of(bad)
+
+    def test_invalid_dates(self):
+        for bad in ("2026-2-18", "18/02/2026", "", None, 20260218):
+            with self.assertRaises(ValueError):
+                date_key(bad)
+
+    def test_impossible_dates(self):
+        bad = ("2025-02-30", "2025-13-45", "2025-00-10", "2025-04-31", "2025-02-29", "2100-02-29", "2025-01-00")
+        self.assertEqual(date_key("2024-02-29"), 20240229)
+        self.assertEqual(date_key("2000-02-29T12:00"), 20000229)
+        for value in bad:
+            with self.assertRaises(ValueError):
+                date_key(value)
+            with self.assertRaises(ValueError):
+                self.index.year_of(value)
+        for backend in self.backends:
+            self.assertEqual(list(tibetan_year_numbers(["2024-02-29", "2000-02-29"], backend=backend)), [2024, 2000])
+            for value in bad:
+                with self.assertRaises(ValueError, msg=(backend, value)):
+                    tibetan_year_numbers(["2026-02-18", value], backend=backend)
+
+    def test_batch_matches_scalar(self):
+        start = dt.date(1950, 1, 1)
+        dates = [start + dt.timedelta(days=d) for d in range(0, 30000, 7)]
+        expected = [self.index.year_of(d) for d in dates]
+        for backend in self.backends:
+            self.assertEqual(list(tibetan_year_numbers(dates, backend=backend)), expected)
+            isos = [d.isoformat() for d in dates]
+            self.assertEqual(list(tibetan_year_numbers(isos, backend=backend)), expected)
+            cols = tibetan_years_for_dates(isos, backend=backend)
+            self.assertEqual([ty.gregorian_year for ty in cols], expected)
+            self.assertEqual(cols.row(0), tibetan_year(dates[0]))
+            with self.assertRaises(ValueError):
+                tibetan_year_numbers(["2026-02-18", "2026-2-18"], backend=backend)
+            with self.assertRaises(ValueError):
+                tibetan_year_numbers(["1200-01-01"], backend=backend)
+
+    def test_lookup_file_overrides_computed_dates(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            lookups = Path(tmp)
+            (lookups / "losar_dates.csv").write_text("year,losar\n2026,2026-02-19\n", encoding="utf-8")
+            index = load_losar_index(lookups)
+            self.assertEqual(index.source, "phugpa+lookup")
+            self.assertEqual(index.losar(2026), dt.date(2026, 2, 19))
+            self.assertEqual(index.losar(2025), losar_date(2025))
+            self.assertEqual(tibetan_year(dt.date(2026, 2, 18), lookups_dir=lookups).gregorian_year, 2025)
+
+        with self.assertRaises(ValueError):
+            build_losar_index(2000, 2010, overrides={2005: dt.date(2004, 12, 31)})
+
+    def test_cli_accepts_date(self):
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            rc = cli.main(["tibetan-year", "2026-02-17", "--json"])
+        self.assertEqual(rc, 0)
+        self.assertEqual(json.loads(out.getvalue())["gregorian_year"], 2025)
+
+    def test_cli_date_outside_the_index(self):
+        err = io.StringIO()
+        with contextlib.redirect_stderr(err):
+            rc = cli.main(["tibetan-year", "1200-05-01"])
+        self.assertEqual(rc, 2)
+        self.assertIn("tibetan-year: 1200-05-01 fuera del índice de Losar", err.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,130 @@
+import contextlib
+import datetime as dt
+import io
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from tests.stellarium_mock import MockStellarium
+from tsurphu.integraciones.stellarium_rc import StellariumRCConfig, StellariumRemoteControlClient
+from tsurphu.scripts import lunar_range_report
+from tsurphu.scripts.lunar_range_report import iter_range_inprocess
+
+
+class TestLunarRangeInProcess(unittest.TestCase):
+    def setUp(self):
+        self.mock = MockStellarium().start()
+        self.client = StellariumRemoteControlClient(
+            StellariumRCConfig(port=self.mock.port, retries=0)
+        )
+
+    def tearDown(self):
+        self.client.close()
+        self.mock.stop()
+
+    def _rows(self, start, end):
+        return iter_range_inprocess(
+            dt.date.fromisoformat(start), dt.date.fromisoformat(end),
+            tz="-05:00", lat=4.711, lon=-74.0721, name="Bogota", country="CO", client=self.client,
+        )
+
+    def test_one_session_location_set_once(self):
+        rows = list(self._rows("2025-01-01", "2025-01-07"))
+        self.assertEqual([r["meta"]["date"] for r in rows], [f"2025-01-0{i}" for i in range(1, 8)])
+        self.assertTrue(all(r["meta"]["ok"] for r in rows))
+        self.assertTrue(all(1 <= r["tithi"]["tithi"] <= 30 for r in rows))
+        self.assertEqual(self.mock.requests[("POST", "/api/location/setlocationfields")], 1)
+        self.assertEqual(self.mock.requests[("POST", "/api/main/time")], 7)
+        self.assertEqual(self.mock.requests[("GET", "/api/objects/info")], 14)
+        self.assertEqual(self.mock.requests[("POST", "/api/main/focus")], 0)
+        self.assertEqual(self.client._transport.connections_opened, 1)
+
+    def test_rows_are_streamed(self):
+        it = self._rows("2025-01-01", "2025-12-31")
+        first = next(it)
+        self.assertEqual(first["meta"]["date"], "2025-01-01")
+        self.assertEqual(self.mock.requests[("POST", "/api/main/time")], 1)
+
+    def test_failed_day_is_structured_error_row(self):
+        it = self._rows("2025-01-01", "2025-01-03")
+        self.assertTrue(next(it)["meta"]["ok"])
+        self.mock.fail_next_gets = 2  # el primer corte se toma como socket keep-alive viejo
+        err = next(it)
+        self.assertEqual(err["meta"], {"date": "2025-01-02", "ok": False})
+        self.assertEqual(err["error"]["type"], "StellariumRCError")
+        self.assertTrue(next(it)["meta"]["ok"])
+
+
+class TestLunarRangeStreamingOutput(unittest.TestCase):
+    def setUp(self):
+        self.mock = MockStellarium().start()
+        self._tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self._tmp.name)
+
+    def tearDown(self):
+        self.mock.stop()
+        self._tmp.cleanup()
+
+    def _main(self, *extra):
+        return lunar_range_report.main([
+            "--tz=-05:00", "--lat", "4.711", "--lon", "-74.0721",
+            "--port", str(self.mock.port), *extra,
+        ])
+
+    def _dates(self, path):
+        return [json.loads(line)["meta"]["date"] for line in path.read_text(encoding="utf-8").splitlines()]
+
+    def test_resume_from_checkpoint(self):
+        out, ck = self.dir / "out.jsonl", self.dir / "ck.json"
+        args = ["--out", str(out), "--resume-from", str(ck)]
+        self.assertEqual(self._main("--start", "2025-01-01", "--end", "2025-01-03", *args), 0)
+        self.assertEqual(self._dates(out), ["2025-01-01", "2025-01-02", "2025-01-03"])
+
+        # Crash simulado: quedó media fila escrita después del último checkpoint
+        with out.open("a", encoding="utf-8") as f:
+            f.write('{"meta": {"date": "2025-01-0')
+        self.assertEqual(self._main("--start", "2025-01-01", "--end", "2025-01-05", *args), 0)
+        self.assertEqual(self._dates(out), [f"2025-01-0{i}" for i in range(1, 6)])
+        self.assertEqual(self.mock.requests[("POST", "/api/main/time")], 5)
+
+    def test_json_array_is_valid(self):
+        out = self.dir / "out.json"
+        self._main("--start", "2025-01-01", "--end", "2025-01-04", "--format", "json", "--out", str(out))
+        doc = json.loads(out.read_text(encoding="utf-8"))
+        self.assertEqual(len(doc["rows"]), 4)
+        self.assertEqual(doc["meta"]["start"], "2025-01-01")
+
+    def test_resume_does_not_clobber_output_without_offset(self):
+        out, ck = self.dir / "out.jsonl", self.dir / "ck.json"
+        self.assertEqual(self._main("--start", "2025-01-01", "--end", "2025-01-02", "--out", str(out),
+                                    "--resume-from", str(ck)), 0)
+        data = json.loads(ck.read_text(encoding="utf-8"))
+        data["offset"] = None  # como el de una corrida a stdout (pipe, no seekable)
+        ck.write_text(json.dumps(data), encoding="utf-8")
+        before = out.read_bytes()
+        with contextlib.redirect_stderr(io.StringIO()), self.assertRaises(SystemExit) as cm:
+            self._main("--start", "2025-01-01", "--end", "2025-01-04", "--out", str(out), "--resume-from", str(ck))
+        self.assertEqual(cm.exception.code, 2)
+        self.assertEqual(out.read_bytes(), before)
+
+    def test_error_rows_are_retried_on_resume(self):
+        out, ck = self.dir / "out.jsonl", self.dir / "ck.json"
+        args = ["--out", str(out), "--resume-from", str(ck)]
+        self.assertEqual(self._main("--start", "2025-01-01", "--end", "2025-01-02", *args), 0)
+
+        self.mock.fail_next_gets = 4  # 2025-01-03 falla: agota los 3 intentos + el reintento keep-alive
+        self.assertEqual(self._main("--start", "2025-01-01", "--end", "2025-01-05", *args), 0)
+        rows = [json.loads(line) for line in out.read_text(encoding="utf-8").splitlines()]
+        self.assertEqual([r["meta"]["ok"] for r in rows], [True, True, False, True, True])
+        self.assertEqual(json.loads(ck.read_text(encoding="utf-8"))["last_date"], "2025-01-02")
+
+        self.assertEqual(self._main("--start", "2025-01-01", "--end", "2025-01-05", *args), 0)
+        rows = [json.loads(line) for line in out.read_text(encoding="utf-8").splitlines()]
+        self.assertEqual([r["meta"]["date"] for r in rows], [f"2025-01-0{i}" for i in range(1, 6)])
+        self.assertTrue(all(r["meta"]["ok"] for r in rows))
+        self.assertEqual(json.loads(ck.read_text(encoding="utf-8"))["last_date"], "2025-01-05")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import datetime as dt
+import unittest
+
+from engines.rules import seed as seed_mod
+
+if seed_mod.yaml is not None:
+    from engines.rules import (
+        AVOID, FAVORABLE, NEUTRAL, UNFAVORABLE, VERDICT_CODES, SeedError, day_context, element_relation,
+        load_rule_engine, load_seed,
+    )
+    from engines.rules.engine import RuleEngine
+    from engines.tibetan_year import ANIMALS, ELEMENTS, np
+
+THURSDAY = dt.date(2026, 10, 15)
+
+
+@unittest.skipIf(seed_mod.yaml is None, "PyYAML no instalado")
+class TestRuleEngine(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.engine = load_rule_engine()
+
+    def test_day_context(self):
+        ctx = day_context(dt.date(2000, 1, 1))  # Earth Horse
+        self.assertEqual((ANIMALS[ctx.animal], ELEMENTS[ctx.element], ctx.weekday), ("Horse", "Earth", 5))
+
+    def test_element_relations(self):
+        wood = ELEMENTS.index("Wood")
+        rel = {ELEMENTS[d]: element_relation(wood, d) for d in range(5)}
+        self.assertEqual(rel, {"Wood": "same", "Water": "mother", "Fire": "child", "Earth": "friend", "Metal": "enemy"})
+
+    def test_weekday_layer(self):
+        e = self.engine
+        self.assertEqual(e.evaluate("marriage", THURSDAY, "Wood", "low").verdict, FAVORABLE)
+        self.assertEqual(e.evaluate("funeral", THURSDAY, "Wood", "low").verdict, AVOID)
+        self.assertEqual(e.evaluate("marriage", THURSDAY + dt.timedelta(days=1), "Wood", "low").verdict, NEUTRAL)
+
+    def test_animal_layer_only_from_medium(self):
+        d = next(THURSDAY + dt.timedelta(days=i) for i in range(60)
+                 if ANIMALS[day_context(THURSDAY + dt.timedelta(days=i)).animal] == "Tiger")
+        self.assertEqual(self.engine.evaluate("public_deeds", d, "Earth", "low").verdict, NEUTRAL)
+        self.assertEqual(self.engine.evaluate("public_deeds", d, "Earth", "medium").verdict, AVOID)
+
+    def test_element_layer_and_avoid_dominates(self):
+        e = self.engine
+        ctx = day_context(THURSDAY)
+        enemy = next(p for p in range(5) if element_relation(p, ctx.element) == "enemy")
+        mother = next(p for p in range(5) if element_relation(p, ctx.element) == "mother")
+        # favorable por día de la semana + relación enemiga = señales mixtas
+        self.assertEqual(e.evaluate("marriage", THURSDAY, enemy, "medium").verdict, NEUTRAL)
+        self.assertEqual(e.evaluate("digging", THURSDAY, enemy, "medium").verdict, UNFAVORABLE)
+        r = e.evaluate("funeral", THURSDAY, mother, "high")
+        self.assertEqual((r.verdict, r.conflict, r.divination, r.relation_weight), (AVOID, True, True, 2))
+
+    def test_batch_matches_scalar(self):
+        days = [dt.date(2025, 1, 1) + dt.timedelta(days=i) for i in range(400)]
+        backends = ["array"] + (["numpy"] if np is not None else [])
+        for backend in backends:
+            masks = self.engine.score_days(days, "Fire", "high", backend=backend)
+            for action in ("marriage", "public_deeds", "war_army", "digging"):
+                expected = [VERDICT_CODES[self.engine.evaluate(action, d, "Fire", "high").verdict] for d in days]
+                self.assertEqual(list(masks.verdict_codes(action)), expected, (backend, action))
+        self.assertEqual(len(masks.matrix()), len(self.engine.actions))
+
+    def test_unknown_action_in_rules_fails_compile(self):
+        seed = load_seed()
+        seed.weekday_profiles["thursday"]["avoid"].append("no_such_action")
+        with self.assertRaises(SeedError):
+            RuleEngine(seed)
+
+    def test_unknown_action_query(self):
+        masks = self.engine.score_days([dt.date(2025, 1, 1)], "Fire")
+        for query in (lambda: self.engine.evaluate("no_such_action", dt.date(2025, 1, 1), "Fire"),
+                      lambda: masks.verdict_codes("no_such_action")):
+            with self.assertRaises(ValueError) as cm:
+                query()
+            self.assertIn("'no_such_action'", str(cm.exception))
+
+    def test_element_order_is_checked_once(self):
+        seed = load_seed()
+        seed.elements = list(reversed(seed.elements))
+        with self.assertRaisesRegex(SeedError, "elements.yaml"):
+            RuleEngine(seed)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+import contextlib
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from engines.rules import seed as seed_mod
+
+if seed_mod.yaml is not None:
+    from engines.rules import SEED_DIR, load_seed
+    from engines.rules.seed import SEED_FILES
+    from engines.rules.snapshot import (
+        SeedQualityError,
+        compile_seed,
+        load_seed_snapshot,
+        read_snapshot,
+        source_stamps,
+    )
+    from orchestration.cli import main
+
+
+@unittest.skipIf(seed_mod.yaml is None, "PyYAML no instalado")
+class TestSeedSnapshot(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.seed = Path(tmp.name) / "seed"
+        shutil.copytree(SEED_DIR, self.seed)
+        self.snap = Path(tmp.name) / "seed.snapshot"
+
+    def _edit(self, rel, old, new):
+        p = self.seed / rel
+        text = p.read_text(encoding="utf-8")
+        self.assertIn(old, text)
+        p.write_text(text.replace(old, new, 1), encoding="utf-8")
+
+    def test_round_trip_matches_yaml(self):
+        compiled = compile_seed(self.seed, self.snap)
+        self.assertTrue(compiled.compiled)
+        loaded = load_seed_snapshot(self.seed, self.snap)
+        self.assertFalse(loaded.compiled)
+        self.assertEqual(loaded.source_hash, compiled.source_hash)
+
+        direct = load_seed(self.seed)
+        for name in ("actions", "elements", "relation_weights", "weekday_profiles", "animal_day_avoid",
+                     "depth_by_importance", "rule_avoid_dominates", "rule_divination_on_strong_conflict"):
+            self.assertEqual(getattr(loaded.rule_seed, name), getattr(direct, name), name)
+        self.assertEqual(set(loaded.documents), {p.as_posix() for p in SEED_FILES})
+
+    def test_recompiles_only_when_content_changes(self):
+        first = compile_seed(self.seed, self.snap)
+
+        # mtime distinto, mismo contenido: el hash coincide y no se recompila
+        p = self.seed / "7x-2_ontology" / "actions.yaml"
+        st = p.stat()
+        os.utime(p, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+        self.assertFalse(load_seed_snapshot(self.seed, self.snap).compiled)
+        # ...y el snapshot queda con los stamps nuevos: la próxima carga no re-hashea
+        self.assertEqual([tuple(s) for s in read_snapshot(self.snap)["stamps"]], source_stamps(self.seed))
+
+        self._edit("7x-3_rules/precedence.yaml", "schema_version: 1", "schema_version: 1\n# editado")
+        again = load_seed_snapshot(self.seed, self.snap)
+        self.assertTrue(again.compiled)
+        self.assertNotEqual(again.source_hash, first.source_hash)
+        self.assertEqual(read_snapshot(self.snap)["source_hash"], again.source_hash)
+
+    def test_runtime_load_ignores_other_seed_files(self):
+        # Un problema de calidad fuera de SEED_FILES bloquea `seed compile`, no la carga en runtime
+        self._edit("7x-2_ontology/divination.yaml", "source_id: white_beryl_elemental_divination", "source_id: apocrifo")
+        loaded = load_seed_snapshot(self.seed, self.snap)
+        self.assertTrue(loaded.compiled)
+        self.assertEqual(loaded.rule_seed.actions, load_seed(self.seed).actions)
+        with self.assertRaises(SeedQualityError):
+            compile_seed(self.seed, self.snap)
+        self.assertFalse(load_seed_snapshot(self.seed, self.snap).compiled)
+
+    def test_unwritable_cache_compiles_in_memory(self):
+        # El "directorio" del snapshot es un archivo: cualquier escritura da OSError, también como root
+        blocker = self.snap.parent / "cache"
+        blocker.write_text("", encoding="utf-8")
+        snap = load_seed_snapshot(self.seed, blocker / "seed.snapshot")
+        self.assertTrue(snap.compiled)
+        self.assertEqual(snap.rule_seed.actions, load_seed(self.seed).actions)
+        with self.assertRaises(OSError):
+            compile_seed(self.seed, blocker / "seed.snapshot")
+
+    def test_corrupt_snapshot_is_rebuilt(self):
+        self.snap.write_bytes(b"basura")
+        self.assertTrue(load_seed_snapshot(self.seed, self.snap).compiled)
+
+    def test_unknown_action_id(self):
+        self._edit("7x-3_rules/day_profiles_key.yaml", "- become_monk", "- become_pope")
+        with self.assertRaises(SeedQualityError) as cm:
+            compile_seed(self.seed, self.snap)
+        self.assertTrue(any("'become_pope'" in p for p in cm.exception.problems))
+        self.assertFalse(self.snap.exists())
+
+    def test_evidence_needs_known_source_and_locator(self):
+        self._edit("7x-2_ontology/elements.yaml", "source_id: norbu_key_tibetan_calendar", "source_id: apocrifo")
+        self._edit("7x-3_rules/precedence.yaml", "    locator_hint:", "    nota:")
+        with self.assertRaises(SeedQualityError) as cm:
+            compile_seed(self.seed, self.snap)
+        problems = "\n".join(cm.exception.problems)
+        self.assertIn("source_id desconocido 'apocrifo'", problems)
+        self.assertIn("7x-3_rules/precedence.yaml.evidence[0]: evidencia sin locator", problems)
+
+    def test_rule_without_evidence_is_a_warning(self):
+        snap = compile_seed(self.seed, self.snap)
+        self.assertEqual(snap.warnings, ("7x-3_rules/day_profiles_key.yaml: regla sin evidence (source_id + locator)",))
+        err = io.StringIO()
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(err):
+            rc = main(["seed", "compile", "--seed-dir", str(self.seed), "--out", str(self.snap)])
+        self.assertEqual(rc, 0)
+        self.assertIn("warning: 7x-3_rules/day_profiles_key.yaml", err.getvalue())
+
+    def test_cli_seed_compile(self):
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            rc = main(["seed", "compile", "--seed-dir", str(self.seed), "--out", str(self.snap)])
+        self.assertEqual(rc, 0)
+        self.assertIsNotNone(read_snapshot(self.snap))
+
+        self._edit("7x-3_rules/day_profiles_key.yaml", "- become_monk", "- become_pope")
+        err = io.StringIO()
+        with contextlib.redirect_stderr(err):
+            rc = main(["seed", "compile", "--seed-dir", str(self.seed), "--out", str(self.snap)])
+        self.assertEqual(rc, 2)
+        self.assertIn("become_pope", err.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import asyncio
+import unittest
+
+from tests.stellarium_mock import MockStellarium
+from tsurphu.integraciones.stellarium_rc import StellariumRCConfig, StellariumRCError
+from tsurphu.integraciones.stellarium_rc_async import AsyncStellariumRemoteControlClient
+
+
+class TestAsyncStellariumClient(unittest.TestCase):
+    def setUp(self):
+        self.mock = MockStellarium(latency_s=0.005).start()
+        self.config = StellariumRCConfig(port=self.mock.port, timeout_s=2.0)
+
+    def tearDown(self):
+        self.mock.stop()
+
+    def _run(self, coro):
+        return asyncio.run(coro)
+
+    def test_high_level_methods(self):
+        async def go():
+            async with AsyncStellariumRemoteControlClient(self.config) as c:
+                await c.set_location(4.711, -74.0721, name="Bogota", country="CO")
+                await c.set_time_jd(2460000.5, 0)
+                await c.focus("Moon")
+                st = await c.status()
+                info = await c.object_info("Moon")
+                found = await c.object_find("mo")
+                return st, info, found, await c.ping()
+
+        st, info, found, ok = self._run(go())
+        self.assertEqual(st["time"]["jday"], 2460000.5)
+        self.assertEqual(st["selectioninfo"], "Moon")
+        self.assertEqual(info["ra"], self.mock.body_radec("Moon", 2460000.5)[0])
+        self.assertEqual(found, ["Moon"])
+        self.assertTrue(ok)
+
+    def test_concurrency_limit(self):
+        async def go():
+            async with AsyncStellariumRemoteControlClient(self.config, max_concurrency=3) as c:
+                await asyncio.gather(*(c.object_find("s") for _ in range(30)))
+                return c.connections_opened
+
+        opened = self._run(go())
+        self.assertLessEqual(self.mock.max_in_flight, 3)
+        self.assertLessEqual(opened, 3)
+        self.assertEqual(self.mock.requests[("GET", "/api/objects/find")], 30)
+
+    def test_state_sections_are_serialized(self):
+        jds = [2460000.5 + i for i in range(12)]
+
+        async def go():
+            async with AsyncStellariumRemoteControlClient(self.config, max_concurrency=6) as c:
+                return await asyncio.gather(
+                    *(c.query_at(jd, ["Sun", "Moon"], location=(4.711, -74.0721, 0.0)) for jd in jds)
+                )
+
+        results = self._run(go())
+        for jd, res in zip(jds, results):
+            self.assertEqual(res["Sun"]["jd"], jd)
+            self.assertEqual(res["Moon"]["jd"], jd)
+        # La ubicación no cambia entre secciones: se fija una sola vez
+        self.assertEqual(self.mock.requests[("POST", "/api/location/setlocationfields")], 1)
+
+    def test_per_request_timeout(self):
+        self.mock.latency_s = 0.5
+        config = StellariumRCConfig(port=self.mock.port, timeout_s=0.05)
+
+        async def go():
+            async with AsyncStellariumRemoteControlClient(config) as c:
+                await c.status()
+
+        with self.assertRaises(StellariumRCError):
+            self._run(go())
+
+
+if __name__ == "__main__":
+    unittest.main()
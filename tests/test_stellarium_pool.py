@@ -0,0 +1,74 @@
+import datetime as dt
+import io
+import json
+import unittest
+from contextlib import redirect_stdout
+
+from tests.stellarium_mock import MockStellarium
+from tsurphu.integraciones.stellarium_pool import StellariumPool
+from tsurphu.integraciones.stellarium_rc import StellariumRCConfig, StellariumRemoteControlClient
+from tsurphu.scripts.lunar_range_report import iter_range_inprocess, iter_range_pool, main
+
+KW = dict(tz="-05:00", lat=4.711, lon=-74.0721, name="Bogota", country="CO")
+
+
+class TestStellariumPool(unittest.TestCase):
+    def setUp(self):
+        self.mocks = [MockStellarium(latency_s=0.002).start() for _ in range(3)]
+        self.configs = [StellariumRCConfig(port=m.port, retries=0, timeout_s=2.0) for m in self.mocks]
+
+    def tearDown(self):
+        for m in self.mocks:
+            m.stop()
+
+    def _reference(self, d0, d1):
+        m = MockStellarium().start()
+        try:
+            with StellariumRemoteControlClient(StellariumRCConfig(port=m.port)) as c:
+                return list(iter_range_inprocess(d0, d1, client=c, **KW))
+        finally:
+            m.stop()
+
+    def test_rows_match_single_instance_and_work_is_sharded(self):
+        d0, d1 = dt.date(2025, 1, 1), dt.date(2025, 1, 30)
+        with StellariumPool(self.configs) as pool:
+            rows = list(iter_range_pool(d0, d1, pool=pool, **KW))
+            done = [w.jobs_done for w in pool.workers]
+        self.assertEqual(rows, self._reference(d0, d1))
+        self.assertEqual(sum(done), 30)
+        self.assertTrue(all(n > 0 for n in done), done)
+        for m in self.mocks:
+            # ubicación fijada una sola vez por instancia; cada día = 1 set-time
+            self.assertEqual(m.requests[("POST", "/api/location/setlocationfields")], 1)
+            self.assertEqual(m.requests[("POST", "/api/main/time")], m.requests[("GET", "/api/objects/info")] // 2)
+
+    def test_dead_instance_is_dropped_and_jobs_rebalanced(self):
+        self.mocks[0].down_after_requests = 6  # ping inicial + un par de días
+        d0, d1 = dt.date(2025, 1, 1), dt.date(2025, 1, 20)
+        with StellariumPool(self.configs) as pool:
+            rows = list(iter_range_pool(d0, d1, pool=pool, **KW))
+            self.assertEqual(len(pool.live_endpoints), 2)
+        self.assertTrue(all(r["meta"]["ok"] for r in rows))
+        self.assertEqual(rows, self._reference(d0, d1))
+
+    def test_all_instances_down_yields_error_rows(self):
+        for m in self.mocks:
+            m.alive = False
+        with StellariumPool(self.configs) as pool:
+            rows = list(iter_range_pool(dt.date(2025, 1, 1), dt.date(2025, 1, 3), pool=pool, **KW))
+        self.assertEqual([r["meta"]["ok"] for r in rows], [False, False, False])
+        self.assertEqual(rows[0]["error"]["type"], "StellariumRCError")
+
+    def test_cli_endpoints(self):
+        buf = io.StringIO()
+        with redirect_stdout(buf):
+            main([
+                "--start", "2025-01-01", "--end", "2025-01-05", "--tz=-05:00", "--lat", "4.711", "--lon", "-74.0721",
+                "--endpoints", ",".join(f"127.0.0.1:{m.port}" for m in self.mocks),
+            ])
+        dates = [json.loads(line)["meta"]["date"] for line in buf.getvalue().splitlines()]
+        self.assertEqual(dates, [f"2025-01-0{i}" for i in range(1, 6)])
+
+
+if __name__ == "__main__":
+    unittest.main()
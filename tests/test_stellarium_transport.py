@@ -0,0 +1,105 @@
+import unittest
+
+from tests.stellarium_mock import MockStellarium
+from tsurphu.integraciones.stellarium_rc import (
+    StellariumRCConfig,
+    StellariumRCError,
+    StellariumRemoteControlClient,
+)
+
+
+class TestKeepAliveTransport(unittest.TestCase):
+    def setUp(self):
+        self.mock = MockStellarium().start()
+        self.client = StellariumRemoteControlClient(
+            StellariumRCConfig(port=self.mock.port, timeout_s=2.0, backoff_s=0.001)
+        )
+
+    def tearDown(self):
+        self.client.close()
+        self.mock.stop()
+
+    def _snapshot(self):
+        c = self.client
+        c.set_location(latitude=4.711, longitude=-74.0721, name="Bogota", country="CO")
+        c.set_time_jd(2460000.5, 0)
+        c.status()
+        for body in ("Sun", "Moon"):
+            c.focus(body)
+            c.object_info(body)
+
+    def test_reuses_one_connection(self):
+        self._snapshot()
+        self.assertEqual(self.client._transport.connections_opened, 1)
+        self.assertEqual(self.mock.connections, 1)
+        self.assertEqual(self.mock.location["name"], "Bogota")
+        self.assertEqual(self.mock.jd, 2460000.5)
+        self.assertEqual(self.client.object_info("Moon")["ra"], self.mock.body_radec("Moon", 2460000.5)[0])
+
+    def test_reconnects_on_stale_socket(self):
+        self.mock.close_after_each_response = True
+        self._snapshot()  # cada petición encuentra el socket anterior cerrado
+        self.assertEqual(self.mock.requests[("POST", "/api/main/focus")], 2)
+        self.assertEqual(self.mock.requests[("GET", "/api/objects/info")], 2)
+
+    def test_get_is_retried_with_backoff(self):
+        self.mock.fail_next_gets = 2
+        self.assertIn("time", self.client.status())
+        st = self.client.stats["/api/main/status"]
+        self.assertEqual(st.retries, 2)
+        self.assertEqual(st.errors, 0)
+
+    def test_get_gives_up_after_retries(self):
+        self.mock.fail_next_gets = 10
+        with self.assertRaises(StellariumRCError):
+            self.client.status()
+        self.assertEqual(self.mock.requests[("GET", "/api/main/status")], 3)
+        self.assertEqual(self.client.stats["/api/main/status"].errors, 1)
+
+    def test_http_error_status_is_not_retried(self):
+        with self.assertRaises(StellariumRCError):
+            self.client.object_info("Pluto")
+        self.assertEqual(self.mock.requests[("GET", "/api/objects/info")], 1)
+
+    def test_latency_counters(self):
+        self._snapshot()
+        stats = self.client.stats
+        self.assertEqual(stats["/api/main/focus"].requests, 2)
+        self.assertEqual(stats["/api/objects/info"].requests, 2)
+        self.assertGreater(stats["/api/main/status"].mean_s, 0.0)
+
+    def test_unreachable_server(self):
+        port = self.mock.port
+        self.mock.stop()
+        c = StellariumRemoteControlClient(StellariumRCConfig(port=port, timeout_s=0.5, retries=1, backoff_s=0.001))
+        self.assertFalse(c.ping())
+        self.mock = MockStellarium().start()  # para tearDown
+
+
+class TestObjectInfoMany(unittest.TestCase):
+    def _run(self, requires_focus):
+        with MockStellarium(requires_focus=requires_focus) as mock:
+            with StellariumRemoteControlClient(StellariumRCConfig(port=mock.port)) as c:
+                for jd in (2460000.5, 2460001.5, 2460002.5):
+                    c.set_time_jd(jd, 0)
+                    infos = c.object_info_many(["Sun", "Moon", "Mars"])
+                    self.assertEqual(list(infos), ["Sun", "Moon", "Mars"])
+                    self.assertTrue(all("ra" in i and "dec" in i for i in infos.values()))
+                return c.needs_focus, dict(mock.requests)
+
+    def test_no_focus_when_info_has_radec(self):
+        needs_focus, req = self._run(requires_focus=False)
+        self.assertIs(needs_focus, False)
+        self.assertEqual(req.get(("POST", "/api/main/focus"), 0), 0)
+        self.assertEqual(req[("GET", "/api/objects/info")], 9)
+
+    def test_falls_back_to_focus_only_when_needed(self):
+        needs_focus, req = self._run(requires_focus=True)
+        self.assertIs(needs_focus, True)
+        # sonda: 1 info sin coordenadas + focus + info; después focus + info por cuerpo
+        self.assertEqual(req[("POST", "/api/main/focus")], 9)
+        self.assertEqual(req[("GET", "/api/objects/info")], 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
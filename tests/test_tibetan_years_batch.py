@@ -0,0 +1,42 @@
+import unittest
+
+from engines import tibetan_year as ty_mod
+from engines.tibetan_year import ANIMALS, ELEMENTS, PARKHAS, tibetan_year, tibetan_years
+
+
+class TestTibetanYearsBatch(unittest.TestCase):
+    def _assert_matches_scalar(self, cols, years):
+        self.assertEqual(len(cols), len(years))
+        for i, y in enumerate(years):
+            self.assertEqual(cols.row(i), tibetan_year(y))
+
+    def test_array_backend_matches_scalar(self):
+        years = range(1800, 2200)
+        cols = tibetan_years(years, backend="array")
+        self.assertEqual(cols.backend, "array")
+        self._assert_matches_scalar(cols, years)
+
+    def test_sequence_input_and_codes(self):
+        cols = tibetan_years([2025, 1984, 1990], backend="array")
+        self.assertEqual(list(cols.gregorian_year), [2025, 1984, 1990])
+        self.assertEqual(ELEMENTS[cols.element_code[0]], "Wood")
+        self.assertEqual(ANIMALS[cols.animal_code[0]], "Snake")
+        self.assertEqual(PARKHAS[cols.parkha_code[0]], "Khon")
+        self.assertEqual(list(cols.mewa), [5, 1, 4])
+
+    @unittest.skipIf(ty_mod.np is None, "NumPy no instalado")
+    def test_numpy_backend_matches_array(self):
+        years = range(-3000, 3000, 7)
+        a = tibetan_years(years, backend="array")
+        n = tibetan_years(years, backend="numpy")
+        for col in ("gregorian_year", "stem_index", "branch_index", "mewa",
+                    "element_code", "animal_code", "parkha_code"):
+            self.assertEqual(list(getattr(a, col)), [int(v) for v in getattr(n, col)], col)
+
+    def test_invalid_backend(self):
+        with self.assertRaises(ValueError):
+            tibetan_years([2025], backend="pandas")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+
+from tests.stellarium_mock import MockStellarium
+from tsurphu.astro.tithi import (
+    AnalyticPositionSource,
+    StellariumPositionSource,
+    find_tithi_intervals,
+)
+from tsurphu.integraciones.stellarium_rc import StellariumRCConfig, StellariumRemoteControlClient
+
+
+def _elongation(source, jd):
+    sun, moon = source.sun_moon_lon(jd)
+    return (moon - sun) % 360.0
+
+
+class TestTithiBoundaries(unittest.TestCase):
+    def test_boundaries_hit_multiples_of_12(self):
+        src = AnalyticPositionSource()
+        res = find_tithi_intervals(src, 2460400.5, 2460460.5)
+        for iv in res.intervals:
+            e = _elongation(src, iv.end_jd)
+            self.assertAlmostEqual((e + 6.0) % 12.0, 6.0, delta=1e-3)
+            self.assertEqual(round(e / 12.0) % 30, iv.tithi % 30)
+
+    def test_intervals_are_contiguous_and_cover_range(self):
+        res = find_tithi_intervals(AnalyticPositionSource(), 2460400.5, 2460460.5)
+        self.assertLessEqual(res.intervals[0].start_jd, 2460400.5)
+        self.assertGreater(res.intervals[-1].end_jd, 2460460.5)
+        for a, b in zip(res.intervals, res.intervals[1:]):
+            self.assertEqual(a.end_jd, b.start_jd)
+            self.assertEqual(b.tithi, a.tithi % 30 + 1)
+            self.assertTrue(0.7 < a.end_jd - a.start_jd < 1.2)
+
+    def test_new_moon_2024_04_08(self):
+        res = find_tithi_intervals(AnalyticPositionSource(), 2460408.0, 2460410.0)
+        (nm,) = [iv for iv in res.intervals if iv.tithi == 1]
+        self.assertAlmostEqual(nm.start_jd, 2460409.264583, delta=5 / 1440)  # 18:21 UT ± 5 min
+
+    def test_evaluation_budget(self):
+        res = find_tithi_intervals(AnalyticPositionSource(), 2460400.5, 2460765.5)
+        self.assertGreater(res.boundaries, 360)
+        self.assertLess(res.evaluations_per_boundary, 4.0)
+
+    def test_stellarium_source(self):
+        with MockStellarium() as mock:
+            client = StellariumRemoteControlClient(StellariumRCConfig(port=mock.port))
+            res = find_tithi_intervals(StellariumPositionSource(client), 2460400.5, 2460403.5)
+            self.assertGreaterEqual(len(res.intervals), 3)
+            self.assertEqual(mock.requests[("POST", "/api/main/time")], res.evaluations)
+            client.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,218 @@
+import json
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+REPO = Path(__file__).resolve().parents[1]
+
+
+class ToolRoot(unittest.TestCase):
+    """tools/tsurphu.py corrido en un ROOT temporal: reports/, changesets/ y audit quedan aislados."""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name)
+        (self.root / "tools").mkdir()
+        shutil.copy(REPO / "tools" / "tsurphu.py", self.root / "tools" / "tsurphu.py")
+        (self.root / "src").mkdir()
+        for name in ("__init__.py", "engines", "governance", "orchestration"):
+            (self.root / "src" / name).symlink_to(REPO / "src" / name)
+        self.reports = self.root / "reports"
+        self.audit = self.root / "src" / "audit" / "audit-log.jsonl"
+
+    def run_tool(self, *args):
+        return subprocess.run(
+            [sys.executable, str(self.root / "tools" / "tsurphu.py"), *args],
+            cwd=self.root, capture_output=True, text=True, encoding="utf-8",
+        )
+
+    def audit_entries(self):
+        return [json.loads(line) for line in self.audit.read_text(encoding="utf-8").splitlines() if line]
+
+
+class TestSliceABatch(ToolRoot):
+    PEOPLE = [
+        ("Ana", "1990-11-02", "20:30", "Medellín"),
+        ("Bo", "2026-02-17", "", ""),   # víspera de Losar 2026: año 2025
+        ("Cy", "2026-02-18", "", ""),
+        ("Di", "1975-06-01", "08:00", "Lhasa"),
+        ("Ed", "2000-01-01", "", ""),
+    ]
+
+    def write_csv(self, rows, name="people.csv"):
+        path = self.root / name
+        lines = ["name,birth_date,birth_time,place"] + [",".join(r) for r in rows]
+        path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        return path
+
+    def test_files_mode(self):
+        r = self.run_tool("slice-a-batch", "--from", str(self.write_csv(self.PEOPLE)), "--jobs", "1")
+        self.assertEqual(r.returncode, 0, r.stderr)
+        files = sorted(self.reports.glob("sliceA-*.json"))
+        self.assertEqual(len(files), len(self.PEOPLE))
+        reports = [json.loads(p.read_text(encoding="utf-8")) for p in files]
+        self.assertEqual([x["input"]["name"] for x in reports], [p[0] for p in self.PEOPLE])
+        self.assertEqual([x["tibetan"]["year"] for x in reports], [1990, 2025, 2026, 1975, 1999])
+        self.assertEqual(reports[2]["tibetan"]["losar"], "2026-02-18")
+
+        entries = self.audit_entries()
+        self.assertEqual([e["report_file"] for e in entries], ["/reports/" + p.name for p in files])
+        self.assertTrue(all(e["event"] == "sliceA_report_created" for e in entries))
+
+    def test_jsonl_mode_with_workers(self):
+        people = self.PEOPLE * 3
+        r = self.run_tool("slice-a-batch", "--from", str(self.write_csv(people)), "--jsonl",
+                          "--jobs", "2", "--chunk-size", "4")
+        self.assertEqual(r.returncode, 0, r.stderr)
+        (out,) = self.reports.glob("sliceA-*.jsonl")
+        reports = [json.loads(line) for line in out.read_text(encoding="utf-8").splitlines()]
+        self.assertEqual([x["input"]["name"] for x in reports], [p[0] for p in people])
+        self.assertEqual([x["tibetan"]["year"] for x in reports[:5]], [1990, 2025, 2026, 1975, 1999])
+
+        entries = self.audit_entries()
+        self.assertEqual([e["report_line"] for e in entries], list(range(1, len(people) + 1)))
+        self.assertEqual({e["report_file"] for e in entries}, {"/reports/" + out.name})
+
+    def test_bad_rows_are_reported_and_the_rest_written(self):
+        rows = self.PEOPLE[:2] + [("C", "bad-date", "", "Z"), ("D", "", "", "")] + self.PEOPLE[2:3]
+        r = self.run_tool("slice-a-batch", "--from", str(self.write_csv(rows)), "--jobs", "1")
+        self.assertEqual(r.returncode, 2)
+        self.assertNotIn("Traceback", r.stderr)
+        self.assertIn("FALLO L4: ValueError", r.stdout)
+        self.assertIn("'bad-date'", r.stdout)
+        self.assertIn("FALLO L5: ValueError: fila sin birth_date", r.stdout)
+        files = sorted(self.reports.glob("sliceA-*.json"))
+        names = [json.loads(p.read_text(encoding="utf-8"))["input"]["name"] for p in files]
+        self.assertEqual(names, ["Ana", "Bo", "Cy"])
+        self.assertEqual(len(self.audit_entries()), 3)
+
+    def test_impossible_dates_are_row_failures(self):
+        rows = self.PEOPLE[:1] + [("F", "2025-02-30", "", ""), ("G", "2025-13-45", "", "")] + self.PEOPLE[1:2]
+        r = self.run_tool("slice-a-batch", "--from", str(self.write_csv(rows)), "--jobs", "1")
+        self.assertEqual(r.returncode, 2)
+        self.assertIn("FALLO L3: ValueError: fecha inválida (se espera AAAA-MM-DD): '2025-02-30'", r.stdout)
+        self.assertIn("FALLO L4: ValueError: fecha inválida (se espera AAAA-MM-DD): '2025-13-45'", r.stdout)
+        files = sorted(self.reports.glob("sliceA-*.json"))
+        self.assertEqual([json.loads(p.read_text(encoding="utf-8"))["input"]["name"] for p in files], ["Ana", "Bo"])
+
+        r = self.run_tool("slice-a", "--birth-date", "2025-02-30")
+        self.assertEqual(r.returncode, 2)
+        self.assertNotIn("Traceback", r.stderr)
+        self.assertIn("[slice-a] ERROR ValueError: fecha inválida", r.stdout)
+        self.assertEqual(len(list(self.reports.glob("sliceA-*.json"))), 2)
+
+    def test_jobs_and_chunk_size_must_be_positive(self):
+        path = self.write_csv(self.PEOPLE)
+        for flag, value in (("--chunk-size", "0"), ("--jobs", "0"), ("--jobs", "-2"), ("--chunk-size", "x")):
+            r = self.run_tool("slice-a-batch", "--from", str(path), flag, value)
+            self.assertEqual(r.returncode, 2, (flag, value))
+            self.assertNotIn("Traceback", r.stderr)
+            self.assertIn(f"argument {flag}:", r.stderr)
+        self.assertFalse(self.reports.exists() and any(self.reports.iterdir()))
+
+    def test_bad_jsonl_line(self):
+        path = self.root / "people.jsonl"
+        path.write_text(
+            '{"name": "Ana", "birth_date": "1990-11-02"}\n{no es json\n{"name": "Bo", "birth_date": "1500-01-01"}\n',
+            encoding="utf-8",
+        )
+        r = self.run_tool("slice-a-batch", "--from", str(path), "--jsonl")
+        self.assertEqual(r.returncode, 2)
+        self.assertIn("FALLO L2: JSONDecodeError", r.stdout)
+        self.assertIn("FALLO L3: ValueError", r.stdout)
+        (out,) = self.reports.glob("sliceA-*.jsonl")
+        self.assertEqual(len(out.read_text(encoding="utf-8").splitlines()), 1)
+
+
+class TestNewChangesets(ToolRoot):
+    def setUp(self):
+        super().setUp()
+        (self.root / "docs").mkdir()
+        shutil.copy(REPO / "docs" / "object-ledger.csv", self.root / "docs" / "object-ledger.csv")
+        self.changesets = self.root / "changesets"
+
+    def write_manifest(self, *lines):
+        path = self.root / "manifest.jsonl"
+        path.write_text("\n".join(x if isinstance(x, str) else json.dumps(x) for x in lines) + "\n", encoding="utf-8")
+        return path
+
+    @staticmethod
+    def spec(change_id, *objects):
+        return {"change_id": change_id, "rationale": "prueba",
+                "objects": list(objects) or ["TSU-OBJ-0001:update:/docs/master.md:P1"]}
+
+    def test_manifest_success(self):
+        path = self.write_manifest(
+            self.spec("TSU-CHG-9001-a"),
+            "",
+            dict(self.spec("TSU-CHG-9002-b"), change_type="add", layers=["7x-L1"]),
+        )
+        r = self.run_tool("new-changesets", "--from", str(path))
+        self.assertEqual(r.returncode, 0, r.stdout + r.stderr)
+        self.assertEqual(sorted(p.name for p in self.changesets.iterdir()),
+                         ["TSU-CHG-9001-a.json", "TSU-CHG-9002-b.json"])
+        pkt = json.loads((self.changesets / "TSU-CHG-9002-b.json").read_text(encoding="utf-8"))
+        self.assertEqual((pkt["change_type"], pkt["scope"]["layers_7x"]), ("add", ["7x-L1"]))
+        self.assertTrue(pkt["integrity"]["packet_hash"].startswith("sha256:"))
+
+        entries = self.audit_entries()
+        self.assertEqual([e["change_id"] for e in entries], ["TSU-CHG-9001-a", "TSU-CHG-9002-b"])
+        self.assertEqual(entries[1]["packet_hash"], pkt["integrity"]["packet_hash"])
+        # El índice del ledger va a .cache/, no a docs/
+        self.assertEqual([p.name for p in (self.root / "docs").iterdir()], ["object-ledger.csv"])
+        self.assertEqual(len(list((self.root / ".cache" / "tsurphu" / "ledger").glob("*.idx"))), 1)
+
+    def test_failures_are_per_line_and_exit_non_zero(self):
+        path = self.write_manifest(
+            self.spec("TSU-CHG-9001-a"),
+            self.spec("TSU-CHG-9001-a"),
+            "{no es json",
+            {"change_id": "TSU-CHG-9003-c", "objects": []},
+            self.spec("TSU-CHG-9004-d"),
+        )
+        r = self.run_tool("new-changesets", "--from", str(path))
+        self.assertEqual(r.returncode, 2)
+        self.assertIn("FALLO L2 TSU-CHG-9001-a: ValueError: change_id repetido", r.stdout)
+        self.assertIn("FALLO L3 ?: JSONDecodeError", r.stdout)
+        self.assertIn("FALLO L4 TSU-CHG-9003-c: KeyError", r.stdout)
+        self.assertIn("2 creados, 3 fallidos", r.stdout)
+        self.assertEqual(sorted(p.name for p in self.changesets.iterdir()),
+                         ["TSU-CHG-9001-a.json", "TSU-CHG-9004-d.json"])
+        self.assertEqual([e["change_id"] for e in self.audit_entries()], ["TSU-CHG-9001-a", "TSU-CHG-9004-d"])
+
+    def test_strict_ledger(self):
+        unknown = "TSU-OBJ-9999:add:/docs/x.md:P1"
+        path = self.write_manifest(self.spec("TSU-CHG-9001-a", unknown), self.spec("TSU-CHG-9002-b"))
+        r = self.run_tool("new-changesets", "--from", str(path))
+        self.assertEqual(r.returncode, 0)
+        self.assertIn("AVISO TSU-OBJ-9999", r.stdout)
+        self.assertEqual(len(list(self.changesets.iterdir())), 2)
+
+        shutil.rmtree(self.changesets)
+        r = self.run_tool("new-changesets", "--from", str(path), "--strict-ledger")
+        self.assertEqual(r.returncode, 2)
+        self.assertIn("FALLO L1 TSU-CHG-9001-a: ValueError: ObjectID fuera del ledger", r.stdout)
+        self.assertEqual([p.name for p in self.changesets.iterdir()], ["TSU-CHG-9002-b.json"])
+
+    def test_change_id_cannot_escape_changesets_dir(self):
+        bad = ["../escape", "sub/x", "/tmp/abs", ".hidden", "", 7]
+        path = self.write_manifest(*(self.spec(c) for c in bad))
+        r = self.run_tool("new-changesets", "--from", str(path))
+        self.assertEqual(r.returncode, 2)
+        self.assertEqual(r.stdout.count("change_id inválido"), len(bad))
+        self.assertEqual(list(self.changesets.iterdir()), [])
+        self.assertFalse((self.root / "escape.json").exists())
+
+        r = self.run_tool("new-changeset", "--change-id", "../escape", "--object",
+                          "TSU-OBJ-0001:update:/docs/master.md:P1", "--rationale", "x")
+        self.assertEqual(r.returncode, 2)
+        self.assertIn("change_id inválido", r.stdout)
+        self.assertFalse((self.root / "escape.json").exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
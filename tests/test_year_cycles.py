@@ -1,7 +1,7 @@
 ﻿import unittest
 
-from engines.year_mewa_parkha import mewa_for_gregorian_year, parkha_for_mewa
-from engines.tibetan_year import tibetan_year
+from engines.year_mewa_parkha import mewa_for_gregorian_year, parkha_for_mewa, year_polarity_from_stem_index
+from engines.tibetan_year import TibetanYear, sexagenary_from_gregorian, tibetan_year
 
 class TestYearCycles(unittest.TestCase):
     def test_mewa_examples(self):
@@ -24,5 +24,14 @@ class TestYearCycles(unittest.TestCase):
         self.assertEqual(ty.mewa, 1)
         self.assertTrue(ty.parkha in {"Kham","Khon","Zin","Zon","Khen","Dwa","Gin","Li"})
 
+    def test_cycle_table_matches_functions(self):
+        # La tabla de 180 residuos debe coincidir con la cadena de funciones en un rango amplio
+        for year in range(-2000, 4001):
+            element, animal, stem_i, branch_i = sexagenary_from_gregorian(year)
+            mewa = mewa_for_gregorian_year(year)
+            parkha = parkha_for_mewa(mewa, polarity=year_polarity_from_stem_index(stem_i)).code
+            expected = TibetanYear(year, element, animal, stem_i, branch_i, mewa, parkha)
+            self.assertEqual(tibetan_year(year), expected, year)
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,61 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from engines.tibetan_year import tibetan_year, tibetan_years
+from engines.year_lookup import load_mewa_parkha_table
+
+
+class TestMewaParkhaLookup(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self._tmp.name)
+        self.csv = self.dir / "year_mewa_parkha.csv"
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _write(self, text, mtime_ns=None):
+        self.csv.write_text(text, encoding="utf-8")
+        if mtime_ns is not None:
+            os.utime(self.csv, ns=(mtime_ns, mtime_ns))
+
+    def test_missing_file_is_empty(self):
+        table = load_mewa_parkha_table(self.csv)
+        self.assertEqual(len(table), 0)
+        self.assertEqual(table.get(2025), (None, None))
+
+    def test_index_and_line_errors(self):
+        self._write(
+            "year,mewa,parkha,notes\n"
+            "2025,5,Khon,ok\n"
+            "abc,1,Kham,\n"
+            "2026,12,,\n"
+            "2027,,Foo,\n"
+            "2025,3,Zin,dup\n"
+        )
+        table = load_mewa_parkha_table(self.csv)
+        self.assertEqual(table.get(2025), (5, "Khon"))
+        self.assertEqual(table.get(2026), (None, None))
+        self.assertEqual(table.get(2027), (None, None))
+        self.assertEqual([e.line for e in table.errors], [3, 4, 5, 6])
+
+    def test_reloads_when_file_changes(self):
+        self._write("year,mewa,parkha,notes\n2025,5,Khon,\n", mtime_ns=1_000_000_000)
+        self.assertIs(load_mewa_parkha_table(self.csv), load_mewa_parkha_table(self.csv))
+        self._write("year,mewa,parkha,notes\n2025,7,Dwa,\n", mtime_ns=2_000_000_000)
+        self.assertEqual(load_mewa_parkha_table(self.csv).get(2025), (7, "Dwa"))
+
+    def test_tibetan_year_uses_overrides(self):
+        self._write("year,mewa,parkha,notes\n1990,8,,\n1991,,Li,\n")
+        ty = tibetan_year(1990, lookups_dir=self.dir)
+        self.assertEqual((ty.mewa, ty.parkha), (8, "Khen"))
+        self.assertEqual(tibetan_year(1991, lookups_dir=self.dir).parkha, "Li")
+        cols = tibetan_years(range(1985, 1995), lookups_dir=self.dir)
+        self.assertEqual([cols.row(i) for i in range(len(cols))],
+                         [tibetan_year(y, lookups_dir=self.dir) for y in range(1985, 1995)])
+
+
+if __name__ == "__main__":
+    unittest.main()
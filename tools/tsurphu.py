@@ -1,7 +1,7 @@
 ﻿#!/usr/bin/env python3
 from __future__ import annotations
 
-import argparse, csv, datetime as dt, hashlib, json
+import argparse, atexit, concurrent.futures, contextlib, csv, datetime as dt, functools, hashlib, json, os, re, time, uuid
 from pathlib import Path
 
 ROOT = Path(__file__).resolve().parents[1]
@@ -12,63 +12,84 @@ LEDGER = DOCS / "object-ledger.csv"
 CHANGESETS = ROOT / "changesets"
 AUDIT = ROOT / "src" / "audit" / "audit-log.jsonl"
 REPORTS = ROOT / "reports"
+CACHE = ROOT / ".cache" / "tsurphu"
+CHANGESET_MANIFEST = CACHE / "changesets-manifest.json"
+LEDGER_CACHE = CACHE / "ledger"
+LOOKUPS = ROOT / "src" / "engines" / "lookups"
+
+# Audit log: rota a segmentos (src/audit/audit-log.NNNNNN.jsonl + índice) al pasar este tamaño
+AUDIT_MAX_BYTES = 16 * 1024 * 1024
+AUDIT_ROTATE_DAILY = False
+AUDIT_FSYNC = "close"  # never | close | flush
 
 # Motores
+from engines.losar import load_losar_index
 from engines.tibetan_year import tibetan_year
+from engines.year_lookup import load_mewa_parkha_table
+from governance.audit_log import AuditWriter
+from governance.changesets import canon, validate_changesets
+from governance.ledger import load_ledger
 
 def now_utc():
     return dt.datetime.now(dt.timezone.utc).replace(microsecond=0).isoformat().replace("+00:00","Z")
 
-def canon(obj) -> bytes:
-    return json.dumps(obj, sort_keys=True, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
-
 def sha256(b: bytes) -> str:
     return hashlib.sha256(b).hexdigest()
 
+_ENSURED = False
+
 def ensure():
+    global _ENSURED
+    if _ENSURED:
+        return
     CHANGESETS.mkdir(parents=True, exist_ok=True)
     AUDIT.parent.mkdir(parents=True, exist_ok=True)
     REPORTS.mkdir(parents=True, exist_ok=True)
     if not AUDIT.exists():
         AUDIT.write_text("", encoding="utf-8")
+    _ENSURED = True
+
+_AUDIT_WRITER: AuditWriter | None = None
+
+def audit_writer() -> AuditWriter:
+    """Writer del proceso: archivo abierto una vez, flush por entrada (como antes)."""
+    global _AUDIT_WRITER
+    if _AUDIT_WRITER is None:
+        ensure()
+        _AUDIT_WRITER = AuditWriter(AUDIT, flush_every=1, fsync=AUDIT_FSYNC,
+                                    max_bytes=AUDIT_MAX_BYTES, rotate_daily=AUDIT_ROTATE_DAILY).open()
+        atexit.register(_AUDIT_WRITER.close)
+    return _AUDIT_WRITER
+
+@contextlib.contextmanager
+def audit_batch(flush_every: int = 1000):
+    """Operaciones masivas: agrupa los flush (y fsync) del audit log hasta salir del bloque."""
+    w = audit_writer()
+    prev = w.flush_every
+    w.flush_every = flush_every
+    try:
+        yield w
+    finally:
+        w.flush_every = prev
+        w.flush()
 
 def write_audit(entry: dict):
-    ensure()
-    with AUDIT.open("a", encoding="utf-8") as f:
-        f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    audit_writer().write(entry)
 
-def validate():
+def validate(full: bool = False, jobs: int | None = None):
     errs = []
     for p in [DOCS/"master.md", DOCS/"changesetpacket-1.md", LEDGER, AUDIT]:
         if not p.exists():
             errs.append(f"Falta: {p}")
 
     if LEDGER.exists():
-        with LEDGER.open("r", encoding="utf-8-sig", newline="") as f:
-            r = csv.DictReader(f)
-            need = {"ObjectID","Nombre","Estrato_7x","Dueño","MetaAgent","Sensibilidad","Evidencia","Ruta"}
-            if set(r.fieldnames or []) != need:
-                errs.append("Ledger: columnas incorrectas")
-            seen=set()
-            for i,row in enumerate(r, start=2):
-                oid=(row.get("ObjectID") or "").strip()
-                if not oid:
-                    errs.append(f"Ledger L{i}: ObjectID vacío")
-                    continue
-                if oid in seen:
-                    errs.append(f"Ledger L{i}: duplicado {oid}")
-                seen.add(oid)
-
-    for p in sorted(CHANGESETS.glob("*.json")):
-        try:
-            obj=json.loads(p.read_text(encoding="utf-8"))
-            recorded=(obj.get("integrity",{}).get("packet_hash") or "")
-            tmp=dict(obj); tmp["integrity"]=dict(tmp.get("integrity",{})); tmp["integrity"]["packet_hash"]=""
-            computed="sha256:"+sha256(canon(tmp))
-            if recorded!=computed:
-                errs.append(f"{p.name}: hash no coincide")
-        except Exception as e:
-            errs.append(f"{p.name}: inválido ({e})")
+        # Índice persistido en .cache/tsurphu/ledger/; solo se reparsea lo que cambió
+        errs.extend(load_ledger(LEDGER, cache_dir=LEDGER_CACHE).errors)
+
+    # Incremental: solo se re-hashean los paquetes que cambiaron desde la última corrida
+    report = validate_changesets(sorted(CHANGESETS.glob("*.json")), manifest_path=CHANGESET_MANIFEST,
+                                 full=full, jobs=jobs)
+    errs.extend(report.errors)
 
     if errs:
         print("[validate] ERRORES:")
@@ -76,6 +97,7 @@ def validate():
             print(" -", e)
         raise SystemExit(2)
 
+    print(f"[validate] changesets: {report.verified} verificados, {report.cached} sin cambios (manifiesto)")
     print("[validate] OK ✅")
 
 def make_changeset(change_id: str, actor_role: str, change_type: str, layers: list[str], modules: list[str], objects: list[dict], rationale: str):
@@ -98,65 +120,313 @@ def make_changeset(change_id: str, actor_role: str, change_type: str, layers: li
     pkt["integrity"]["packet_hash"]="sha256:"+sha256(canon(tmp))
     return pkt
 
-def cmd_validate(_): 
-    validate()
+def cmd_validate(args):
+    validate(full=args.full, jobs=args.jobs)
 
-def cmd_slice_a(args):
-    ensure()
+SLICE_A_VERSION = "sliceA-0.3"
 
-    # Año para cálculo: por ahora usamos el año gregoriano de birth_date (sin ajustar por Losar)
-    year = int(args.birth_date.split("-")[0])
-    ty = tibetan_year(year, lookups_dir=ROOT / "src" / "engines" / "lookups")
+@functools.lru_cache(maxsize=None)
+def slice_a_tibetan(year: int) -> dict:
+    """Bloque "tibetan" del reporte; memoizado por año tibetano (etiqueta gregoriana)."""
+    ty = tibetan_year(year, lookups_dir=LOOKUPS)
+    return {
+        "year": year,
+        "losar": load_losar_index(LOOKUPS).losar(year).isoformat(),
+        "year_animal": ty.animal,
+        "element": ty.element,
+        "mewa": ty.mewa if ty.mewa is not None else "TBD",
+        "parkha": ty.parkha if ty.parkha is not None else "TBD"
+    }
 
-    result = {
-        "timestamp_utc": now_utc(),
-        "input": {"name": args.name, "birth_date": args.birth_date, "birth_time": args.birth_time, "place": args.place},
-        "engine": {"version": "sliceA-0.2", "tibetan_year_engine": "tibetan_year.py"},
-        "tibetan": {
-            "year_animal": ty.animal,
-            "element": ty.element,
-            "mewa": ty.mewa if ty.mewa is not None else "TBD",
-            "parkha": ty.parkha if ty.parkha is not None else "TBD"
-        },
+def slice_a_result(person: dict, timestamp_utc: str, year: int | None = None, tibetan: dict | None = None) -> dict:
+    # Año tibetano vigente en birth_date (cambia en Losar); el batch lo pasa ya resuelto,
+    # junto con el bloque "tibetan" precalculado
+    if year is None:
+        year = load_losar_index(LOOKUPS).year_of(person["birth_date"])
+    return {
+        "timestamp_utc": timestamp_utc,
+        "input": {"name": person["name"], "birth_date": person["birth_date"],
+                  "birth_time": person["birth_time"], "place": person["place"]},
+        "engine": {"version": SLICE_A_VERSION, "tibetan_year_engine": "tibetan_year.py"},
+        "tibetan": dict(tibetan or slice_a_tibetan(year)),
         "interpretation": "Pipeline demo + año (animal/elemento) calculado. Mewa/Parkha aún por tabla validada.",
         "sources_ref": []
     }
 
-    fn = REPORTS / f"sliceA-{dt.datetime.now(dt.timezone.utc).strftime('%Y%m%d-%H%M%S')}.json"
-    fn.write_text(json.dumps(result, ensure_ascii=False, indent=2), encoding="utf-8")
+def slice_a_audit(timestamp_utc: str, report_file: str, **extra) -> dict:
+    return {"timestamp_utc": timestamp_utc, "event":"sliceA_report_created",
+            "report_file": report_file, "engine_version": SLICE_A_VERSION, **extra}
 
-    write_audit({
-        "timestamp_utc": result["timestamp_utc"],
-        "event":"sliceA_report_created",
-        "report_file": "/reports/"+fn.name,
-        "engine_version":"sliceA-0.2"
-    })
+def claim_report_path(stem: str) -> tuple[Path, object]:
+    """Crea reports/<stem>.json en exclusiva; si ya existe, <stem>-2.json, -3, ..."""
+    n = 1
+    while True:
+        fn = REPORTS / (f"{stem}.json" if n == 1 else f"{stem}-{n}.json")
+        try:
+            return fn, fn.open("x", encoding="utf-8")
+        except FileExistsError:
+            n += 1
+
+def cmd_slice_a(args):
+    ensure()
+
+    for e in load_mewa_parkha_table(LOOKUPS / "year_mewa_parkha.csv").errors:
+        print(f"[slice-a] AVISO year_mewa_parkha.csv {e}")
+    try:
+        result = slice_a_result(vars(args), now_utc())
+    except ValueError as e:
+        print(f"[slice-a] ERROR {type(e).__name__}: {e}")
+        raise SystemExit(2)
+
+    # Dos corridas en el mismo segundo ya no se pisan: la segunda toma el sufijo -2
+    fn, f = claim_report_path(f"sliceA-{dt.datetime.now(dt.timezone.utc).strftime('%Y%m%d-%H%M%S')}")
+    with f:
+        f.write(json.dumps(result, ensure_ascii=False, indent=2))
+
+    write_audit(slice_a_audit(result["timestamp_utc"], "/reports/"+fn.name))
 
     print(f"[slice-a] OK: {fn}")
 
-def cmd_new_changeset(args):
+SLICE_A_DEFAULTS = {"name": "Demo", "birth_time": "", "place": ""}
+
+def read_people(path: Path):
+    """(línea, persona, error) desde CSV (encabezado name,birth_date,birth_time,place) o JSONL.
+
+    Una fila inválida no corta la lectura: llega con persona None y el error como texto.
+    """
+    with path.open(encoding="utf-8-sig", newline="") as f:
+        if path.suffix.lower() == ".csv":
+            r = csv.DictReader(f)
+            rows = ((r.line_num, row) for row in r)
+        else:
+            rows = ((n, l) for n, l in enumerate(f, start=1) if l.strip())
+        for n, row in rows:
+            try:
+                if isinstance(row, str):
+                    row = json.loads(row)
+                    if not isinstance(row, dict):
+                        raise ValueError("se esperaba un objeto JSON")
+                person = {**SLICE_A_DEFAULTS, **{k: v for k, v in row.items() if v not in (None, "")}}
+                if "birth_date" not in person:
+                    raise ValueError("fila sin birth_date")
+            except ValueError as e:
+                yield n, None, f"{type(e).__name__}: {e}"
+                continue
+            yield n, person, None
+
+def _slice_a_chunk(job):
+    """Worker: arma (y en modo archivos, escribe) los reportes de un bloque de personas."""
+    people, years, tibetan, start, timestamp_utc, stem, jsonl = job
+    out = []
+    for i, (person, year) in enumerate(zip(people, years), start=start):
+        result = slice_a_result(person, timestamp_utc, year, tibetan[year])
+        if jsonl:
+            out.append(json.dumps(result, ensure_ascii=False))
+        else:
+            fn = REPORTS / f"{stem}-{i:06d}.json"
+            with fn.open("x", encoding="utf-8") as f:
+                f.write(json.dumps(result, ensure_ascii=False, indent=2))
+            out.append(fn.name)
+    return out
+
+def resolve_people_years(rows):
+    """Año tibetano de cada (línea, persona): una pasada sobre el índice de Losar.
+
+    Si alguna fecha es inválida o cae fuera del índice se resuelve fila por fila, para
+    informar cada fallo sin perder el resto. Devuelve (personas, años, [(línea, error)]).
+    """
+    index = load_losar_index(LOOKUPS)
+    try:
+        return [p for _, p in rows], [int(y) for y in index.years_of(p["birth_date"] for _, p in rows)], []
+    except ValueError:
+        pass
+    people, years, failures = [], [], []
+    for n, person in rows:
+        try:
+            years.append(index.year_of(person["birth_date"]))
+        except ValueError as e:
+            failures.append((n, f"{type(e).__name__}: {e}"))
+            continue
+        people.append(person)
+    return people, years, failures
+
+def cmd_slice_a_batch(args):
     ensure()
-    objects=[]
-    for spec in args.object:
-        oid,op,path,sens = spec.split(":")
-        objects.append({"object_id":oid,"operation":op,"path":path,"sensitivity":sens})
-    pkt=make_changeset(args.change_id, args.actor_role, args.change_type, args.layer, args.module, objects, args.rationale)
-    out=CHANGESETS/f"{args.change_id}.json"
-    out.write_bytes(canon(pkt))
-    write_audit({
+    for e in load_mewa_parkha_table(LOOKUPS / "year_mewa_parkha.csv").errors:
+        print(f"[slice-a-batch] AVISO year_mewa_parkha.csv {e}")
+    t0 = time.perf_counter()
+    rows, failures = [], []
+    for n, person, err in read_people(Path(args.from_file)):
+        if err:
+            failures.append((n, err))
+        else:
+            rows.append((n, person))
+    # Año tibetano de todas las fechas en una pasada (índice de Losar, bisect/searchsorted)
+    people, person_years, bad_dates = resolve_people_years(rows)
+    failures = sorted(failures + bad_dates)
+    for n, err in failures:
+        print(f"[slice-a-batch] FALLO L{n}: {err}")
+
+    timestamp_utc = now_utc()
+    # Nombre único por corrida: segundo + id aleatorio (dos lotes en el mismo segundo no chocan)
+    stem = f"sliceA-{dt.datetime.now(dt.timezone.utc).strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+    # Bloque "tibetan" una vez por año distinto, en el padre; viaja dentro de cada bloque de
+    # trabajo, así los workers no lo recalculan (no depende de que el pool use fork)
+    years = set(person_years)
+    tibetan = {y: slice_a_tibetan(y) for y in years}
+    jobs = []
+    for i in range(0, len(people), args.chunk_size):
+        chunk_years = person_years[i:i + args.chunk_size]
+        jobs.append((people[i:i + args.chunk_size], chunk_years, {y: tibetan[y] for y in set(chunk_years)},
+                     i + 1, timestamp_utc, stem, args.jsonl))
+
+    entries = []
+    with contextlib.ExitStack() as stack:
+        if args.jobs == 1 or len(jobs) <= 1:
+            parts = map(_slice_a_chunk, jobs)
+        else:
+            ex = stack.enter_context(concurrent.futures.ProcessPoolExecutor(max_workers=args.jobs))
+            parts = ex.map(_slice_a_chunk, jobs)
+
+        if args.jsonl:
+            fn = REPORTS / f"{stem}.jsonl"
+            n = 0
+            with fn.open("x", encoding="utf-8") as f:
+                for lines in parts:
+                    for line in lines:
+                        n += 1
+                        f.write(line + "\n")
+                        entries.append(slice_a_audit(timestamp_utc, "/reports/"+fn.name, report_line=n))
+            print(f"[slice-a-batch] OK: {fn} ({n} reportes)")
+        else:
+            for names in parts:
+                entries.extend(slice_a_audit(timestamp_utc, "/reports/"+name) for name in names)
+            print(f"[slice-a-batch] OK: {len(entries)} reportes en {REPORTS}/{stem}-*.json")
+
+    with audit_batch(flush_every=len(entries) + 1) as w:
+        w.write_many(entries)
+    print(f"[slice-a-batch] {len(people)} personas, {len(years)} años distintos, {len(failures)} fallidas, "
+          f"{time.perf_counter() - t0:.3f} s")
+    if failures:
+        raise SystemExit(2)
+
+def parse_object_spec(spec: str) -> dict:
+    oid,op,path,sens = spec.split(":")
+    return {"object_id":oid,"operation":op,"path":path,"sensitivity":sens}
+
+def atomic_write_bytes(path: Path, data: bytes):
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+# change_id va al nombre del archivo: sin separadores de ruta ni "." inicial (p. ej. TSU-CHG-0005-x)
+CHANGE_ID_RE = re.compile(r"[A-Za-z0-9][A-Za-z0-9._-]*")
+
+def check_change_id(change_id) -> str:
+    if not isinstance(change_id, str) or not CHANGE_ID_RE.fullmatch(change_id):
+        raise ValueError(f"change_id inválido {change_id!r} (letras, dígitos, '.', '_' o '-')")
+    return change_id
+
+def create_changeset(change_id, actor_role, change_type, layers, modules, objects, rationale):
+    """Escribe el paquete (rename atómico) y devuelve su entrada de audit (sin escribirla)."""
+    check_change_id(change_id)
+    pkt=make_changeset(change_id, actor_role, change_type, layers, modules, objects, rationale)
+    out=CHANGESETS/f"{change_id}.json"
+    atomic_write_bytes(out, canon(pkt))
+    return out, {
         "timestamp_utc": now_utc(),
         "event":"changeset_created",
-        "change_id": args.change_id,
+        "change_id": change_id,
         "packet_file": "/changesets/"+out.name,
         "packet_hash": pkt["integrity"]["packet_hash"]
-    })
+    }
+
+def check_ledger(objects, tag: str, strict: bool) -> bool:
+    """Avisa ObjectIDs que no están en el ledger; False si hay y strict."""
+    if not LEDGER.exists():
+        return True
+    missing = load_ledger(LEDGER, cache_dir=LEDGER_CACHE).missing(o["object_id"] for o in objects)
+    for oid in missing:
+        print(f"[{tag}] AVISO {oid} no está en {LEDGER.name}")
+    return not (missing and strict)
+
+def cmd_new_changeset(args):
+    ensure()
+    try:
+        check_change_id(args.change_id)
+    except ValueError as e:
+        print(f"[new-changeset] ERROR {e}")
+        raise SystemExit(2)
+    objects=[parse_object_spec(spec) for spec in args.object]
+    if not check_ledger(objects, "new-changeset", args.strict_ledger):
+        raise SystemExit(2)
+    out, entry = create_changeset(args.change_id, args.actor_role, args.change_type, args.layer, args.module,
+                                  objects, args.rationale)
+    write_audit(entry)
     print(f"[new-changeset] OK: {out}")
 
+def cmd_new_changesets(args):
+    """Muchos paquetes en una corrida desde un manifiesto JSONL (un paquete por línea).
+
+    Campos por línea: change_id, objects (lista de "ObjectID:op:path:sens" o dicts), rationale;
+    opcionales: actor_role, change_type, layers, modules (mismos defaults que new-changeset).
+    """
+    ensure()
+    entries, failures, seen = [], 0, set()
+    t_all = time.perf_counter()
+    with open(args.from_manifest, encoding="utf-8-sig") as f:
+        for n, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            t0 = time.perf_counter()
+            change_id = "?"
+            try:
+                spec = json.loads(line)
+                change_id = check_change_id(spec["change_id"])
+                if change_id in seen:
+                    raise ValueError("change_id repetido en el manifiesto")
+                seen.add(change_id)
+                objects = [o if isinstance(o, dict) else parse_object_spec(o) for o in spec["objects"]]
+                if not check_ledger(objects, "new-changesets", args.strict_ledger):
+                    raise ValueError("ObjectID fuera del ledger (--strict-ledger)")
+                out, entry = create_changeset(
+                    change_id, spec.get("actor_role", "Engineer"), spec.get("change_type", "update"),
+                    spec.get("layers", ["7x-L7"]), spec.get("modules", ["misc"]), objects, spec["rationale"],
+                )
+            except Exception as e:
+                failures += 1
+                print(f"[new-changesets] FALLO L{n} {change_id}: {type(e).__name__}: {e}")
+                continue
+            entries.append(entry)
+            print(f"[new-changesets] OK L{n} {out.name} {(time.perf_counter() - t0) * 1000:.2f} ms")
+
+    # Un solo append (un flush) para todas las entradas de audit
+    with audit_batch(flush_every=len(entries) + 1) as w:
+        w.write_many(entries)
+    print(f"[new-changesets] {len(entries)} creados, {failures} fallidos en {time.perf_counter() - t_all:.3f} s")
+    if failures:
+        raise SystemExit(2)
+
+def positive_int(value: str) -> int:
+    """Tipo argparse para --jobs / --chunk-size: entero >= 1."""
+    try:
+        n = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"entero inválido: {value!r}") from None
+    if n < 1:
+        raise argparse.ArgumentTypeError(f"debe ser >= 1: {value!r}")
+    return n
+
 def main():
+    global AUDIT_FSYNC
     p=argparse.ArgumentParser(prog="tsurphu")
+    p.add_argument("--audit-fsync", choices=["never","close","flush"], default=None,
+                   help="Política de fsync del audit log (por defecto: close)")
     sub=p.add_subparsers(dest="cmd", required=True)
 
     v=sub.add_parser("validate")
+    v.add_argument("--full", action="store_true", help="Ignorar el manifiesto y re-verificar todos los changesets")
+    v.add_argument("--jobs", type=int, default=None, help="Procesos para verificar en frío (1 = serial)")
     v.set_defaults(func=cmd_validate)
 
     s=sub.add_parser("slice-a")
@@ -166,6 +436,13 @@ def main():
     s.add_argument("--place", default="Medellín")
     s.set_defaults(func=cmd_slice_a)
 
+    sb=sub.add_parser("slice-a-batch")
+    sb.add_argument("--from", dest="from_file", required=True, help="CSV (name,birth_date,birth_time,place) o JSONL")
+    sb.add_argument("--jsonl", action="store_true", help="Un solo reports/sliceA-*.jsonl en vez de un JSON por persona")
+    sb.add_argument("--jobs", type=positive_int, default=None, help="Procesos (1 = serial; por defecto: CPUs)")
+    sb.add_argument("--chunk-size", type=positive_int, default=2000)
+    sb.set_defaults(func=cmd_slice_a_batch)
+
     c=sub.add_parser("new-changeset")
     c.add_argument("--change-id", required=True)
     c.add_argument("--actor-role", default="Engineer")
@@ -174,9 +451,17 @@ def main():
     c.add_argument("--module", action="append", default=["misc"])
     c.add_argument("--object", action="append", required=True, help="ObjectID:op:path:sens")
     c.add_argument("--rationale", required=True)
+    c.add_argument("--strict-ledger", action="store_true", help="Fallar si algún ObjectID no está en el ledger")
     c.set_defaults(func=cmd_new_changeset)
 
+    cs=sub.add_parser("new-changesets")
+    cs.add_argument("--from", dest="from_manifest", required=True, help="Manifiesto JSONL: un paquete por línea")
+    cs.add_argument("--strict-ledger", action="store_true", help="Marcar como fallo paquetes con ObjectIDs fuera del ledger")
+    cs.set_defaults(func=cmd_new_changesets)
+
     args=p.parse_args()
+    if args.audit_fsync:
+        AUDIT_FSYNC = args.audit_fsync
     args.func(args)
 
 if __name__=="__main__":
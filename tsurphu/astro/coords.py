@@ -1,7 +1,13 @@
 ﻿from __future__ import annotations
 
 import math
-from typing import Tuple
+from array import array
+from typing import Dict, Sequence, Tuple, Union
+
+try:  # optional: vectorized path
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on the environment
+    np = None
 
 
 def normalize_deg(deg: float) -> float:
@@ -15,8 +21,13 @@ def mean_obliquity_deg(jd: float) -> float:
     Mean obliquity of the ecliptic (degrees).
     IAU 2006 polynomial (good for our purposes).
     """
+    return _obliquity_poly(jd) / 3600.0
+
+
+def _obliquity_poly(jd):
+    # Works for floats and NumPy arrays alike (arcseconds)
     T = (jd - 2451545.0) / 36525.0
-    eps_arcsec = (
+    return (
         84381.406
         - 46.836769 * T
         - 0.0001831 * (T ** 2)
@@ -24,7 +35,6 @@ def mean_obliquity_deg(jd: float) -> float:
         - 5.76e-7 * (T ** 4)
         - 4.34e-8 * (T ** 5)
     )
-    return eps_arcsec / 3600.0
 
 
 def equatorial_to_ecliptic(ra_deg: float, dec_deg: float, jd: float) -> Tuple[float, float]:
@@ -43,11 +53,83 @@ def equatorial_to_ecliptic(ra_deg: float, dec_deg: float, jd: float) -> Tuple[fl
     sin_beta = max(-1.0, min(1.0, sin_beta))
     beta = math.asin(sin_beta)
 
-    # longitude (lambda)
-    y = math.sin(ra) * math.cos(eps) + math.tan(dec) * math.sin(eps)
-    x = math.cos(ra)
+    # longitude (lambda): the textbook tan(dec) form multiplied through by cos(dec),
+    # so it stays finite at the poles (atan2 only needs the ratio)
+    y = math.sin(ra) * math.cos(eps) * math.cos(dec) + math.sin(dec) * math.sin(eps)
+    x = math.cos(ra) * math.cos(dec)
     lam = math.atan2(y, x)
 
     lon_deg = normalize_deg(math.degrees(lam))
     lat_deg = math.degrees(beta)
     return lon_deg, lat_deg
+
+
+# -----------------
+# Array variants
+# -----------------
+
+FloatArray = Sequence[float]  # NumPy array, array("d"), list...
+
+
+def mean_obliquity_deg_many(jds: FloatArray):
+    """mean_obliquity_deg over an array of JDs (NumPy array if available, else array('d'))."""
+    if np is not None:
+        return _obliquity_poly(np.asarray(jds, dtype=np.float64)) / 3600.0
+    return array("d", (mean_obliquity_deg(jd) for jd in jds))
+
+
+def equatorial_to_ecliptic_many(ra_deg: FloatArray, dec_deg: FloatArray, jd: Union[float, FloatArray]):
+    """
+    equatorial_to_ecliptic over arrays of RA/Dec (degrees), in one pass.
+
+    `jd` may be a single JD (whole catalog at one epoch) or one JD per element.
+    The obliquity and its sin/cos are computed once per distinct JD. Returns
+    (lon_deg, lat_deg) as NumPy arrays if NumPy is installed, else array('d').
+    """
+    if np is not None:
+        return _equatorial_to_ecliptic_numpy(ra_deg, dec_deg, jd)
+
+    per_element = not isinstance(jd, (int, float))
+    if per_element and len(jd) != len(ra_deg):
+        raise ValueError("jd must be a scalar or have the same length as ra/dec")
+    if len(ra_deg) != len(dec_deg):
+        raise ValueError("ra and dec must have the same length")
+    trig: Dict[float, Tuple[float, float]] = {}
+    lons, lats = array("d"), array("d")
+    for i, (ra_d, dec_d) in enumerate(zip(ra_deg, dec_deg)):
+        t = jd[i] if per_element else jd
+        se_ce = trig.get(t)
+        if se_ce is None:
+            eps = math.radians(mean_obliquity_deg(t))
+            se_ce = trig[t] = (math.sin(eps), math.cos(eps))
+        sin_eps, cos_eps = se_ce
+        ra, dec = math.radians(ra_d), math.radians(dec_d)
+        sin_ra, sin_dec, cos_dec = math.sin(ra), math.sin(dec), math.cos(dec)
+        sin_beta = max(-1.0, min(1.0, sin_dec * cos_eps - cos_dec * sin_eps * sin_ra))
+        lam = math.atan2(sin_ra * cos_eps * cos_dec + sin_dec * sin_eps, math.cos(ra) * cos_dec)
+        lons.append(normalize_deg(math.degrees(lam)))
+        lats.append(math.degrees(math.asin(sin_beta)))
+    return lons, lats
+
+
+def _equatorial_to_ecliptic_numpy(ra_deg, dec_deg, jd):
+    ra = np.radians(np.asarray(ra_deg, dtype=np.float64))
+    dec = np.radians(np.asarray(dec_deg, dtype=np.float64))
+    if ra.shape != dec.shape:
+        raise ValueError("ra and dec must have the same length")
+    jd_arr = np.asarray(jd, dtype=np.float64)
+    if jd_arr.ndim == 0:
+        eps = math.radians(mean_obliquity_deg(float(jd_arr)))
+        sin_eps, cos_eps = math.sin(eps), math.cos(eps)
+    else:
+        if jd_arr.shape != ra.shape:
+            raise ValueError("jd must be a scalar or have the same length as ra/dec")
+        # Dense time series repeat JDs: evaluate the obliquity trig once per distinct value
+        uniq, inv = np.unique(jd_arr, return_inverse=True)
+        eps = np.radians(_obliquity_poly(uniq) / 3600.0)
+        sin_eps, cos_eps = np.sin(eps)[inv], np.cos(eps)[inv]
+
+    sin_ra, sin_dec, cos_dec = np.sin(ra), np.sin(dec), np.cos(dec)
+    sin_beta = np.clip(sin_dec * cos_eps - cos_dec * sin_eps * sin_ra, -1.0, 1.0)
+    lam = np.arctan2(sin_ra * cos_eps * cos_dec + sin_dec * sin_eps, np.cos(ra) * cos_dec)
+    return np.mod(np.degrees(lam), 360.0), np.degrees(np.arcsin(sin_beta))
@@ -0,0 +1,280 @@
+"""
+Offline analytic Sun/Moon ephemeris (no Stellarium needed).
+
+- Sun: low-accuracy solar theory (Meeus, Astronomical Algorithms, ch. 25),
+  ~0.01 deg, apparent longitude (nutation + aberration included).
+- Moon: truncated ELP-2000/82 series (Meeus ch. 47, tables 47.A/47.B),
+  ~10" in longitude, apparent longitude (nutation in longitude added).
+
+Accuracy is far better than what tithi needs (12 deg per tithi; 0.01 deg of
+Moon-Sun elongation is ~1.5 minutes of time).
+
+Input JDs are UT by default (like Stellarium's `jday`); ΔT is applied with the
+Espenak & Meeus polynomials. Pass timescale="tt" if the JD is already TT/TD.
+"""
+from __future__ import annotations
+
+import math
+from array import array
+from typing import Sequence, Tuple
+
+try:  # optional: vectorized path
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on the environment
+    np = None
+
+from .coords import normalize_deg
+
+J2000 = 2451545.0
+_D2R = math.pi / 180.0
+
+# Table 47.A: (D, M, M', F, Σl [1e-6 deg])
+_MOON_LON_TERMS = (
+    (0, 0, 1, 0, 6288774), (2, 0, -1, 0, 1274027), (2, 0, 0, 0, 658314), (0, 0, 2, 0, 213618),
+    (0, 1, 0, 0, -185116), (0, 0, 0, 2, -114332), (2, 0, -2, 0, 58793), (2, -1, -1, 0, 57066),
+    (2, 0, 1, 0, 53322), (2, -1, 0, 0, 45758), (0, 1, -1, 0, -40923), (1, 0, 0, 0, -34720),
+    (0, 1, 1, 0, -30383), (2, 0, 0, -2, 15327), (0, 0, 1, 2, -12528), (0, 0, 1, -2, 10980),
+    (4, 0, -1, 0, 10675), (0, 0, 3, 0, 10034), (4, 0, -2, 0, 8548), (2, 1, -1, 0, -7888),
+    (2, 1, 0, 0, -6766), (1, 0, -1, 0, -5163), (1, 1, 0, 0, 4987), (2, -1, 1, 0, 4036),
+    (2, 0, 2, 0, 3994), (4, 0, 0, 0, 3861), (2, 0, -3, 0, 3665), (0, 1, -2, 0, -2689),
+    (2, 0, -1, 2, -2602), (2, -1, -2, 0, 2390), (1, 0, 1, 0, -2348), (2, -2, 0, 0, 2236),
+    (0, 1, 2, 0, -2120), (0, 2, 0, 0, -2069), (2, -2, -1, 0, 2048), (2, 0, 1, -2, -1773),
+    (2, 0, 0, 2, -1595), (4, -1, -1, 0, 1215), (0, 0, 2, 2, -1110), (3, 0, -1, 0, -892),
+    (2, 1, 1, 0, -810), (4, -1, -2, 0, 759), (0, 2, -1, 0, -713), (2, 2, -1, 0, -700),
+    (2, 1, -2, 0, 691), (2, -1, 0, -2, 596), (4, 0, 1, 0, 549), (0, 0, 4, 0, 537),
+    (4, -1, 0, 0, 520), (1, 0, -2, 0, -487), (2, 1, 0, -2, -399), (0, 0, 2, -2, -381),
+    (1, 1, 1, 0, 351), (3, 0, -2, 0, -340), (4, 0, -3, 0, 330), (2, -1, 2, 0, 327),
+    (0, 2, 1, 0, -323), (1, 1, -1, 0, 299), (2, 0, 3, 0, 294),
+)
+
+# Table 47.B: (D, M, M', F, Σb [1e-6 deg])
+_MOON_LAT_TERMS = (
+    (0, 0, 0, 1, 5128122), (0, 0, 1, 1, 280602), (0, 0, 1, -1, 277693), (2, 0, 0, -1, 173237),
+    (2, 0, -1, 1, 55413), (2, 0, -1, -1, 46271), (2, 0, 0, 1, 32573), (0, 0, 2, 1, 17198),
+    (2, 0, 1, -1, 9266), (0, 0, 2, -1, 8822), (2, -1, 0, -1, 8216), (2, 0, -2, -1, 4324),
+    (2, 0, 1, 1, 4200), (2, 1, 0, -1, -3359), (2, -1, -1, 1, 2463), (2, -1, 0, 1, 2211),
+    (2, -1, -1, -1, 2065), (0, 1, -1, -1, -1870), (4, 0, -1, -1, 1828), (0, 1, 0, 1, -1794),
+    (0, 0, 0, 3, -1749), (0, 1, -1, 1, -1565), (1, 0, 0, 1, -1491), (0, 1, 1, 1, -1475),
+    (0, 1, 1, -1, -1410), (0, 1, 0, -1, -1344), (1, 0, 0, -1, -1335), (0, 0, 3, 1, 1107),
+    (4, 0, 0, -1, 1021), (4, 0, -1, 1, 833), (0, 0, 1, -3, 777), (4, 0, -2, 1, 671),
+    (2, 0, 0, -3, 607), (2, 0, 2, -1, 596), (2, -1, 1, -1, 491), (2, 0, -2, 1, -451),
+    (0, 0, 3, -1, 439), (2, 0, 2, 1, 422), (2, 0, -3, -1, 421), (2, 1, -1, 1, -366),
+    (2, 1, 0, 1, -351), (4, 0, 0, 1, 331), (2, -1, 1, 1, 315), (2, -2, 0, -1, 302),
+    (0, 0, 1, 3, -283), (2, 1, 1, -1, -229), (1, 1, 0, -1, 223), (1, 1, 0, 1, 223),
+    (0, 1, -2, -1, -220), (2, 1, -1, -1, -220), (1, 0, 1, 1, -185), (2, -1, -2, -1, 181),
+    (0, 1, 2, 1, -177), (4, 0, -2, -1, 176), (4, -1, -1, -1, 166), (1, 0, 1, -1, -164),
+    (4, 0, 1, -1, 132), (1, 0, -1, -1, -119), (4, -1, 0, -1, 115), (2, -2, 0, 1, 107),
+)
+
+
+# ΔT = TT - UT (seconds): Espenak & Meeus polynomial fits as (from_year, to_year, fn).
+# The fns are plain arithmetic, so they work on floats and on NumPy arrays alike.
+_DELTA_T_SPANS = (
+    (1600, 1700, lambda y: 120 - 0.9808 * (y - 1600) - 0.01532 * (y - 1600) ** 2 + (y - 1600) ** 3 / 7129),
+    (1700, 1800, lambda y: 8.83 + 0.1603 * (y - 1700) - 0.0059285 * (y - 1700) ** 2
+        + 0.00013336 * (y - 1700) ** 3 - (y - 1700) ** 4 / 1174000),
+    (1800, 1860, lambda y: 13.72 - 0.332447 * (y - 1800) + 0.0068612 * (y - 1800) ** 2
+        + 0.0041116 * (y - 1800) ** 3 - 0.00037436 * (y - 1800) ** 4 + 0.0000121272 * (y - 1800) ** 5
+        - 0.0000001699 * (y - 1800) ** 6 + 0.000000000875 * (y - 1800) ** 7),
+    (1860, 1900, lambda y: 7.62 + 0.5737 * (y - 1860) - 0.251754 * (y - 1860) ** 2
+        + 0.01680668 * (y - 1860) ** 3 - 0.0004473624 * (y - 1860) ** 4 + (y - 1860) ** 5 / 233174),
+    (1900, 1920, lambda y: -2.79 + 1.494119 * (y - 1900) - 0.0598939 * (y - 1900) ** 2
+        + 0.0061966 * (y - 1900) ** 3 - 0.000197 * (y - 1900) ** 4),
+    (1920, 1941, lambda y: 21.20 + 0.84493 * (y - 1920) - 0.076100 * (y - 1920) ** 2 + 0.0020936 * (y - 1920) ** 3),
+    (1941, 1961, lambda y: 29.07 + 0.407 * (y - 1950) - (y - 1950) ** 2 / 233 + (y - 1950) ** 3 / 2547),
+    (1961, 1986, lambda y: 45.45 + 1.067 * (y - 1975) - (y - 1975) ** 2 / 260 - (y - 1975) ** 3 / 718),
+    (1986, 2005, lambda y: 63.86 + 0.3345 * (y - 2000) - 0.060374 * (y - 2000) ** 2 + 0.0017275 * (y - 2000) ** 3
+        + 0.000651814 * (y - 2000) ** 4 + 0.00002373599 * (y - 2000) ** 5),
+    (2005, 2050, lambda y: 62.92 + 0.32217 * (y - 2000) + 0.005589 * (y - 2000) ** 2),
+    (2050, 2150, lambda y: -20 + 32 * ((y - 1820) / 100) ** 2 - 0.5628 * (2150 - y)),
+)
+
+
+def _delta_t_long_term(y):
+    return -20 + 32 * ((y - 1820) / 100) ** 2
+
+
+def delta_t_seconds(year: float) -> float:
+    """ΔT = TT - UT in seconds (Espenak & Meeus; long-term parabola outside 1600-2150)."""
+    for lo, hi, fn in _DELTA_T_SPANS:
+        if lo <= year < hi:
+            return fn(year)
+    return _delta_t_long_term(year)
+
+
+def _to_tt(jd: float, timescale: str) -> float:
+    if timescale == "tt":
+        return jd
+    if timescale != "ut":
+        raise ValueError(f"timescale must be 'ut' or 'tt', got {timescale!r}")
+    year = 2000.0 + (jd - J2000) / 365.25
+    return jd + delta_t_seconds(year) / 86400.0
+
+
+def _nutation_lon_deg(T: float) -> float:
+    omega = (125.04452 - 1934.136261 * T) * _D2R
+    L = (280.4665 + 36000.7698 * T) * _D2R
+    Lp = (218.3165 + 481267.8813 * T) * _D2R
+    return (-17.20 * math.sin(omega) - 1.32 * math.sin(2 * L) - 0.23 * math.sin(2 * Lp) + 0.21 * math.sin(2 * omega)) / 3600.0
+
+
+def _sun_tt(jd_tt: float) -> Tuple[float, float]:
+    T = (jd_tt - J2000) / 36525.0
+    L0 = 280.46646 + 36000.76983 * T + 0.0003032 * T * T
+    M = (357.52911 + 35999.05029 * T - 0.0001537 * T * T) * _D2R
+    C = (
+        (1.914602 - 0.004817 * T - 0.000014 * T * T) * math.sin(M)
+        + (0.019993 - 0.000101 * T) * math.sin(2 * M)
+        + 0.000289 * math.sin(3 * M)
+    )
+    omega = (125.04 - 1934.136 * T) * _D2R
+    lon = L0 + C - 0.00569 - 0.00478 * math.sin(omega)
+    return normalize_deg(lon), 0.0
+
+
+def _moon_args(T: float) -> Tuple[float, float, float, float, float, float]:
+    T2, T3, T4 = T * T, T**3, T**4
+    Lp = 218.3164477 + 481267.88123421 * T - 0.0015786 * T2 + T3 / 538841 - T4 / 65194000
+    D = 297.8501921 + 445267.1114034 * T - 0.0018819 * T2 + T3 / 545868 - T4 / 113065000
+    M = 357.5291092 + 35999.0502909 * T - 0.0001536 * T2 + T3 / 24490000
+    Mp = 134.9633964 + 477198.8675055 * T + 0.0087414 * T2 + T3 / 69699 - T4 / 14712000
+    F = 93.2720950 + 483202.0175233 * T - 0.0036539 * T2 - T3 / 3526000 + T4 / 863310000
+    E = 1.0 - 0.002516 * T - 0.0000074 * T2
+    return Lp, D, M, Mp, F, E
+
+
+def _moon_tt(jd_tt: float) -> Tuple[float, float]:
+    T = (jd_tt - J2000) / 36525.0
+    Lp, D, M, Mp, F, E = _moon_args(T)
+    d, m, mp, f = D * _D2R, M * _D2R, Mp * _D2R, F * _D2R
+    e_pow = (1.0, E, E * E)
+
+    sl = 0.0
+    for cd, cm, cmp_, cf, coef in _MOON_LON_TERMS:
+        sl += coef * e_pow[abs(cm)] * math.sin(cd * d + cm * m + cmp_ * mp + cf * f)
+    sb = 0.0
+    for cd, cm, cmp_, cf, coef in _MOON_LAT_TERMS:
+        sb += coef * e_pow[abs(cm)] * math.sin(cd * d + cm * m + cmp_ * mp + cf * f)
+
+    a1 = (119.75 + 131.849 * T) * _D2R
+    a2 = (53.09 + 479264.290 * T) * _D2R
+    a3 = (313.45 + 481266.484 * T) * _D2R
+    lp = Lp * _D2R
+    sl += 3958 * math.sin(a1) + 1962 * math.sin(lp - f) + 318 * math.sin(a2)
+    sb += (
+        -2235 * math.sin(lp) + 382 * math.sin(a3) + 175 * math.sin(a1 - f) + 175 * math.sin(a1 + f)
+        + 127 * math.sin(lp - mp) - 115 * math.sin(lp + mp)
+    )
+    lon = Lp + sl / 1e6 + _nutation_lon_deg(T)
+    return normalize_deg(lon), sb / 1e6
+
+
+def sun_ecliptic(jd: float, *, timescale: str = "ut") -> Tuple[float, float]:
+    """Apparent geocentric ecliptic (lon, lat) of the Sun in degrees."""
+    return _sun_tt(_to_tt(jd, timescale))
+
+
+def moon_ecliptic(jd: float, *, timescale: str = "ut") -> Tuple[float, float]:
+    """Apparent geocentric ecliptic (lon, lat) of the Moon in degrees."""
+    return _moon_tt(_to_tt(jd, timescale))
+
+
+_BODIES = {"sun": _sun_tt, "moon": _moon_tt}
+
+
+def body_ecliptic(name: str, jd: float, *, timescale: str = "ut") -> Tuple[float, float]:
+    """(lon, lat) for 'Sun' or 'Moon' (case-insensitive)."""
+    try:
+        fn = _BODIES[name.lower()]
+    except KeyError:
+        raise ValueError(f"analytic engine only knows Sun and Moon, got {name!r}") from None
+    return fn(_to_tt(jd, timescale))
+
+
+# -----------------
+# Vectorized
+# -----------------
+
+def _sun_many_numpy(jd_tt):
+    T = (jd_tt - J2000) / 36525.0
+    L0 = 280.46646 + 36000.76983 * T + 0.0003032 * T * T
+    M = np.radians(357.52911 + 35999.05029 * T - 0.0001537 * T * T)
+    C = (
+        (1.914602 - 0.004817 * T - 0.000014 * T * T) * np.sin(M)
+        + (0.019993 - 0.000101 * T) * np.sin(2 * M)
+        + 0.000289 * np.sin(3 * M)
+    )
+    omega = np.radians(125.04 - 1934.136 * T)
+    return np.mod(L0 + C - 0.00569 - 0.00478 * np.sin(omega), 360.0), np.zeros_like(T)
+
+
+def _series_numpy(terms, d, m, mp, f, E):
+    t = np.asarray(terms, dtype=np.float64)
+    arg = np.outer(d, t[:, 0]) + np.outer(m, t[:, 1]) + np.outer(mp, t[:, 2]) + np.outer(f, t[:, 3])
+    e_fac = np.where(t[:, 1] == 0, 1.0, np.where(np.abs(t[:, 1]) == 1, E[:, None], (E * E)[:, None]))
+    return (np.sin(arg) * e_fac) @ t[:, 4]
+
+
+def _moon_many_numpy(jd_tt):
+    T = (jd_tt - J2000) / 36525.0
+    T2, T3, T4 = T * T, T**3, T**4
+    Lp = 218.3164477 + 481267.88123421 * T - 0.0015786 * T2 + T3 / 538841 - T4 / 65194000
+    D = 297.8501921 + 445267.1114034 * T - 0.0018819 * T2 + T3 / 545868 - T4 / 113065000
+    M = 357.5291092 + 35999.0502909 * T - 0.0001536 * T2 + T3 / 24490000
+    Mp = 134.9633964 + 477198.8675055 * T + 0.0087414 * T2 + T3 / 69699 - T4 / 14712000
+    F = 93.2720950 + 483202.0175233 * T - 0.0036539 * T2 - T3 / 3526000 + T4 / 863310000
+    E = 1.0 - 0.002516 * T - 0.0000074 * T2
+    d, m, mp, f, lp = (np.radians(x) for x in (D, M, Mp, F, Lp))
+
+    sl = _series_numpy(_MOON_LON_TERMS, d, m, mp, f, E)
+    sb = _series_numpy(_MOON_LAT_TERMS, d, m, mp, f, E)
+    a1 = np.radians(119.75 + 131.849 * T)
+    a2 = np.radians(53.09 + 479264.290 * T)
+    a3 = np.radians(313.45 + 481266.484 * T)
+    sl += 3958 * np.sin(a1) + 1962 * np.sin(lp - f) + 318 * np.sin(a2)
+    sb += (
+        -2235 * np.sin(lp) + 382 * np.sin(a3) + 175 * np.sin(a1 - f) + 175 * np.sin(a1 + f)
+        + 127 * np.sin(lp - mp) - 115 * np.sin(lp + mp)
+    )
+    omega = np.radians(125.04452 - 1934.136261 * T)
+    L = np.radians(280.4665 + 36000.7698 * T)
+    dpsi = (-17.20 * np.sin(omega) - 1.32 * np.sin(2 * L) - 0.23 * np.sin(2 * lp) + 0.21 * np.sin(2 * omega)) / 3600.0
+    return np.mod(Lp + sl / 1e6 + dpsi, 360.0), sb / 1e6
+
+
+_BODIES_NUMPY = {"sun": _sun_many_numpy, "moon": _moon_many_numpy}
+_NUMPY_CHUNK = 65536  # bounds the (n_jd x n_terms) temporaries of the series
+
+
+def _delta_t_numpy(years):
+    conds = [(years >= lo) & (years < hi) for lo, hi, _ in _DELTA_T_SPANS]
+    values = [fn(years) for _, _, fn in _DELTA_T_SPANS]
+    return np.select(conds, values, default=_delta_t_long_term(years))
+
+
+def ecliptic_many(name: str, jds: Sequence[float], *, timescale: str = "ut"):
+    """
+    Vectorized `body_ecliptic` for a sequence of JDs.
+
+    Returns (lon, lat) as NumPy arrays if NumPy is installed, else `array('d')`.
+    """
+    key = name.lower()
+    if key not in _BODIES:
+        raise ValueError(f"analytic engine only knows Sun and Moon, got {name!r}")
+    if np is not None:
+        jd = np.asarray(jds, dtype=np.float64)
+        if timescale == "ut":
+            jd = jd + _delta_t_numpy(2000.0 + (jd - J2000) / 365.25) / 86400.0
+        elif timescale != "tt":
+            raise ValueError(f"timescale must be 'ut' or 'tt', got {timescale!r}")
+        fn_np = _BODIES_NUMPY[key]
+        parts = [fn_np(jd[i:i + _NUMPY_CHUNK]) for i in range(0, len(jd), _NUMPY_CHUNK)] or [fn_np(jd)]
+        return np.concatenate([p[0] for p in parts]), np.concatenate([p[1] for p in parts])
+
+    fn = _BODIES[key]
+    lons, lats = array("d"), array("d")
+    for jd in jds:
+        lon, lat = fn(_to_tt(jd, timescale))
+        lons.append(lon)
+        lats.append(lat)
+    return lons, lats
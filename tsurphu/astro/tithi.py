@@ -0,0 +1,172 @@
+"""
+Tithi boundary search.
+
+A tithi ends each time the Moon-Sun elongation crosses a multiple of 12 deg.
+Instead of sampling, each crossing is predicted from the current elongation
+rate and refined with a safeguarded secant step (bisection fallback), so a
+boundary usually costs 3-4 ephemeris evaluations.
+
+Positions come from a pluggable source: anything with
+`sun_moon_lon(jd) -> (sun_lon_deg, moon_lon_deg)`; see AnalyticPositionSource
+(offline series) and StellariumPositionSource (RemoteControl client).
+"""
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, field
+from typing import List, Optional, Protocol, Tuple
+
+from .coords import equatorial_to_ecliptic
+from .ephemeris import moon_ecliptic, sun_ecliptic
+
+TITHI_DEG = 12.0
+MEAN_ELONGATION_RATE = 360.0 / 29.530588853  # deg/day (mean synodic month)
+
+
+class PositionSource(Protocol):
+    def sun_moon_lon(self, jd: float) -> Tuple[float, float]:
+        """Ecliptic longitudes (deg) of the Sun and Moon at `jd` (UT)."""
+        ...
+
+
+class AnalyticPositionSource:
+    """Offline source (tsurphu.astro.ephemeris)."""
+
+    def sun_moon_lon(self, jd: float) -> Tuple[float, float]:
+        return sun_ecliptic(jd)[0], moon_ecliptic(jd)[0]
+
+
+class StellariumPositionSource:
+    """Source backed by a StellariumRemoteControlClient (one set_time + 2 bodies per evaluation)."""
+
+    def __init__(self, client) -> None:
+        self.client = client
+
+    def _lon(self, name: str, info: dict, jd: float) -> float:
+        try:
+            ra, dec = float(info["ra"]), float(info["dec"])
+        except (KeyError, TypeError, ValueError):
+            raise RuntimeError(f"No RA/Dec for {name}. Got keys: {list(info.keys())}") from None
+        return equatorial_to_ecliptic(ra, dec, jd)[0]
+
+    def sun_moon_lon(self, jd: float) -> Tuple[float, float]:
+        self.client.set_time_jd(jd, 0)
+        infos = self.client.object_info_many(["Sun", "Moon"])
+        return self._lon("Sun", infos.get("Sun") or {}, jd), self._lon("Moon", infos.get("Moon") or {}, jd)
+
+
+@dataclass(frozen=True)
+class TithiInterval:
+    tithi: int       # 1..30
+    start_jd: float
+    end_jd: float
+
+
+@dataclass
+class TithiSearchResult:
+    intervals: List[TithiInterval] = field(default_factory=list)
+    evaluations: int = 0
+    boundaries: int = 0
+
+    @property
+    def evaluations_per_boundary(self) -> float:
+        return self.evaluations / self.boundaries if self.boundaries else 0.0
+
+
+def _wrap180(deg: float) -> float:
+    return (deg + 180.0) % 360.0 - 180.0
+
+
+class _Elongation:
+    """Unwrapped elongation around a reference point; counts source evaluations."""
+
+    def __init__(self, source: PositionSource) -> None:
+        self.source = source
+        self.evaluations = 0
+
+    def raw(self, jd: float) -> float:
+        self.evaluations += 1
+        sun, moon = self.source.sun_moon_lon(jd)
+        return (moon - sun) % 360.0
+
+    def unwrapped(self, jd: float, ref_value: float) -> float:
+        # Valid while |elongation(jd) - ref_value| < 180 deg (~14 days away at most)
+        return ref_value + _wrap180(self.raw(jd) - ref_value)
+
+
+def _solve_crossing(
+    el: _Elongation,
+    target: float,
+    t_ref: float,
+    u_ref: float,
+    rate: float,
+    tol_days: float,
+    max_iter: int = 40,
+) -> Tuple[float, float]:
+    """Find t with unwrapped elongation == target; returns (t, local rate deg/day)."""
+    # Bracket [lo, hi] with f(lo) < 0 < f(hi), filled in as points are seen
+    lo: Optional[float] = None
+    hi: Optional[float] = None
+    f_ref = u_ref - target
+    if f_ref < 0:
+        lo = t_ref
+    else:
+        hi = t_ref
+
+    t0, f0 = t_ref, f_ref
+    t1 = t_ref - f_ref / rate
+    for _ in range(max_iter):
+        f1 = el.unwrapped(t1, target) - target
+        if f1 < 0:
+            lo = t1 if lo is None or t1 > lo else lo
+        else:
+            hi = t1 if hi is None or t1 < hi else hi
+        if t1 != t0 and f1 != f0:
+            rate = (f1 - f0) / (t1 - t0)
+        t_next = t1 - f1 / rate if rate > 0 else t1 - f1 / MEAN_ELONGATION_RATE
+        if lo is not None and hi is not None and not (lo < t_next < hi):
+            t_next = 0.5 * (lo + hi)  # the secant left the bracket: bisect instead
+        if abs(t_next - t1) < tol_days or f1 == 0.0:
+            return t_next, rate
+        t0, f0, t1 = t1, f1, t_next
+    raise RuntimeError(f"tithi boundary search did not converge near JD {t1}")
+
+
+def find_tithi_intervals(
+    source: PositionSource,
+    jd_start: float,
+    jd_end: float,
+    *,
+    tol_seconds: float = 1.0,
+) -> TithiSearchResult:
+    """
+    Every tithi interval overlapping [jd_start, jd_end], with exact start/end JDs.
+
+    The first and last intervals are complete (their boundaries may fall
+    outside the range). `evaluations` counts calls to the position source.
+    """
+    if jd_end < jd_start:
+        raise ValueError("jd_end must be >= jd_start")
+    el = _Elongation(source)
+    tol_days = tol_seconds / 86400.0
+
+    u0 = el.raw(jd_start)
+    start_target = math.floor(u0 / TITHI_DEG) * TITHI_DEG
+    t_prev, rate = _solve_crossing(el, start_target, jd_start, u0, MEAN_ELONGATION_RATE, tol_days)
+
+    result = TithiSearchResult()
+    result.boundaries = 1
+    target = start_target + TITHI_DEG
+    t_ref, u_ref = t_prev, start_target
+    while True:
+        t_b, rate = _solve_crossing(el, target, t_ref, u_ref, rate, tol_days)
+        result.boundaries += 1
+        tithi = int(round(target / TITHI_DEG) - 1) % 30 + 1
+        result.intervals.append(TithiInterval(tithi=tithi, start_jd=t_prev, end_jd=t_b))
+        if t_b > jd_end:
+            break
+        t_prev, t_ref, u_ref = t_b, t_b, target
+        target += TITHI_DEG
+
+    result.evaluations = el.evaluations
+    return result
@@ -0,0 +1,242 @@
+"""Caché de efemérides entre los scripts y Stellarium RemoteControl.
+
+Clave: (cuerpo, JD cuantizado a `jd_tolerance_s`, ubicación del observador).
+Valor: la respuesta de `object_info` tal cual (dict JSON).
+
+- LRU en memoria (`lru_size` entradas) delante de un SQLite en disco.
+- `CachingStellariumClient` envuelve al cliente: set_location / set_time_jd /
+  focus quedan pendientes y solo se envían a Stellarium ante un *miss*, así que
+  repetir un reporte sobre el mismo rango no genera tráfico.
+- `stats` lleva hits (memoria/disco) y misses; `warm(...)` precarga un rango.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Sequence, Tuple
+
+Location = Tuple[float, float, float, str]  # (lat, lon, alt_m, planet)
+_Key = Tuple[str, int, str]
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0        # memoria
+    disk_hits: int = 0
+    misses: int = 0
+    stores: int = 0
+
+    @property
+    def lookups(self) -> int:
+        return self.hits + self.disk_hits + self.misses
+
+    @property
+    def hit_rate(self) -> float:
+        return (self.hits + self.disk_hits) / self.lookups if self.lookups else 0.0
+
+
+def _location_key(loc: Location) -> str:
+    lat, lon, alt, planet = loc
+    return f"{lat:.6f},{lon:.6f},{alt:.1f},{planet}"
+
+
+class EphemerisCache:
+    """LRU en memoria + SQLite opcional (path=None: solo memoria)."""
+
+    def __init__(
+        self,
+        path: str | Path | None = None,
+        *,
+        jd_tolerance_s: float = 1.0,
+        lru_size: int = 4096,
+        commit_every: int = 256,
+    ) -> None:
+        if jd_tolerance_s <= 0:
+            raise ValueError("jd_tolerance_s debe ser > 0")
+        self.jd_tolerance_s = jd_tolerance_s
+        self.lru_size = lru_size
+        self.commit_every = commit_every
+        self.stats = CacheStats()
+        self._lru: "OrderedDict[_Key, Dict[str, Any]]" = OrderedDict()
+        self._uncommitted = 0
+        self._db: Optional[sqlite3.Connection] = None
+        if path is not None:
+            self._db = sqlite3.connect(str(path))
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS ephemeris ("
+                " body TEXT NOT NULL, tol_s REAL NOT NULL, jdq INTEGER NOT NULL, loc TEXT NOT NULL,"
+                " info TEXT NOT NULL, PRIMARY KEY (body, tol_s, jdq, loc))"
+            )
+            self._db.commit()
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.commit()
+            self._db.close()
+            self._db = None
+
+    def __enter__(self) -> "EphemerisCache":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def key(self, body: str, jd: float, location: Location) -> _Key:
+        jdq = round(jd * 86400.0 / self.jd_tolerance_s)
+        return body, jdq, _location_key(location)
+
+    def get(self, body: str, jd: float, location: Location) -> Optional[Dict[str, Any]]:
+        k = self.key(body, jd, location)
+        info = self._lru.get(k)
+        if info is not None:
+            self._lru.move_to_end(k)
+            self.stats.hits += 1
+            return dict(info)
+        if self._db is not None:
+            row = self._db.execute(
+                "SELECT info FROM ephemeris WHERE body=? AND tol_s=? AND jdq=? AND loc=?",
+                (k[0], self.jd_tolerance_s, k[1], k[2]),
+            ).fetchone()
+            if row is not None:
+                info = json.loads(row[0])
+                self._remember(k, info)
+                self.stats.disk_hits += 1
+                return dict(info)
+        self.stats.misses += 1
+        return None
+
+    def put(self, body: str, jd: float, location: Location, info: Dict[str, Any]) -> None:
+        k = self.key(body, jd, location)
+        self._remember(k, dict(info))
+        self.stats.stores += 1
+        if self._db is not None:
+            self._db.execute(
+                "INSERT OR REPLACE INTO ephemeris (body, tol_s, jdq, loc, info) VALUES (?, ?, ?, ?, ?)",
+                (k[0], self.jd_tolerance_s, k[1], k[2], json.dumps(info, ensure_ascii=False)),
+            )
+            self._uncommitted += 1
+            if self._uncommitted >= self.commit_every:
+                self._db.commit()
+                self._uncommitted = 0
+
+    def _remember(self, k: _Key, info: Dict[str, Any]) -> None:
+        self._lru[k] = info
+        self._lru.move_to_end(k)
+        while len(self._lru) > self.lru_size:
+            self._lru.popitem(last=False)
+
+    def warm(
+        self,
+        client: Any,
+        jds: Iterable[float],
+        bodies: Sequence[str],
+        *,
+        latitude: float,
+        longitude: float,
+        altitude_m: float = 0.0,
+        planet: str = "Earth",
+    ) -> int:
+        """Precarga (cuerpo × JD) para una ubicación; solo consulta lo que falta. Devuelve # de fetches."""
+        c = CachingStellariumClient(client, self)
+        c.set_location(latitude=latitude, longitude=longitude, altitude_m=altitude_m, planet=planet)
+        before = self.stats.misses
+        for jd in jds:
+            c.set_time_jd(jd, 0)
+            c.object_info_many(bodies)
+        return self.stats.misses - before
+
+
+def _has_coords(info: Optional[Dict[str, Any]]) -> bool:
+    """Solo se guarda info con RA/Dec: una respuesta sin coordenadas (p. ej. la de un
+    Stellarium que pide focus antes) quedaría servida para siempre desde el caché."""
+    return info is not None and info.get("ra") is not None and info.get("dec") is not None
+
+
+class CachingStellariumClient:
+    """Envuelve un StellariumRemoteControlClient y sirve object_info desde el caché.
+
+    El estado (ubicación, tiempo, focus) se registra localmente y se envía a
+    Stellarium solo cuando hace falta consultar de verdad (miss).
+    """
+
+    def __init__(self, client: Any, cache: EphemerisCache, *, focus: bool = True) -> None:
+        self.client = client
+        self.cache = cache
+        self.send_focus = focus
+        self._location: Optional[Location] = None
+        self._jd: Optional[float] = None
+        self._pending_location: Optional[Dict[str, Any]] = None
+        self._pending_time: Optional[Tuple[float, Optional[float]]] = None
+        self._pending_focus: Optional[Tuple[str, str]] = None
+
+    def set_location(self, latitude: float, longitude: float, altitude_m: float = 0.0,
+                     name: str = "", country: str = "", planet: str = "Earth") -> None:
+        self._location = (latitude, longitude, altitude_m, planet)
+        self._pending_location = dict(latitude=latitude, longitude=longitude, altitude_m=altitude_m,
+                                      name=name, country=country, planet=planet)
+
+    def set_time_jd(self, jd: float, timerate_jd_per_sec: Optional[float] = None) -> None:
+        self._jd = jd
+        self._pending_time = (jd, timerate_jd_per_sec)
+
+    def focus(self, target: str, mode: str = "center") -> None:
+        self._pending_focus = (target, mode)
+
+    def _sync(self) -> None:
+        if self._pending_location is not None:
+            self.client.set_location(**self._pending_location)
+            self._pending_location = None
+        if self._pending_time is not None:
+            self.client.set_time_jd(*self._pending_time)
+            self._pending_time = None
+
+    def object_info(self, name: str, format: str = "json") -> Dict[str, Any]:
+        cacheable = format == "json" and self._jd is not None and self._location is not None
+        if cacheable:
+            info = self.cache.get(name, self._jd, self._location)  # type: ignore[arg-type]
+            if info is not None:
+                return info
+        self._sync()
+        if self.send_focus and self._pending_focus is not None and self._pending_focus[0] == name:
+            self.client.focus(*self._pending_focus)
+            self._pending_focus = None
+        info = self.client.object_info(name, format=format)
+        if cacheable and _has_coords(info):
+            self.cache.put(name, self._jd, self._location, info)  # type: ignore[arg-type]
+        return info
+
+    def object_info_many(self, names: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        out: Dict[str, Dict[str, Any]] = {}
+        missing = []
+        for name in names:
+            info = self.cache.get(name, self._jd, self._location) if self._jd is not None and self._location else None
+            if info is None:
+                missing.append(name)
+            else:
+                out[name] = info
+        if missing:
+            self._sync()
+            fetched = self.client.object_info_many(missing)
+            for name, info in fetched.items():
+                if _has_coords(info) and self._jd is not None and self._location is not None:
+                    self.cache.put(name, self._jd, self._location, info)
+                out[name] = info
+        return {name: out[name] for name in names if name in out}
+
+    def status(self) -> Dict[str, Any]:
+        self._sync()
+        return self.client.status()
+
+    def object_find(self, query: str, format: str = "json") -> Dict[str, Any]:
+        return self.client.object_find(query, format=format)
+
+    def ping(self) -> bool:
+        return self.client.ping()
+
+    def close(self) -> None:
+        self.client.close()
@@ -0,0 +1,160 @@
+"""Pool de varias instancias de Stellarium para trabajos en paralelo.
+
+El reloj y la ubicación de Stellarium son globales por instancia, así que un
+cliente no puede atender fechas concurrentes. El pool levanta un hilo por
+endpoint (`StellariumRCConfig`), cada uno con su propio cliente:
+
+- los trabajos salen de una cola compartida (el reparto se balancea solo);
+- cada trabajo corre entero en UNA instancia (set-location/set-time/consultas);
+- si un trabajo falla y la instancia ya no responde `ping()`, la instancia sale
+  del pool y el trabajo vuelve a la cola para otra;
+- los resultados se entregan en el orden de entrada, apenas están listos.
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from tsurphu.integraciones.stellarium_rc import StellariumRCConfig, StellariumRCError, StellariumRemoteControlClient
+
+Location = Tuple[float, float, str, str]  # (lat, lon, name, country)
+
+
+@dataclass
+class PoolWorker:
+    """Una instancia de Stellarium dentro del pool (su cliente y su ubicación actual)."""
+
+    config: StellariumRCConfig
+    client: Any
+    location: Optional[Location] = None
+    jobs_done: int = 0
+    alive: bool = True
+
+    @property
+    def endpoint(self) -> str:
+        return f"{self.config.host}:{self.config.port}"
+
+    def ensure_location(self, loc: Location) -> None:
+        """set_location solo si la instancia no está ya en `loc`."""
+        if self.location != loc:
+            lat, lon, name, country = loc
+            self.client.set_location(latitude=lat, longitude=lon, name=name, country=country)
+            self.location = loc
+
+
+@dataclass
+class PoolResult:
+    index: int
+    job: Any
+    endpoint: Optional[str] = None
+    value: Any = None
+    error: Optional[BaseException] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class _Outcome:
+    index: int
+    worker: PoolWorker
+    value: Any = None
+    error: Optional[BaseException] = None
+    requeue: bool = False  # la instancia murió: el trabajo no cuenta como hecho
+
+
+class StellariumPool:
+    """Reparte trabajos `fn(worker, job)` entre varias instancias de Stellarium."""
+
+    def __init__(
+        self,
+        configs: Sequence[StellariumRCConfig],
+        *,
+        client_factory: Callable[[StellariumRCConfig], Any] = StellariumRemoteControlClient,
+    ) -> None:
+        if not configs:
+            raise ValueError("StellariumPool necesita al menos un endpoint")
+        self.workers: List[PoolWorker] = [PoolWorker(cfg, client_factory(cfg)) for cfg in configs]
+
+    def close(self) -> None:
+        for w in self.workers:
+            w.client.close()
+
+    def __enter__(self) -> "StellariumPool":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    @property
+    def live_endpoints(self) -> List[str]:
+        return [w.endpoint for w in self.workers if w.alive]
+
+    def _worker_loop(self, w: PoolWorker, fn: Callable[[PoolWorker, Any], Any], jobs: List[Any],
+                     todo: "queue.Queue[Optional[int]]", done: "queue.Queue[_Outcome]") -> None:
+        while True:
+            i = todo.get()
+            if i is None:
+                return
+            try:
+                value = fn(w, jobs[i])
+            except Exception as e:
+                if not w.client.ping():
+                    w.alive = False
+                    done.put(_Outcome(i, w, error=e, requeue=True))
+                    return
+                done.put(_Outcome(i, w, error=e))
+            else:
+                w.jobs_done += 1
+                done.put(_Outcome(i, w, value=value))
+
+    def imap(self, fn: Callable[[PoolWorker, Any], Any], jobs: Iterable[Any]) -> Iterator[PoolResult]:
+        """Corre `fn(worker, job)` para cada trabajo; entrega PoolResult en el orden de `jobs`."""
+        jobs = list(jobs)
+        todo: "queue.Queue[Optional[int]]" = queue.Queue()
+        done: "queue.Queue[_Outcome]" = queue.Queue()
+        for i in range(len(jobs)):
+            todo.put(i)
+
+        live = [w for w in self.workers if w.alive and w.client.ping()]
+        for w in self.workers:
+            w.alive = w in live
+        threads = [
+            threading.Thread(target=self._worker_loop, args=(w, fn, jobs, todo, done), daemon=True) for w in live
+        ]
+        for t in threads:
+            t.start()
+
+        ready: Dict[int, PoolResult] = {}
+        next_i = 0
+        n_live = len(threads)
+        try:
+            while next_i < len(jobs):
+                if n_live == 0:
+                    # Sin instancias: lo que quede falla de forma explícita
+                    err = StellariumRCError("ninguna instancia de Stellarium responde")
+                    for i in range(next_i, len(jobs)):
+                        ready.setdefault(i, PoolResult(i, jobs[i], error=err))
+                else:
+                    o = done.get()
+                    if o.requeue:
+                        n_live -= 1
+                        todo.put(o.index)
+                        continue
+                    ready[o.index] = PoolResult(o.index, jobs[o.index], o.worker.endpoint, o.value, o.error)
+                while next_i in ready:
+                    yield ready.pop(next_i)
+                    next_i += 1
+        finally:
+            # Si el consumidor cortó antes, descartar lo pendiente y liberar los hilos
+            while True:
+                try:
+                    todo.get_nowait()
+                except queue.Empty:
+                    break
+            for _ in threads:
+                todo.put(None)
@@ -15,17 +15,19 @@ Referencia (RemoteControl API):
 - La API está disponible bajo el prefijo `/api/`.
 - Ejemplo clave: GET /api/main/status
 
-Nota: Este cliente usa SOLO librería estándar de Python (urllib).
+Nota: Este cliente usa SOLO librería estándar de Python (http.client, con
+una conexión keep-alive persistente por cliente).
 """
 
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Sequence
 
+import http.client
 import json
+import time
 import urllib.parse
-import urllib.request
 
 
 class StellariumRCError(RuntimeError):
@@ -37,17 +39,163 @@ class StellariumRCConfig:
     host: str = "127.0.0.1"
     port: int = 8090
     timeout_s: float = 2.5
+    # Reintentos (solo GET, que es idempotente) con backoff exponencial acotado
+    retries: int = 2
+    backoff_s: float = 0.05
+    backoff_max_s: float = 1.0
 
     @property
     def base_url(self) -> str:
         return f"http://{self.host}:{self.port}".rstrip("/")
 
 
+@dataclass
+class EndpointStats:
+    """Contadores de latencia por endpoint (path sin query string)."""
+    requests: int = 0
+    errors: int = 0
+    retries: int = 0
+    total_s: float = 0.0
+    max_s: float = 0.0
+
+    @property
+    def mean_s(self) -> float:
+        return self.total_s / self.requests if self.requests else 0.0
+
+
+# Errores típicos de un socket keep-alive que el servidor ya cerró
+_STALE_ERRORS = (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError, ConnectionAbortedError)
+
+
+class KeepAliveTransport:
+    """Transporte HTTP/1.1 sobre una `http.client.HTTPConnection` persistente.
+
+    - Reusa la conexión entre llamadas (keep-alive).
+    - Si un socket reusado resultó estar cerrado, reconecta y reenvía una vez.
+    - Los GET se reintentan con backoff acotado ante fallos de red.
+    - Lleva contadores de latencia por endpoint en `stats`.
+
+    No es thread-safe: usar un transporte (cliente) por hilo.
+    """
+
+    def __init__(self, config: StellariumRCConfig) -> None:
+        self.config = config
+        self.stats: Dict[str, EndpointStats] = {}
+        self.connections_opened = 0
+        self._conn: Optional[http.client.HTTPConnection] = None
+        self._reused = False
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _connection(self) -> http.client.HTTPConnection:
+        if self._conn is None:
+            self._conn = http.client.HTTPConnection(self.config.host, self.config.port, timeout=self.config.timeout_s)
+            self.connections_opened += 1
+            self._reused = False
+        return self._conn
+
+    def _send_once(self, method: str, url: str, body: Optional[bytes], headers: Dict[str, str]) -> tuple[int, bytes]:
+        conn = self._connection()
+        reused = self._reused
+        try:
+            conn.request(method, url, body=body, headers=headers)
+            resp = conn.getresponse()
+            raw = resp.read()
+        except _STALE_ERRORS:
+            self.close()
+            if not reused:
+                raise
+            # El servidor cerró el socket keep-alive entre llamadas: una conexión nueva y reenviar
+            conn = self._connection()
+            try:
+                conn.request(method, url, body=body, headers=headers)
+                resp = conn.getresponse()
+                raw = resp.read()
+            except Exception:
+                self.close()
+                raise
+        except Exception:
+            self.close()
+            raise
+        if resp.will_close:
+            self.close()
+        else:
+            self._reused = True
+        return resp.status, raw
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        *,
+        query: str = "",
+        body: Optional[bytes] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> bytes:
+        """Envía la petición y devuelve el cuerpo; levanta StellariumRCError si falla."""
+        stats = self.stats.setdefault(path, EndpointStats())
+        url = path + ("?" + query if query else "")
+        attempts = 1 + (self.config.retries if method == "GET" else 0)
+        delay = self.config.backoff_s
+        last_exc: Optional[Exception] = None
+        for attempt in range(attempts):
+            if attempt:
+                stats.retries += 1
+                time.sleep(delay)
+                delay = min(delay * 2, self.config.backoff_max_s)
+            t0 = time.perf_counter()
+            try:
+                status, raw = self._send_once(method, url, body, headers or {})
+            except (OSError, http.client.HTTPException) as e:
+                last_exc = e
+                continue
+            finally:
+                dt = time.perf_counter() - t0
+                stats.requests += 1
+                stats.total_s += dt
+                stats.max_s = max(stats.max_s, dt)
+            if status >= 400:
+                stats.errors += 1
+                raise StellariumRCError(f"HTTP {status} desde {self.config.base_url}{url}: {raw[:200]!r}")
+            return raw
+        stats.errors += 1
+        raise StellariumRCError(
+            f"No pude conectar con Stellarium RemoteControl en {self.config.base_url}. "
+            f"¿Stellarium está abierto y el plugin RemoteControl está activo? Detalle: {last_exc}"
+        ) from last_exc
+
+
+def _has_radec(info: Dict[str, Any]) -> bool:
+    return isinstance(info, dict) and info.get("ra") is not None and info.get("dec") is not None
+
+
 class StellariumRemoteControlClient:
     """Cliente HTTP para el plugin RemoteControl de Stellarium."""
 
     def __init__(self, config: StellariumRCConfig | None = None) -> None:
         self.config = config or StellariumRCConfig()
+        self._transport = KeepAliveTransport(self.config)
+        # ¿Esta versión de RemoteControl solo da RA/Dec del objeto enfocado?
+        # None = aún no se sabe (se detecta en object_info_many).
+        self.needs_focus: Optional[bool] = None
+
+    def close(self) -> None:
+        """Cierra la conexión keep-alive (se reabre sola en la próxima llamada)."""
+        self._transport.close()
+
+    def __enter__(self) -> "StellariumRemoteControlClient":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    @property
+    def stats(self) -> Dict[str, EndpointStats]:
+        """Latencias por endpoint acumuladas por el transporte."""
+        return self._transport.stats
 
     # -----------------
     # Bajo nivel
@@ -58,41 +206,29 @@ class StellariumRemoteControlClient:
         return self.config.base_url + path
 
     def _get_json(self, path: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        url = self._url(path)
-        if params:
-            qs = urllib.parse.urlencode({k: str(v) for k, v in params.items()})
-            url = url + ("&" if "?" in url else "?") + qs
-
-        req = urllib.request.Request(url=url, method="GET")
-        try:
-            with urllib.request.urlopen(req, timeout=self.config.timeout_s) as resp:
-                raw = resp.read().decode("utf-8")
-        except Exception as e:
-            raise StellariumRCError(
-                f"No pude conectar con Stellarium RemoteControl en {self.config.base_url}. "
-                f"¿Stellarium está abierto y el plugin RemoteControl está activo? Detalle: {e}"
-            ) from e
+        path = "/" + path.lstrip("/")
+        qs = urllib.parse.urlencode({k: str(v) for k, v in params.items()}) if params else ""
+        raw = self._transport.request("GET", path, query=qs).decode("utf-8")
 
         try:
             return json.loads(raw)
         except Exception as e:
+            url = self._url(path) + ("?" + qs if qs else "")
             raise StellariumRCError(f"Respuesta no-JSON desde {url}: {raw[:200]!r}") from e
 
     def _post_form(self, path: str, data: Dict[str, Any]) -> None:
         """POST con x-www-form-urlencoded (lo que espera el plugin)."""
-        url = self._url(path)
+        path = "/" + path.lstrip("/")
         body = urllib.parse.urlencode({k: str(v) for k, v in data.items()}).encode("utf-8")
-        req = urllib.request.Request(
-            url=url,
-            data=body,
-            method="POST",
-            headers={"Content-Type": "application/x-www-form-urlencoded"},
-        )
         try:
-            with urllib.request.urlopen(req, timeout=self.config.timeout_s) as resp:
-                _ = resp.read()
-        except Exception as e:
-            raise StellariumRCError(f"POST falló hacia {url} con data={data}. Detalle: {e}") from e
+            self._transport.request(
+                "POST",
+                path,
+                body=body,
+                headers={"Content-Type": "application/x-www-form-urlencoded"},
+            )
+        except StellariumRCError as e:
+            raise StellariumRCError(f"POST falló hacia {self._url(path)} con data={data}. Detalle: {e}") from e
 
     # -----------------
     # Alto nivel
@@ -159,6 +295,31 @@ class StellariumRemoteControlClient:
         """
         return self._get_json("/api/objects/info", {"format": format, "name": name})
 
+    def object_info_many(self, names: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        """object_info de varios cuerpos sin mover el foco (solo GETs).
+
+        Algunas versiones de RemoteControl omiten RA/Dec si el objeto no está
+        seleccionado: en ese caso (y solo entonces) se hace focus + info, y desde
+        ahí el cliente enfoca siempre (`needs_focus = True`).
+        """
+        out: Dict[str, Dict[str, Any]] = {}
+        for name in names:
+            if self.needs_focus:
+                self.focus(name)
+                out[name] = self.object_info(name)
+                continue
+            info = self.object_info(name)
+            if not _has_radec(info):
+                self.focus(name)
+                focused = self.object_info(name)
+                if _has_radec(focused):
+                    self.needs_focus = True
+                    info = focused
+            elif self.needs_focus is None:
+                self.needs_focus = False
+            out[name] = info
+        return out
+
     def object_find(self, query: str, format: str = "json") -> Dict[str, Any]:
         """Búsqueda por substring.
 
@@ -0,0 +1,213 @@
+"""Cliente asyncio para Stellarium RemoteControl.
+
+Mismos métodos de alto nivel que `StellariumRemoteControlClient`, pero sobre
+streams de asyncio (solo librería estándar), con:
+
+- un pool de conexiones keep-alive limitado por `max_concurrency`;
+- timeout por petición (`StellariumRCConfig.timeout_s`);
+- `at(...)`: sección crítica para el estado global de Stellarium.
+
+Ojo: tiempo y ubicación son estado *global* de la instancia de Stellarium.
+Dos tareas que hagan set_time → object_info en paralelo se pisan. Por eso
+todo lo que dependa del tiempo/ubicación debe ir dentro de `async with
+client.at(jd, ...)`, que serializa esas secciones; dentro de una sección las
+consultas sí pueden ir en paralelo (ver `object_info_many`).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import urllib.parse
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+
+from .stellarium_rc import StellariumRCConfig, StellariumRCError
+
+_Conn = Tuple[asyncio.StreamReader, asyncio.StreamWriter]
+Location = Tuple[float, float, float]  # (latitude, longitude, altitude_m)
+
+
+class AsyncStellariumRemoteControlClient:
+    """Cliente asyncio para el plugin RemoteControl de Stellarium."""
+
+    def __init__(self, config: StellariumRCConfig | None = None, *, max_concurrency: int = 4) -> None:
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency debe ser >= 1")
+        self.config = config or StellariumRCConfig()
+        self.max_concurrency = max_concurrency
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self._idle: List[_Conn] = []
+        self._state_lock = asyncio.Lock()
+        self._location: Optional[Location] = None
+        self.connections_opened = 0
+
+    async def close(self) -> None:
+        idle, self._idle = self._idle, []
+        for _, writer in idle:
+            writer.close()
+            with contextlib.suppress(Exception):
+                await writer.wait_closed()
+
+    async def __aenter__(self) -> "AsyncStellariumRemoteControlClient":
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        await self.close()
+
+    # -----------------
+    # Bajo nivel
+    # -----------------
+
+    async def _open(self) -> _Conn:
+        conn = await asyncio.open_connection(self.config.host, self.config.port)
+        self.connections_opened += 1
+        return conn
+
+    async def _roundtrip(self, conn: _Conn, head: bytes, body: bytes) -> Tuple[int, bytes, bool]:
+        reader, writer = conn
+        writer.write(head + body)
+        await writer.drain()
+
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError("conexión cerrada por el servidor")
+        status = int(status_line.split(None, 2)[1])
+        headers: Dict[str, str] = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            k, _, v = line.decode("latin-1").partition(":")
+            headers[k.strip().lower()] = v.strip()
+
+        keep_alive = headers.get("connection", "").lower() != "close"
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            parts = []
+            while True:
+                size = int((await reader.readline()).split(b";")[0], 16)
+                if size == 0:
+                    await reader.readline()
+                    break
+                parts.append(await reader.readexactly(size))
+                await reader.readline()
+            raw = b"".join(parts)
+        elif "content-length" in headers:
+            raw = await reader.readexactly(int(headers["content-length"]))
+        else:
+            raw = await reader.read()
+            keep_alive = False
+        return status, raw, keep_alive
+
+    async def _request(self, method: str, path: str, *, query: str = "", body: bytes = b"",
+                       headers: Optional[Dict[str, str]] = None) -> bytes:
+        url = path + ("?" + query if query else "")
+        lines = [f"{method} {url} HTTP/1.1", f"Host: {self.config.host}:{self.config.port}",
+                 f"Content-Length: {len(body)}"]
+        lines += [f"{k}: {v}" for k, v in (headers or {}).items()]
+        head = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+        async with self._slots:
+            for attempt in range(2):
+                reused = bool(self._idle)
+                try:
+                    conn = self._idle.pop() if reused else await asyncio.wait_for(self._open(), self.config.timeout_s)
+                except (OSError, asyncio.TimeoutError) as e:
+                    raise StellariumRCError(
+                        f"No pude conectar con Stellarium RemoteControl en {self.config.base_url}. Detalle: {e!r}"
+                    ) from e
+                try:
+                    status, raw, keep_alive = await asyncio.wait_for(
+                        self._roundtrip(conn, head, body), self.config.timeout_s
+                    )
+                except (OSError, asyncio.IncompleteReadError, asyncio.TimeoutError, ValueError, IndexError) as e:
+                    conn[1].close()
+                    if reused and attempt == 0 and not isinstance(e, asyncio.TimeoutError):
+                        continue  # socket keep-alive viejo: una conexión nueva y reenviar
+                    raise StellariumRCError(f"{method} falló hacia {self.config.base_url}{url}. Detalle: {e!r}") from e
+                if keep_alive:
+                    self._idle.append(conn)
+                else:
+                    conn[1].close()
+                if status >= 400:
+                    raise StellariumRCError(f"HTTP {status} desde {self.config.base_url}{url}: {raw[:200]!r}")
+                return raw
+        raise AssertionError("unreachable")
+
+    async def _get_json(self, path: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        qs = urllib.parse.urlencode({k: str(v) for k, v in params.items()}) if params else ""
+        raw = (await self._request("GET", path, query=qs)).decode("utf-8")
+        try:
+            return json.loads(raw)
+        except Exception as e:
+            raise StellariumRCError(f"Respuesta no-JSON desde {path}: {raw[:200]!r}") from e
+
+    async def _post_form(self, path: str, data: Dict[str, Any]) -> None:
+        body = urllib.parse.urlencode({k: str(v) for k, v in data.items()}).encode("utf-8")
+        await self._request("POST", path, body=body,
+                            headers={"Content-Type": "application/x-www-form-urlencoded"})
+
+    # -----------------
+    # Alto nivel (mismos métodos que el cliente síncrono)
+    # -----------------
+
+    async def ping(self) -> bool:
+        try:
+            await self.status()
+            return True
+        except StellariumRCError:
+            return False
+
+    async def status(self) -> Dict[str, Any]:
+        return await self._get_json("/api/main/status")
+
+    async def set_time_jd(self, jd: float, timerate_jd_per_sec: Optional[float] = None) -> None:
+        data: Dict[str, Any] = {"time": jd}
+        if timerate_jd_per_sec is not None:
+            data["timerate"] = timerate_jd_per_sec
+        await self._post_form("/api/main/time", data)
+
+    async def set_location(self, latitude: float, longitude: float, altitude_m: float = 0.0,
+                           name: str = "", country: str = "", planet: str = "Earth") -> None:
+        await self._post_form(
+            "/api/location/setlocationfields",
+            {"latitude": latitude, "longitude": longitude, "altitude": altitude_m,
+             "name": name, "country": country, "planet": planet},
+        )
+        self._location = (latitude, longitude, altitude_m)
+
+    async def focus(self, target: str, mode: str = "center") -> None:
+        await self._post_form("/api/main/focus", {"target": target, "mode": mode})
+
+    async def object_info(self, name: str, format: str = "json") -> Dict[str, Any]:
+        return await self._get_json("/api/objects/info", {"format": format, "name": name})
+
+    async def object_find(self, query: str, format: str = "json") -> Any:
+        return await self._get_json("/api/objects/find", {"format": format, "str": query})
+
+    async def object_info_many(self, names: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        """object_info de varios cuerpos en paralelo (usar dentro de `at(...)`)."""
+        infos = await asyncio.gather(*(self.object_info(n) for n in names))
+        return dict(zip(names, infos))
+
+    # -----------------
+    # Estado global
+    # -----------------
+
+    @contextlib.asynccontextmanager
+    async def at(self, jd: float, location: Optional[Location] = None) -> AsyncIterator["AsyncStellariumRemoteControlClient"]:
+        """Sección crítica: fija (ubicación y) tiempo y retiene el estado hasta salir.
+
+        La ubicación solo se reenvía si cambió respecto de la última fijada.
+        """
+        async with self._state_lock:
+            if location is not None and location != self._location:
+                await self.set_location(*location)
+            await self.set_time_jd(jd, 0)
+            yield self
+
+    async def query_at(self, jd: float, names: Sequence[str],
+                       location: Optional[Location] = None) -> Dict[str, Dict[str, Any]]:
+        """set_location? → set_time → object_info de `names`, como una sola sección crítica."""
+        async with self.at(jd, location):
+            return await self.object_info_many(names)
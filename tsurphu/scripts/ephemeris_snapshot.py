@@ -4,8 +4,10 @@ import argparse
 import json
 from datetime import datetime
 
+from tsurphu.integraciones.ephemeris_cache import CachingStellariumClient, EphemerisCache
 from tsurphu.integraciones.stellarium_rc import StellariumRemoteControlClient as C
 from tsurphu.astro.coords import equatorial_to_ecliptic, normalize_deg, mean_obliquity_deg
+from tsurphu.astro.ephemeris import body_ecliptic
 
 
 def jd_from_datetime(dt: datetime) -> float:
@@ -20,10 +22,7 @@ def _float_or_none(x):
         return None
 
 
-def fetch_body(c: C, name: str, jd: float) -> dict:
-    c.focus(name)
-    info = c.object_info(name) or {}
-
+def _body_from_info(name: str, info: dict, jd: float) -> dict:
     ra = _float_or_none(info.get("ra"))
     dec = _float_or_none(info.get("dec"))
 
@@ -47,6 +46,22 @@ def fetch_body(c: C, name: str, jd: float) -> dict:
     return out
 
 
+def fetch_bodies(c: C, names, jd: float) -> dict:
+    """Several bodies at the client's current time; info requests only (focus only if the RC version needs it)."""
+    infos = c.object_info_many(list(names))
+    return {name: _body_from_info(name, infos.get(name) or {}, jd) for name in names}
+
+
+def fetch_body(c: C, name: str, jd: float) -> dict:
+    return fetch_bodies(c, (name,), jd)[name]
+
+
+def analytic_body(name: str, jd: float) -> dict:
+    """Same ecliptic keys as fetch_body, from the offline analytic engine (no Stellarium)."""
+    ecl_lon, ecl_lat = body_ecliptic(name, jd)
+    return {"ecl_lon_deg": ecl_lon, "ecl_lat_deg": ecl_lat}
+
+
 def compute_tithi(moon_lon: float, sun_lon: float) -> dict:
     delta = normalize_deg(moon_lon - sun_lon)  # [0, 360)
     tithi = int(delta // 12.0) + 1             # 1..30
@@ -60,19 +75,43 @@ def main() -> int:
     ap.add_argument("--lon", type=float, default=-74.0721)
     ap.add_argument("--name", default="Bogota")
     ap.add_argument("--country", default="CO")
+    ap.add_argument(
+        "--engine",
+        choices=["stellarium", "analytic"],
+        default="stellarium",
+        help="stellarium = RemoteControl HTTP; analytic = offline Sun/Moon series (no Stellarium)",
+    )
+    ap.add_argument("--cache", default=None, help="SQLite ephemeris cache (stellarium engine); hits skip Stellarium")
     args = ap.parse_args()
 
     dt = datetime.fromisoformat(args.dt) if args.dt else datetime.now().astimezone()
     jd = jd_from_datetime(dt)
 
-    c = C()
-    c.set_location(latitude=args.lat, longitude=args.lon, name=args.name, country=args.country)
-    c.set_time_jd(jd, 0)  # freeze time
-
-    status = c.status() or {}
-
-    sun = fetch_body(c, "Sun", jd)
-    moon = fetch_body(c, "Moon", jd)
+    if args.engine == "analytic":
+        status = {}
+        sun = analytic_body("Sun", jd)
+        moon = analytic_body("Moon", jd)
+    else:
+        c = C()
+        cache = EphemerisCache(args.cache) if args.cache else None
+        try:
+            if cache is not None:
+                c = CachingStellariumClient(c, cache)
+            c.set_location(latitude=args.lat, longitude=args.lon, name=args.name, country=args.country)
+            c.set_time_jd(jd, 0)  # freeze time
+
+            misses = cache.stats.misses if cache is not None else None
+            bodies = fetch_bodies(c, ("Sun", "Moon"), jd)
+            sun, moon = bodies["Sun"], bodies["Moon"]
+
+            if cache is not None and cache.stats.misses == misses:
+                # Full cache hit: no Stellarium traffic at all; the time is the one frozen above
+                status = {"time": {"jday": jd, "timerate": 0}}
+            else:
+                status = c.status() or {}
+        finally:
+            if cache is not None:
+                cache.close()
 
     t = compute_tithi(moon["ecl_lon_deg"], sun["ecl_lon_deg"])
 
@@ -82,6 +121,7 @@ def main() -> int:
             "datetime_local": dt.isoformat(),
             "jd": jd,
             "mean_obliquity_deg": mean_obliquity_deg(jd),
+            "engine": args.engine,
         },
         "stellarium_time": status.get("time"),
         "sun": sun,
@@ -3,8 +3,15 @@
 import argparse
 import datetime as dt
 import json
-import subprocess
+import os
 import sys
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Sequence, TextIO
+
+from tsurphu.integraciones.ephemeris_cache import CachingStellariumClient, EphemerisCache
+from tsurphu.integraciones.stellarium_pool import PoolWorker, StellariumPool
+from tsurphu.integraciones.stellarium_rc import StellariumRCConfig, StellariumRemoteControlClient as C
+from tsurphu.scripts.ephemeris_snapshot import compute_tithi, fetch_bodies, jd_from_datetime
 
 
 def _daterange(d0: dt.date, d1: dt.date):
@@ -15,18 +22,170 @@ def _daterange(d0: dt.date, d1: dt.date):
         d += step
 
 
-def _extract_json(stdout: str) -> dict:
-    # Por si hay prints extra, intentamos recortar al primer { ... último }
-    s = stdout.strip()
-    i = s.find("{")
-    j = s.rfind("}")
-    if i != -1 and j != -1 and j > i:
-        s = s[i : j + 1]
-    return json.loads(s)
+def _parse_tz(tz: str) -> dt.timezone:
+    # "-05:00" -> UTC-5
+    return dt.datetime.fromisoformat(f"2000-01-01T00:00:00{tz}").tzinfo  # type: ignore[return-value]
+
+
+def day_report(c: C, d: dt.date, *, tz: dt.tzinfo, at: dt.time) -> dict:
+    """Sol/Luna/tithi para la fecha `d` a la hora local `at` (ubicación ya fijada en `c`)."""
+    local = dt.datetime.combine(d, at, tzinfo=tz)
+    jd = jd_from_datetime(local)
+    c.set_time_jd(jd, 0)  # freeze time
+
+    bodies = fetch_bodies(c, ("Sun", "Moon"), jd)
+    sun, moon = bodies["Sun"], bodies["Moon"]
+    return {
+        "meta": {"date": d.isoformat(), "ok": True, "datetime_local": local.isoformat(), "jd": jd},
+        "sun": sun,
+        "moon": moon,
+        "tithi": compute_tithi(moon["ecl_lon_deg"], sun["ecl_lon_deg"]),
+    }
+
+
+def iter_range_inprocess(
+    d0: dt.date,
+    d1: dt.date,
+    *,
+    tz: str,
+    lat: float,
+    lon: float,
+    name: str = "",
+    country: str = "",
+    at: dt.time = dt.time(6, 0),
+    client: Optional[C] = None,
+) -> Iterator[dict]:
+    """Motor en proceso: un solo cliente/sesión, ubicación fijada una vez, una fila por día.
+
+    Cada fila se entrega apenas se calcula. Si un día falla, se entrega una fila
+    de error estructurada y se sigue con el siguiente.
+    """
+    c = client or C()
+    tzinfo = _parse_tz(tz)
+    c.set_location(latitude=lat, longitude=lon, name=name, country=country)
+    for d in _daterange(d0, d1):
+        try:
+            yield day_report(c, d, tz=tzinfo, at=at)
+        except Exception as e:
+            yield {
+                "meta": {"date": d.isoformat(), "ok": False},
+                "error": {"type": type(e).__name__, "message": str(e)},
+            }
+
+
+def iter_range_pool(
+    d0: dt.date,
+    d1: dt.date,
+    *,
+    tz: str,
+    lat: float,
+    lon: float,
+    name: str = "",
+    country: str = "",
+    at: dt.time = dt.time(6, 0),
+    pool: StellariumPool,
+) -> Iterator[dict]:
+    """Como iter_range_inprocess, pero repartiendo los días entre varias instancias de Stellarium.
+
+    Las filas salen en orden de fecha (mismo formato); cada día corre entero en una instancia.
+    """
+    tzinfo = _parse_tz(tz)
+    loc = (lat, lon, name, country)
+
+    def job(w: PoolWorker, d: dt.date) -> dict:
+        w.ensure_location(loc)
+        return day_report(w.client, d, tz=tzinfo, at=at)
+
+    for r in pool.imap(job, _daterange(d0, d1)):
+        if r.ok:
+            yield r.value
+        else:
+            yield {
+                "meta": {"date": r.job.isoformat(), "ok": False},
+                "error": {"type": type(r.error).__name__, "message": str(r.error)},
+            }
+
+
+def _parse_endpoints(spec: str) -> list[StellariumRCConfig]:
+    out = []
+    for item in spec.split(","):
+        host, _, port = item.strip().rpartition(":")
+        out.append(StellariumRCConfig(host=host or "127.0.0.1", port=int(port)))
+    return out
+
+
+# -----------------
+# Salida en streaming + checkpoint
+# -----------------
 
+# Parámetros que deben coincidir para poder retomar un checkpoint (start/end pueden cambiar)
+_RESUME_KEYS = ("tz", "lat", "lon", "name", "country", "time", "format")
 
-def main() -> int:
-    p = argparse.ArgumentParser(description="Corre lunar_day_report en un rango de fechas y emite JSON/JSONL.")
+
+def _fingerprint(args: argparse.Namespace) -> dict:
+    return {k: getattr(args, k) for k in _RESUME_KEYS}
+
+
+def load_checkpoint(path: Path) -> Optional[dict]:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return None
+
+
+def save_checkpoint(path: Path, data: dict) -> None:
+    # Escritura atómica: un crash nunca deja el checkpoint a medias
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def write_jsonl(
+    rows: Iterable[dict],
+    out: TextIO,
+    *,
+    checkpoint: Optional[Path] = None,
+    fingerprint: Optional[dict] = None,
+) -> int:
+    """Escribe y vacía cada fila apenas llega; tras cada fila actualiza el checkpoint.
+
+    El checkpoint guarda la última fecha completa y el offset del archivo de
+    salida tras esa fila, para poder truncar lo escrito después de un crash.
+    Desde la primera fila con error el checkpoint ya no avanza: al retomar se
+    trunca ahí y se reintenta ese día (y los siguientes, para mantener el orden).
+    """
+    n = 0
+    failed = False
+    for r in rows:
+        out.write(json.dumps(r, ensure_ascii=False) + "\n")
+        out.flush()
+        n += 1
+        meta = r.get("meta") or {}
+        failed = failed or meta.get("ok", r.get("ok", True)) is False
+        if checkpoint is not None and not failed:
+            save_checkpoint(checkpoint, {
+                "last_date": meta.get("date") or r.get("date"),
+                "offset": out.tell() if out.seekable() else None,
+                "args": fingerprint,
+            })
+    return n
+
+
+def write_json_array(rows: Iterable[dict], out: TextIO, meta: dict) -> int:
+    """JSON `{"meta": ..., "rows": [...]}` escrito fila por fila, sin armar la lista en memoria."""
+    out.write('{"meta": ' + json.dumps(meta, ensure_ascii=False) + ', "rows": [')
+    n = 0
+    for r in rows:
+        out.write(("," if n else "") + "\n  " + json.dumps(r, ensure_ascii=False))
+        out.flush()
+        n += 1
+    out.write("\n]}\n")
+    out.flush()
+    return n
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    p = argparse.ArgumentParser(description="Reporte lunar (Sol/Luna/tithi) por día en un rango de fechas; emite JSON/JSONL.")
     p.add_argument("--start", required=True, help="YYYY-MM-DD (incl.)")
     p.add_argument("--end", required=True, help="YYYY-MM-DD (incl.)")
     p.add_argument("--tz", required=True, help="Ej: -05:00")
@@ -34,55 +193,98 @@ def main() -> int:
     p.add_argument("--lon", required=True, type=float)
     p.add_argument("--name", default="Bogota")
     p.add_argument("--country", default="CO")
+    p.add_argument("--time", default="06:00", help="Hora local de cálculo de cada día (HH:MM, por defecto ~amanecer)")
     p.add_argument("--format", choices=["json", "jsonl"], default="jsonl")
-    args = p.parse_args()
+    p.add_argument("--host", default="127.0.0.1", help="Host de Stellarium RemoteControl")
+    p.add_argument("--port", type=int, default=8090, help="Puerto de Stellarium RemoteControl")
+    p.add_argument("--out", default=None, help="Archivo de salida (por defecto stdout)")
+    p.add_argument(
+        "--resume-from",
+        metavar="CHECKPOINT",
+        default=None,
+        help="Checkpoint JSON (solo jsonl): se actualiza tras cada día y, si existe, se retoma desde ahí",
+    )
+    p.add_argument(
+        "--cache",
+        metavar="DB",
+        default=None,
+        help="Caché SQLite de efemérides (cuerpo, JD, ubicación): repetir un rango no consulta Stellarium",
+    )
+    p.add_argument(
+        "--endpoints",
+        default=None,
+        help="Varias instancias de Stellarium (host:puerto,host:puerto,...): reparte los días entre ellas",
+    )
+    p.add_argument("--cache-tol-s", type=float, default=1.0, help="Tolerancia de JD del caché, en segundos")
+    args = p.parse_args(argv)
 
     d0 = dt.date.fromisoformat(args.start)
     d1 = dt.date.fromisoformat(args.end)
-    rows = []
-
-    for d in _daterange(d0, d1):
-        cmd = [
-            sys.executable,
-            "-m",
-            "tsurphu.scripts.lunar_day_report",
-            "--date",
-            d.isoformat(),
-            "--tz",
-            args.tz,
-            "--lat",
-            str(args.lat),
-            "--lon",
-            str(args.lon),
-            "--name",
-            args.name,
-            "--country",
-            args.country,
-        ]
-
-        cp = subprocess.run(cmd, capture_output=True, text=True)
-        if cp.returncode != 0:
-            rows.append(
-                {
-                    "date": d.isoformat(),
-                    "ok": False,
-                    "stderr_tail": (cp.stderr or "").strip()[-4000:],
-                    "stdout_tail": (cp.stdout or "").strip()[-2000:],
-                }
-            )
-            continue
 
-        data = _extract_json(cp.stdout or "{}")
-        data.setdefault("meta", {})
-        data["meta"]["date"] = d.isoformat()
-        data["meta"]["ok"] = True
-        rows.append(data)
+    checkpoint = Path(args.resume_from) if args.resume_from else None
+    resume_offset = None
+    if checkpoint is not None:
+        if args.format != "jsonl":
+            p.error("--resume-from solo aplica a --format jsonl")
+        ck = load_checkpoint(checkpoint)
+        if ck is not None:
+            if ck.get("args") != _fingerprint(args):
+                p.error(f"el checkpoint {checkpoint} es de otra corrida (parámetros distintos)")
+            d0 = max(d0, dt.date.fromisoformat(ck["last_date"]) + dt.timedelta(days=1))
+            resume_offset = ck.get("offset")
+            size = os.path.getsize(args.out) if args.out and os.path.exists(args.out) else 0
+            if args.out and resume_offset is None and size:
+                # Checkpoint de una corrida a stdout: no hay offset que indique qué conservar
+                p.error(f"el checkpoint {checkpoint} no tiene offset de salida; no se sobrescribe {args.out}")
+            if args.out and resume_offset is not None and size < resume_offset:
+                p.error(f"{args.out} es más corto que el checkpoint {checkpoint} (offset {resume_offset})")
 
-    if args.format == "jsonl":
-        for r in rows:
-            print(json.dumps(r, ensure_ascii=False))
+    cache: Optional[EphemerisCache] = None
+    pool: Optional[StellariumPool] = None
+    if args.endpoints:
+        if args.cache:
+            p.error("--cache no aplica con --endpoints")
+        try:
+            configs = _parse_endpoints(args.endpoints)
+        except ValueError:
+            p.error(f"--endpoints inválido: {args.endpoints!r} (esperado host:puerto,host:puerto)")
+        pool = StellariumPool(configs)
+        it = iter_range_pool(
+            d0, d1, tz=args.tz, lat=args.lat, lon=args.lon, name=args.name, country=args.country,
+            at=dt.time.fromisoformat(args.time), pool=pool,
+        )
     else:
-        print(json.dumps({"meta": vars(args), "rows": rows}, ensure_ascii=False, indent=2))
+        client = C(StellariumRCConfig(host=args.host, port=args.port))
+        if args.cache:
+            cache = EphemerisCache(args.cache, jd_tolerance_s=args.cache_tol_s)
+            client = CachingStellariumClient(client, cache)
+        it = iter_range_inprocess(
+            d0, d1, tz=args.tz, lat=args.lat, lon=args.lon, name=args.name, country=args.country,
+            at=dt.time.fromisoformat(args.time), client=client,
+        )
+
+    out: TextIO = sys.stdout
+    if args.out:
+        out = open(args.out, "a" if resume_offset is not None else "w", encoding="utf-8")
+        if resume_offset is not None and out.seek(0, os.SEEK_END) > resume_offset:
+            out.truncate(resume_offset)  # descarta lo escrito después del último checkpoint
+    try:
+        if args.format == "jsonl":
+            write_jsonl(it, out, checkpoint=checkpoint, fingerprint=_fingerprint(args))
+        else:
+            write_json_array(it, out, vars(args))
+    finally:
+        if out is not sys.stdout:
+            out.close()
+        if pool is not None:
+            pool.close()
+        if cache is not None:
+            cache.close()
+            st = cache.stats
+            print(
+                f"[cache] hits={st.hits} disk_hits={st.disk_hits} misses={st.misses} hit_rate={st.hit_rate:.3f}",
+                file=sys.stderr,
+            )
 
     return 0
 
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import json
+import sys
+
+from tsurphu.astro.tithi import AnalyticPositionSource, StellariumPositionSource, find_tithi_intervals
+from tsurphu.integraciones.stellarium_rc import StellariumRCConfig, StellariumRemoteControlClient as C
+from tsurphu.scripts.ephemeris_snapshot import jd_from_datetime
+
+
+def _datetime_from_jd(jd: float, tz: dt.tzinfo) -> dt.datetime:
+    return dt.datetime.fromtimestamp((jd - 2440587.5) * 86400.0, tz=dt.timezone.utc).astimezone(tz)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Intervalos exactos de tithi (inicio/fin) en un rango de fechas; emite JSONL.")
+    ap.add_argument("--start", required=True, help="YYYY-MM-DD (incl.)")
+    ap.add_argument("--end", required=True, help="YYYY-MM-DD (incl.)")
+    ap.add_argument("--tz", default="+00:00", help="Ej: --tz=-05:00 (para las horas locales de salida)")
+    ap.add_argument("--engine", choices=["analytic", "stellarium"], default="analytic")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8090)
+    ap.add_argument("--tol-seconds", type=float, default=1.0)
+    args = ap.parse_args()
+
+    tz = dt.datetime.fromisoformat(f"2000-01-01T00:00:00{args.tz}").tzinfo
+    d0 = dt.datetime.combine(dt.date.fromisoformat(args.start), dt.time(0, 0), tzinfo=tz)
+    d1 = dt.datetime.combine(dt.date.fromisoformat(args.end), dt.time(0, 0), tzinfo=tz) + dt.timedelta(days=1)
+
+    if args.engine == "stellarium":
+        source = StellariumPositionSource(C(StellariumRCConfig(host=args.host, port=args.port)))
+    else:
+        source = AnalyticPositionSource()
+    res = find_tithi_intervals(source, jd_from_datetime(d0), jd_from_datetime(d1), tol_seconds=args.tol_seconds)
+
+    for iv in res.intervals:
+        print(json.dumps({
+            "tithi": iv.tithi,
+            "start_jd": iv.start_jd,
+            "end_jd": iv.end_jd,
+            "start_local": _datetime_from_jd(iv.start_jd, tz).isoformat(timespec="seconds"),
+            "end_local": _datetime_from_jd(iv.end_jd, tz).isoformat(timespec="seconds"),
+        }, ensure_ascii=False))
+
+    # Métrica en stderr para no mezclarla con el JSONL
+    print(json.dumps({
+        "metric": "tithi_search",
+        "engine": args.engine,
+        "intervals": len(res.intervals),
+        "boundaries": res.boundaries,
+        "evaluations": res.evaluations,
+        "evaluations_per_boundary": round(res.evaluations_per_boundary, 3),
+    }), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())